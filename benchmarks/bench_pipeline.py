@@ -0,0 +1,196 @@
+import argparse
+import datetime
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import typing
+
+import numpy as np
+
+from benchmarks.payloads import product_ids, products_payload, transactions_payload
+from stockplot import DeGiroWrapper
+
+_START = datetime.datetime(2000, 1, 1)
+_END = datetime.datetime(2021, 1, 1)
+
+
+class _StaticResponse:
+    def __init__(self, body: bytes, status_code: int = 200) -> None:
+        self.status_code = status_code
+        self._body = body
+
+    def json(self) -> typing.Dict:
+        return json.loads(self._body)
+
+    def iter_content(self, chunk_size: int = 1) -> typing.Iterator[bytes]:
+        view = memoryview(self._body)
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start : start + chunk_size])
+
+    def close(self) -> None:
+        pass
+
+
+class _StaticRequests:
+    # Answers every DeGiro endpoint from pre-encoded bodies, so only the
+    # wrapper's own work is measured.
+    def __init__(self, transactions: bytes = b"{}", products: bytes = b"{}") -> None:
+        self._bodies = {
+            "login": json.dumps({"sessionId": "session"}).encode(),
+            "client": json.dumps({"data": {"intAccount": 1}}).encode(),
+            "transactions": transactions,
+            "info": products,
+        }
+
+    def get(self, *args, **kwargs) -> _StaticResponse:
+        return self._respond(kwargs["url"])
+
+    def post(self, *args, **kwargs) -> _StaticResponse:
+        return self._respond(kwargs["url"])
+
+    def _respond(self, url: str) -> _StaticResponse:
+        for suffix, body in self._bodies.items():
+            if url.endswith(suffix):
+                return _StaticResponse(body)
+        return _StaticResponse(b"")
+
+
+def _wrapper(requests: _StaticRequests) -> DeGiroWrapper:
+    wrapper = DeGiroWrapper(user="user", password="pass", requests=requests)
+    wrapper.open_session()
+    return wrapper
+
+
+def _stages(
+    transactions: typing.Sequence[int], products: typing.Sequence[int]
+) -> typing.Iterator[typing.Tuple[str, int, typing.Callable[[], typing.Any]]]:
+    import pandas as pd
+
+    for rows in transactions:
+        wrapper = _wrapper(_StaticRequests(transactions=transactions_payload(rows)))
+        frame = wrapper.get_transaction_frame(_START, _END)
+        yield "transactions.parse", rows, lambda: wrapper.get_transactions(_START, _END)
+        yield "transactions.frame", rows, lambda: wrapper.get_transaction_frame(
+            _START, _END
+        )
+        yield "transactions.to_dataframe", rows, frame.to_pandas
+
+    for count in products:
+        ids = set(product_ids(count))
+        wrapper = _wrapper(_StaticRequests(products=products_payload(count)))
+        infos = list(wrapper.get_product_info_by_id(ids).values())
+        yield "products.parse", count, lambda: wrapper.get_product_info_by_id(ids)
+        yield "products.to_dataframe", count, lambda: pd.DataFrame(
+            {
+                "id": np.fromiter((info.id for info in infos), np.int64, len(infos)),
+                "isin": [info.isin for info in infos],
+                "name": [info.name for info in infos],
+                "symbol": [info.symbol for info in infos],
+                "currency": [info.currency.code for info in infos],
+            }
+        )
+
+
+def _measure(call: typing.Callable[[], typing.Any], repeat: int) -> typing.Dict:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - started)
+
+    # Tracing slows allocation down, so the peak comes from a separate run.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(timings), "peak_bytes": peak}
+
+
+def run(
+    transactions: typing.Sequence[int], products: typing.Sequence[int], repeat: int
+) -> typing.Dict:
+    results = []
+    for stage, size, call in _stages(transactions, products):
+        result = {"stage": stage, "size": size, **_measure(call, repeat)}
+        print(
+            f"{stage:>26} {size:>9}: {result['seconds'] * 1000:10.2f} ms "
+            f"{result['peak_bytes'] / 2 ** 20:9.1f} MiB",
+            file=sys.stderr,
+        )
+        results.append(result)
+
+    return {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: typing.Dict, baseline: typing.Dict, tolerance: float) -> bool:
+    previous = {
+        (result["stage"], result["size"]): result for result in baseline["results"]
+    }
+    regressed = False
+    for result in current["results"]:
+        before = previous.get((result["stage"], result["size"]))
+        if before is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            ratio = result[metric] / before[metric] if before[metric] else 1.0
+            if ratio > 1.0 + tolerance:
+                regressed = True
+                print(
+                    f"REGRESSION {result['stage']} {result['size']} {metric}: "
+                    f"{before[metric]:.6g} -> {result[metric]:.6g} ({ratio:.2f}x)"
+                )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark DeGiro parsing and DataFrame conversion."
+    )
+    parser.add_argument(
+        "--transactions",
+        type=int,
+        nargs="*",
+        default=[10, 1_000, 100_000, 1_000_000],
+    )
+    parser.add_argument("--products", type=int, nargs="*", default=[10, 1_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    parser.add_argument("--baseline", help="Compare against stored JSON results.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown or memory growth as a fraction, default 0.2.",
+    )
+    arguments = parser.parse_args()
+
+    current = run(arguments.transactions, arguments.products, arguments.repeat)
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(current, file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)
+        if compare(current, baseline, arguments.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import gc
+import random
+import timeit
+import tracemalloc
+import typing
+
+from stockplot import Currency, ProductInfo
+from stockplot.de_giro_wrapper import ProductCatalog
+
+_CURRENCIES = (Currency.EUR, Currency.USD, Currency.GBP, Currency.CHF)
+
+
+def _products(count: int) -> typing.List[ProductInfo]:
+    # Roughly one in four ISINs is listed on a second exchange.
+    generator = random.Random(0)
+    products = []
+    for index in range(count):
+        listing = (
+            generator.randrange(0, max(1, count // 4)) if index % 4 == 3 else index
+        )
+        products.append(
+            ProductInfo(
+                id=1_000_000 + 7 * index,
+                isin=f"NL{listing:010d}",
+                name=f"Product {index} Holding N.V.",
+                symbol=f"P{index}",
+                currency=_CURRENCIES[index % len(_CURRENCIES)],
+            )
+        )
+    return products
+
+
+def _footprint(build: typing.Callable[[], typing.Any]) -> typing.Tuple[typing.Any, int]:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        built = build()
+        return built, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def _per_call(call: typing.Callable[[], typing.Any], number: int, repeat: int) -> float:
+    return min(timeit.repeat(call, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare ProductCatalog with a dict of ProductInfo."
+    )
+    parser.add_argument("--products", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    arguments = parser.parse_args()
+
+    source = _products(arguments.products)
+    # Each container is built from fresh objects, so it is charged for its
+    # own strings.
+    as_dict, dict_bytes = _footprint(
+        lambda: {p.id: p for p in _products(arguments.products)}
+    )
+    catalog, catalog_bytes = _footprint(
+        lambda: ProductCatalog(_products(arguments.products))
+    )
+
+    count = len(source)
+    print(
+        f"{'memory per product':>22}: dict {dict_bytes / count:7.0f} B   "
+        f"catalog {catalog_bytes / count:7.0f} B   "
+        f"({dict_bytes / catalog_bytes:5.1f}x)"
+    )
+
+    generator = random.Random(1)
+    product = source[generator.randrange(count)]
+    batch = [p.id for p in generator.sample(source, min(count, 10_000))]
+    number, repeat = 10_000, arguments.repeat
+
+    rows = {
+        "get": (
+            _per_call(lambda: as_dict.get(product.id), number, repeat),
+            _per_call(lambda: catalog.get(product.id), number, repeat),
+        ),
+        "get_many (per id)": (
+            _per_call(lambda: {i: as_dict[i] for i in batch}, 1, repeat) / len(batch),
+            _per_call(lambda: catalog.get_many(batch), 1, repeat) / len(batch),
+        ),
+        # Without an index a dict can only be scanned.
+        "by_isin": (
+            _per_call(
+                lambda: [p for p in as_dict.values() if p.isin == product.isin],
+                1,
+                repeat,
+            ),
+            _per_call(lambda: catalog.by_isin(product.isin), number, repeat),
+        ),
+        "by_symbol": (
+            _per_call(
+                lambda: [p for p in as_dict.values() if p.symbol == product.symbol],
+                1,
+                repeat,
+            ),
+            _per_call(lambda: catalog.by_symbol(product.symbol), number, repeat),
+        ),
+    }
+    for name, (baseline, best) in rows.items():
+        print(
+            f"{name:>22}: dict {baseline * 1e6:9.2f} us "
+            f"catalog {best * 1e6:9.2f} us   ({baseline / best:7.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
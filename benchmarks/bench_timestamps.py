@@ -0,0 +1,52 @@
+import argparse
+import datetime
+import random
+import timeit
+
+import pytz
+
+from stockplot.de_giro_wrapper.timestamps import parse_timestamp, parse_timestamps
+
+
+def _strptime(value: str) -> datetime.datetime:
+    return (
+        datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+        .astimezone(pytz.utc)
+        .replace(tzinfo=None)
+    )
+
+
+def _dates(count: int) -> list:
+    generator = random.Random(0)
+    zone = pytz.timezone("Europe/Amsterdam")
+    start = datetime.datetime(2000, 1, 1, tzinfo=pytz.utc)
+    return [
+        (start + datetime.timedelta(seconds=generator.randrange(0, 20 * 365 * 86400)))
+        .astimezone(zone)
+        .isoformat()
+        for _ in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare timestamp parsers.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    dates = _dates(arguments.rows)
+    candidates = {
+        "strptime": lambda: [_strptime(date) for date in dates],
+        "parse_timestamp": lambda: [parse_timestamp(date) for date in dates],
+        "parse_timestamps": lambda: parse_timestamps(dates),
+    }
+
+    baseline = None
+    for name, candidate in candidates.items():
+        best = min(timeit.repeat(candidate, number=1, repeat=arguments.repeat))
+        baseline = baseline or best
+        print(f"{name:>18}: {best * 1000:9.1f} ms  ({baseline / best:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import datetime
+import json
+import random
+import typing
+
+import pytz
+
+# Field sets mirror the DeGiro payloads used in
+# tests/unit_tests/test_de_giro_wrapper, so parsing cost includes the fields
+# the wrapper ignores.
+_TRANSACTION_PADDING = {
+    "buysell": "B",
+    "price": 1,
+    "total": -1,
+    "orderTypeId": 0,
+    "counterParty": "MK",
+    "transfered": False,
+    "fxRate": 1,
+    "totalInBaseCurrency": -1,
+    "feeInBaseCurrency": -1,
+    "totalPlusFeeInBaseCurrency": -1,
+    "transactionTypeId": 0,
+    "tradingVenue": "XET",
+}
+
+_PRODUCT_PADDING = {
+    "contractSize": 1.0,
+    "productType": "STOCK",
+    "productTypeId": 1,
+    "tradable": True,
+    "category": "D",
+    "exchangeId": "1",
+    "onlyEodPrices": False,
+    "orderTimeTypes": ["DAY", "GTC"],
+    "buyOrderTypes": ["LIMIT", "MARKET", "STOPLOSS", "STOPLIMIT"],
+    "sellOrderTypes": ["LIMIT", "MARKET", "STOPLOSS", "STOPLIMIT"],
+    "productBitTypes": [],
+    "closePrice": 1.0,
+    "closePriceDate": "2021-04-16",
+    "feedQuality": "D15",
+    "orderBookDepth": 0,
+    "vwdIdentifierType": "issueid",
+    "vwdId": "1",
+    "qualitySwitchable": True,
+    "qualitySwitchFree": False,
+    "vwdModuleId": 1,
+}
+
+_CURRENCIES = ("EUR", "USD", "GBP", "CHF")
+
+
+def transactions_payload(rows: int, products: int = 500, seed: int = 0) -> bytes:
+    generator = random.Random(seed)
+    zone = pytz.timezone("Europe/Amsterdam")
+    start = datetime.datetime(2000, 1, 1, tzinfo=pytz.utc)
+    span = 20 * 365 * 86400
+
+    seconds = sorted(generator.randrange(0, span) for _ in range(rows))
+    data = [
+        {
+            "id": index,
+            "productId": generator.randrange(1, products + 1),
+            "quantity": generator.choice((-1, 1)) * generator.randrange(1, 100),
+            "date": (start + datetime.timedelta(seconds=offset))
+            .astimezone(zone)
+            .isoformat(),
+            **_TRANSACTION_PADDING,
+        }
+        for index, offset in enumerate(seconds)
+    ]
+    return json.dumps({"data": data}).encode()
+
+
+def product_ids(count: int) -> typing.List[int]:
+    return list(range(1, count + 1))
+
+
+def products_payload(count: int) -> bytes:
+    data = {
+        str(identifier): {
+            "id": str(identifier),
+            "name": f"Product {identifier}",
+            "isin": f"NL{identifier:010d}",
+            "symbol": f"P{identifier}",
+            "currency": _CURRENCIES[identifier % len(_CURRENCIES)],
+            **_PRODUCT_PADDING,
+        }
+        for identifier in product_ids(count)
+    }
+    return json.dumps({"data": data}).encode()
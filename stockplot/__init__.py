@@ -1,4 +1,46 @@
-from .de_giro_wrapper import DeGiroWrapper, ProductInfo, Transaction
-from .currency import Currency
+import importlib
+import typing
 
-__all__ = ["Currency", "DeGiroWrapper", "ProductInfo", "Transaction"]
+if typing.TYPE_CHECKING:
+    from .currency import Currency
+    from .de_giro_wrapper import (
+        AsyncDeGiroWrapper,
+        DeGiroWrapper,
+        ProductInfo,
+        Transaction,
+        TransactionFrame,
+    )
+
+__all__ = [
+    "AsyncDeGiroWrapper",
+    "Currency",
+    "DeGiroWrapper",
+    "ProductInfo",
+    "Transaction",
+    "TransactionFrame",
+]
+
+# Public names resolve on first access, so importing the package does not
+# pay for requests, numpy or the wrapper modules until they are used.
+_LOCATIONS = {
+    "AsyncDeGiroWrapper": ".de_giro_wrapper.async_de_giro_wrapper",
+    "Currency": ".currency",
+    "DeGiroWrapper": ".de_giro_wrapper.de_giro_wrapper",
+    "ProductInfo": ".de_giro_wrapper.product_info",
+    "Transaction": ".de_giro_wrapper.transaction",
+    "TransactionFrame": ".de_giro_wrapper.transaction_frame",
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    location = _LOCATIONS.get(name)
+    if location is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(location, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted({*globals(), *__all__})
@@ -1,4 +1,5 @@
 from __future__ import annotations
+
 from enum import Enum
 
 __all__ = ("Currency",)
@@ -7,13 +8,197 @@ __all__ = ("Currency",)
 class Currency(Enum):
     USD = 0
     EUR = 1
+    # Remaining ISO 4217 codes, numbered in alphabetical order.
+    AED = 2
+    AFN = 3
+    ALL = 4
+    AMD = 5
+    ANG = 6
+    AOA = 7
+    ARS = 8
+    AUD = 9
+    AWG = 10
+    AZN = 11
+    BAM = 12
+    BBD = 13
+    BDT = 14
+    BGN = 15
+    BHD = 16
+    BIF = 17
+    BMD = 18
+    BND = 19
+    BOB = 20
+    BOV = 21
+    BRL = 22
+    BSD = 23
+    BTN = 24
+    BWP = 25
+    BYN = 26
+    BZD = 27
+    CAD = 28
+    CDF = 29
+    CHE = 30
+    CHF = 31
+    CHW = 32
+    CLF = 33
+    CLP = 34
+    CNY = 35
+    COP = 36
+    COU = 37
+    CRC = 38
+    CUC = 39
+    CUP = 40
+    CVE = 41
+    CZK = 42
+    DJF = 43
+    DKK = 44
+    DOP = 45
+    DZD = 46
+    EGP = 47
+    ERN = 48
+    ETB = 49
+    FJD = 50
+    FKP = 51
+    GBP = 52
+    GEL = 53
+    GHS = 54
+    GIP = 55
+    GMD = 56
+    GNF = 57
+    GTQ = 58
+    GYD = 59
+    HKD = 60
+    HNL = 61
+    HTG = 62
+    HUF = 63
+    IDR = 64
+    ILS = 65
+    INR = 66
+    IQD = 67
+    IRR = 68
+    ISK = 69
+    JMD = 70
+    JOD = 71
+    JPY = 72
+    KES = 73
+    KGS = 74
+    KHR = 75
+    KMF = 76
+    KPW = 77
+    KRW = 78
+    KWD = 79
+    KYD = 80
+    KZT = 81
+    LAK = 82
+    LBP = 83
+    LKR = 84
+    LRD = 85
+    LSL = 86
+    LYD = 87
+    MAD = 88
+    MDL = 89
+    MGA = 90
+    MKD = 91
+    MMK = 92
+    MNT = 93
+    MOP = 94
+    MRU = 95
+    MUR = 96
+    MVR = 97
+    MWK = 98
+    MXN = 99
+    MXV = 100
+    MYR = 101
+    MZN = 102
+    NAD = 103
+    NGN = 104
+    NIO = 105
+    NOK = 106
+    NPR = 107
+    NZD = 108
+    OMR = 109
+    PAB = 110
+    PEN = 111
+    PGK = 112
+    PHP = 113
+    PKR = 114
+    PLN = 115
+    PYG = 116
+    QAR = 117
+    RON = 118
+    RSD = 119
+    RUB = 120
+    RWF = 121
+    SAR = 122
+    SBD = 123
+    SCR = 124
+    SDG = 125
+    SEK = 126
+    SGD = 127
+    SHP = 128
+    SLE = 129
+    SLL = 130
+    SOS = 131
+    SRD = 132
+    SSP = 133
+    STN = 134
+    SVC = 135
+    SYP = 136
+    SZL = 137
+    THB = 138
+    TJS = 139
+    TMT = 140
+    TND = 141
+    TOP = 142
+    TRY = 143
+    TTD = 144
+    TWD = 145
+    TZS = 146
+    UAH = 147
+    UGX = 148
+    USN = 149
+    UYI = 150
+    UYU = 151
+    UYW = 152
+    UZS = 153
+    VED = 154
+    VES = 155
+    VND = 156
+    VUV = 157
+    WST = 158
+    XAF = 159
+    XAG = 160
+    XAU = 161
+    XBA = 162
+    XBB = 163
+    XBC = 164
+    XBD = 165
+    XCD = 166
+    XCG = 167
+    XDR = 168
+    XOF = 169
+    XPD = 170
+    XPF = 171
+    XPT = 172
+    XSU = 173
+    XTS = 174
+    XUA = 175
+    XXX = 176
+    YER = 177
+    ZAR = 178
+    ZMW = 179
+    ZWG = 180
+    ZWL = 181
+    # Pence sterling, which DeGiro quotes London listings in.
+    GBX = 182
+
+    @property
+    def code(self) -> str:
+        return self.name
 
     @staticmethod
     def from_string(currency: str) -> Currency:
-        if currency in {"USD", "usd"}:
-            return Currency.USD
-
-        if currency in {"EUR", "eur"}:
-            return Currency.EUR
-
-        raise Exception(f"Unknown currency {currency}")
+        member = Currency.__members__.get(currency.upper())
+        if member is None:
+            raise Exception(f"Unknown currency {currency}")
+        return member
@@ -1,5 +1,58 @@
-from .de_giro_wrapper import DeGiroWrapper
-from .product_info import ProductInfo
-from .transaction import Transaction
+import importlib
+import typing
 
-__all__ = ("DeGiroWrapper", "ProductInfo", "Transaction")
+if typing.TYPE_CHECKING:
+    from .async_de_giro_wrapper import AsyncDeGiroWrapper
+    from .batch_refresh import AccountRefresh, BatchRefresher, Credentials
+    from .de_giro_session import DeGiroSession, SessionExpiredError
+    from .de_giro_wrapper import DeGiroWrapper
+    from .product_catalog import ProductCatalog, ProductView
+    from .product_info import ProductInfo, ProductInfoBatch
+    from .transaction import Transaction
+    from .transaction_frame import TransactionFrame
+
+__all__ = (
+    "AccountRefresh",
+    "AsyncDeGiroWrapper",
+    "BatchRefresher",
+    "Credentials",
+    "DeGiroSession",
+    "DeGiroWrapper",
+    "ProductCatalog",
+    "ProductInfo",
+    "ProductInfoBatch",
+    "ProductView",
+    "SessionExpiredError",
+    "Transaction",
+    "TransactionFrame",
+)
+
+_LOCATIONS = {
+    "AccountRefresh": ".batch_refresh",
+    "AsyncDeGiroWrapper": ".async_de_giro_wrapper",
+    "BatchRefresher": ".batch_refresh",
+    "Credentials": ".batch_refresh",
+    "DeGiroSession": ".de_giro_session",
+    "DeGiroWrapper": ".de_giro_wrapper",
+    "ProductCatalog": ".product_catalog",
+    "ProductInfo": ".product_info",
+    "ProductInfoBatch": ".product_info",
+    "ProductView": ".product_catalog",
+    "SessionExpiredError": ".de_giro_session",
+    "Transaction": ".transaction",
+    "TransactionFrame": ".transaction_frame",
+}
+
+
+def __getattr__(name: str) -> typing.Any:
+    location = _LOCATIONS.get(name)
+    if location is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(location, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import datetime
+import functools
+import typing
+
+from .de_giro_base import DeGiroBase
+from .product_info import ProductInfo, ProductInfoBatch
+from .transaction import Transaction
+from .transaction_frame import TransactionFrame
+from ..requests_wrapper.async_requests_protocol import AsyncRequestsProtocol
+from ..requests_wrapper.response_protocol import ResponseProtocol
+
+__all__ = ("AsyncDeGiroWrapper",)
+
+T = typing.TypeVar("T")
+
+
+class AsyncDeGiroWrapper(DeGiroBase):
+    def __init__(
+        self,
+        user: str,
+        password: str,
+        requests: AsyncRequestsProtocol,
+        max_concurrency: int = 8,
+    ) -> None:
+        super().__init__(user=user, password=password)
+        self._requests = requests
+        self._max_concurrency = max_concurrency
+        self._semaphore: typing.Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> AsyncDeGiroWrapper:
+        # Created here so the semaphore belongs to the loop running the wrapper.
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        await self._login()
+        await self._get_client_info()
+        return self
+
+    async def _login(self) -> None:
+        response = await self._post(**self._login_request())
+        self._session_id = self._parse_session_id(response.json())
+
+    async def _get_client_info(self) -> None:
+        response = await self._get(**self._client_info_request())
+        self._account_id = self._parse_account_id(response.json())
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self._logout()
+
+    async def _logout(self) -> None:
+        await self._get(**self._logout_request())
+
+    async def _get(self, **kwargs) -> ResponseProtocol:
+        async with self._semaphore:
+            return await self._requests.get(**kwargs)
+
+    async def _post(self, **kwargs) -> ResponseProtocol:
+        async with self._semaphore:
+            return await self._requests.post(**kwargs)
+
+    async def _fetch(
+        self,
+        send: typing.Callable[..., typing.Awaitable[ResponseProtocol]],
+        request: typing.Dict,
+        parse: typing.Callable[..., T],
+        *args,
+    ) -> T:
+        # Streamed bodies are read while parsing, which blocks, so it happens
+        # off the event loop. The permit is held until the parser has read and
+        # closed the body, since that is where most of the transfer happens.
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            response = await send(**request)
+            return await loop.run_in_executor(
+                None, functools.partial(parse, response, *args)
+            )
+
+    async def get_transactions(
+        self, start_date: datetime.datetime, end_date: datetime.datetime
+    ) -> typing.List[Transaction]:
+        return await self._fetch(
+            self._requests.get,
+            self._transactions_request(start_date, end_date),
+            self._stream_transactions,
+        )
+
+    async def get_transaction_frame(
+        self, start_date: datetime.datetime, end_date: datetime.datetime
+    ) -> TransactionFrame:
+        return await self._fetch(
+            self._requests.get,
+            self._transactions_request(start_date, end_date),
+            self._stream_transaction_frame,
+        )
+
+    async def get_transactions_for_windows(
+        self,
+        windows: typing.Iterable[typing.Tuple[datetime.datetime, datetime.datetime]],
+    ) -> typing.List[typing.List[Transaction]]:
+        return list(
+            await asyncio.gather(
+                *(
+                    self.get_transactions(start_date=start, end_date=end)
+                    for start, end in windows
+                )
+            )
+        )
+
+    async def get_product_info_by_id(
+        self, ids: typing.Set[int]
+    ) -> typing.Dict[int, ProductInfo]:
+        return await self._fetch(
+            self._requests.post,
+            self._product_info_request(ids),
+            self._stream_product_info,
+            ids,
+        )
+
+    async def get_product_info_for_batches(
+        self, batches: typing.Iterable[typing.Set[int]]
+    ) -> typing.Dict[int, ProductInfo]:
+        results = await asyncio.gather(
+            *(self.get_product_info_by_id(ids=ids) for ids in batches)
+        )
+        merged: typing.Dict[int, ProductInfo] = {}
+        for result in results:
+            merged.update(result)
+        return merged
+
+    async def get_product_info_chunked(
+        self, ids: typing.Set[int], chunk_size: int = 500
+    ) -> ProductInfoBatch:
+        results = await asyncio.gather(
+            *(
+                self._get_product_data(chunk)
+                for chunk in self._chunk_ids(ids, chunk_size)
+            )
+        )
+        batch = ProductInfoBatch()
+        for result in results:
+            batch.products.update(result)
+        batch.unresolved = set(ids) - batch.products.keys()
+        return batch
+
+    async def _get_product_data(
+        self, ids: typing.List[int]
+    ) -> typing.Dict[int, ProductInfo]:
+        return await self._fetch(
+            self._requests.post,
+            self._product_info_request(ids),
+            self._stream_product_data,
+        )
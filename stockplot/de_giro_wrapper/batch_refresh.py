@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import datetime
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from .de_giro_factory import DeGiroFactory
+from .product_info import ProductInfo
+from .transaction import Transaction
+from ..requests_wrapper.requests_protocol import RequestsProtocol
+from ..requests_wrapper.requests_service import requests_service
+from ..requests_wrapper.throttled_requests import (
+    HostRateLimiter,
+    RetryPolicy,
+    ThrottledRequests,
+)
+from ..service import bind_context
+
+__all__ = ("AccountRefresh", "BatchRefresher", "Credentials")
+
+
+@dataclass(frozen=True)
+class Credentials:
+    user: str
+    password: str = field(repr=False)
+
+
+@dataclass
+class AccountRefresh:
+    user: str
+    account_id: typing.Optional[int] = None
+    transactions: typing.List[Transaction] = field(default_factory=list)
+    products: typing.Dict[int, ProductInfo] = field(default_factory=dict)
+    error: typing.Optional[BaseException] = None
+    timings: typing.Dict[str, float] = field(default_factory=dict)  # seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def seconds(self) -> float:
+        return sum(self.timings.values())
+
+
+class BatchRefresher:
+    # All accounts share one request layer, so the concurrency limit and the
+    # per-host rate apply to the batch as a whole, not to each account.
+    def __init__(
+        self,
+        requests: typing.Optional[RequestsProtocol] = None,
+        max_concurrency: int = 8,
+        requests_per_second: typing.Optional[float] = 10.0,
+        burst: int = 4,
+        retry: RetryPolicy = RetryPolicy(),
+        max_accounts: int = 32,
+    ) -> None:
+        if requests is None:
+            requests = requests_service.get()()
+
+        rate_limiter = None
+        if requests_per_second is not None:
+            rate_limiter = HostRateLimiter(requests_per_second, burst=burst)
+
+        self._requests = ThrottledRequests(
+            requests,
+            max_concurrency=max_concurrency,
+            rate_limiter=rate_limiter,
+            retry=retry,
+        )
+        self._factory = DeGiroFactory(requests_factory=lambda: self._requests)
+        self._max_accounts = max_accounts
+
+    @property
+    def retries(self) -> int:
+        return self._requests.retries
+
+    def refresh(
+        self,
+        credentials: typing.Sequence[Credentials],
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+    ) -> typing.List[AccountRefresh]:
+        if not credentials:
+            return []
+
+        workers = min(self._max_accounts, len(credentials))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(
+                executor.map(
+                    bind_context(
+                        lambda account: self._refresh(account, start_date, end_date)
+                    ),
+                    credentials,
+                )
+            )
+
+    def _refresh(
+        self,
+        credentials: Credentials,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+    ) -> AccountRefresh:
+        result = AccountRefresh(user=credentials.user)
+        wrapper = self._factory.create(
+            user=credentials.user, password=credentials.password
+        )
+
+        def timed(step: str, call: typing.Callable[[], typing.Any]) -> typing.Any:
+            started = time.perf_counter()
+            try:
+                return call()
+            finally:
+                result.timings[step] = time.perf_counter() - started
+
+        try:
+            session = timed("login", wrapper.open_session)
+        except Exception as error:
+            result.error = error
+            return result
+
+        result.account_id = session.account_id
+        try:
+            result.transactions = timed(
+                "transactions",
+                lambda: wrapper.get_transactions(start_date, end_date),
+            )
+            ids = {transaction.product_id for transaction in result.transactions}
+            if ids:
+                result.products = timed(
+                    "product_info",
+                    lambda: wrapper.get_product_info_chunked(ids).products,
+                )
+        except Exception as error:
+            result.error = error
+        finally:
+            try:
+                timed("logout", lambda: wrapper.close_session(session))
+            except Exception as error:
+                if result.error is None:
+                    result.error = error
+        return result
@@ -0,0 +1,47 @@
+import datetime
+import typing
+
+__all__ = ("DateWindow", "fixed_windows", "month_windows")
+
+DateWindow = typing.Tuple[datetime.datetime, datetime.datetime]
+
+_ONE_DAY = datetime.timedelta(days=1)
+
+
+def _add_months(date: datetime.datetime, months: int) -> datetime.datetime:
+    month_index = date.month - 1 + months
+    return date.replace(
+        year=date.year + month_index // 12, month=month_index % 12 + 1, day=1
+    )
+
+
+def month_windows(
+    start_date: datetime.datetime, end_date: datetime.datetime, months: int = 1
+) -> typing.List[DateWindow]:
+    if months < 1:
+        raise ValueError(f"Window must span at least one month, got {months}.")
+
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        next_start = _add_months(window_start, months)
+        windows.append((window_start, min(next_start - _ONE_DAY, end_date)))
+        window_start = next_start
+    return windows
+
+
+def fixed_windows(
+    start_date: datetime.datetime,
+    end_date: datetime.datetime,
+    length: datetime.timedelta,
+) -> typing.List[DateWindow]:
+    if length < _ONE_DAY:
+        raise ValueError(f"Window must span at least one day, got {length}.")
+
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        next_start = window_start + length
+        windows.append((window_start, min(next_start - _ONE_DAY, end_date)))
+        window_start = next_start
+    return windows
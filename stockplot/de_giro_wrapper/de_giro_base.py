@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import contextlib
+import datetime
+import json
+import typing
+
+from .de_giro_session import DeGiroSession
+from .product_info import ProductInfo
+from .timestamps import parse_timestamp
+from .transaction import Transaction
+from .transaction_frame import TransactionFrame
+from ..currency import Currency
+from ..requests_wrapper.json_stream import JsonMemberStream
+from ..requests_wrapper.response_protocol import ResponseProtocol
+
+__all__ = ("DeGiroBase",)
+
+
+class DeGiroBase:
+    _LOGIN_URL = "https://trader.degiro.nl/login/secure/login"
+    _CLIENT_INFO_URL = "https://trader.degiro.nl/pa/secure/client"
+    _LOGOUT_URL = "https://trader.degiro.nl/trading/secure/logout"
+
+    _TRANSACTIONS_URL = "https://trader.degiro.nl/reporting/secure/v4/transactions"
+    _PRODUCT_INFO_URL = (
+        "https://trader.degiro.nl/product_search/secure/v5/products/info"
+    )
+
+    _STREAM_CHUNK_SIZE = 64 * 1024
+    _FRAME_BATCH_SIZE = 65536
+
+    def __init__(self, user: str, password: str) -> None:
+        self._user = user
+        self._password = password
+        self._session_id: typing.Optional[str] = None
+        self._account_id: typing.Optional[int] = None
+
+    @property
+    def account_id(self) -> typing.Optional[int]:
+        return self._account_id
+
+    @property
+    def session(self) -> typing.Optional[DeGiroSession]:
+        if self._session_id is None or self._account_id is None:
+            return None
+        return DeGiroSession(session_id=self._session_id, account_id=self._account_id)
+
+    def _set_session(self, session: DeGiroSession) -> None:
+        self._session_id = session.session_id
+        self._account_id = session.account_id
+
+    def _login_request(self) -> typing.Dict:
+        json_params = {
+            "username": self._user,
+            "password": self._password,
+            "isPassCodeReset": False,
+            "isRedirectToMobile": False,
+        }
+        return {"url": DeGiroBase._LOGIN_URL, "json": json_params}
+
+    def _client_info_request(self) -> typing.Dict:
+        return {
+            "url": DeGiroBase._CLIENT_INFO_URL,
+            "params": {"sessionId": self._session_id},
+        }
+
+    def _logout_request(self) -> typing.Dict:
+        logout_params = {"intAccount": self._account_id, "sessionId": self._session_id}
+        return {
+            "url": f"{DeGiroBase._LOGOUT_URL};jsessionid={self._session_id}",
+            "params": logout_params,
+        }
+
+    def _transactions_request(
+        self, start_date: datetime.datetime, end_date: datetime.datetime
+    ) -> typing.Dict:
+        transactions_parameters = {
+            "fromDate": start_date.strftime("%d/%m/%Y"),
+            "toDate": end_date.strftime("%d/%m/%Y"),
+            "group_transactions_by_order": False,
+            "intAccount": self._account_id,
+            "sessionId": self._session_id,
+        }
+        return {
+            "url": DeGiroBase._TRANSACTIONS_URL,
+            "params": transactions_parameters,
+            "stream": True,
+        }
+
+    def _product_info_request(self, ids: typing.Iterable[int]) -> typing.Dict:
+        product_info_parameters = {
+            "intAccount": self._account_id,
+            "sessionId": self._session_id,
+        }
+        return {
+            "url": DeGiroBase._PRODUCT_INFO_URL,
+            "headers": {"content-type": "application/json"},
+            "params": product_info_parameters,
+            "data": json.dumps(list(ids)),
+            "stream": True,
+        }
+
+    @staticmethod
+    def _parse_session_id(payload: typing.Dict) -> str:
+        return payload["sessionId"]
+
+    @staticmethod
+    def _parse_account_id(payload: typing.Dict) -> int:
+        return payload["data"]["intAccount"]
+
+    @staticmethod
+    def _parse_transaction(transaction: typing.Dict) -> Transaction:
+        return Transaction(
+            product_id=transaction["productId"],
+            quantity=transaction["quantity"],
+            transaction_datetime=parse_timestamp(transaction["date"]),
+            id=transaction.get("id"),
+        )
+
+    @staticmethod
+    def _stream_data(response: ResponseProtocol) -> JsonMemberStream:
+        return JsonMemberStream(
+            response.iter_content(chunk_size=DeGiroBase._STREAM_CHUNK_SIZE), "data"
+        )
+
+    @staticmethod
+    def _stream_transactions(response: ResponseProtocol) -> typing.List[Transaction]:
+        stream = DeGiroBase._stream_data(response)
+        with contextlib.closing(response):
+            transactions = [DeGiroBase._parse_transaction(row) for row in stream]
+        if not stream.found:
+            raise KeyError("data")
+        return transactions
+
+    @staticmethod
+    def _stream_transaction_frame(response: ResponseProtocol) -> TransactionFrame:
+        # Raw rows are converted to columns in fixed-size batches, so only one
+        # batch of decoded dictionaries is alive at a time.
+        stream = DeGiroBase._stream_data(response)
+        frames, batch = [], []
+        with contextlib.closing(response):
+            for row in stream:
+                batch.append(row)
+                if len(batch) == DeGiroBase._FRAME_BATCH_SIZE:
+                    frames.append(TransactionFrame.from_payload(batch))
+                    batch = []
+        if not stream.found:
+            raise KeyError("data")
+        if batch or not frames:
+            frames.append(TransactionFrame.from_payload(batch))
+        return frames[0] if len(frames) == 1 else TransactionFrame.concat(frames)
+
+    @staticmethod
+    def _chunk_ids(
+        ids: typing.Iterable[int], chunk_size: int
+    ) -> typing.List[typing.List[int]]:
+        if chunk_size < 1:
+            raise ValueError(f"Chunk size must be positive, got {chunk_size}.")
+
+        ordered = sorted(ids)
+        return [
+            ordered[index : index + chunk_size]
+            for index in range(0, len(ordered), chunk_size)
+        ]
+
+    @staticmethod
+    def _parse_product(product: typing.Dict) -> ProductInfo:
+        return ProductInfo(
+            id=int(product["id"]),
+            isin=product["isin"],
+            name=product["name"],
+            symbol=product["symbol"],
+            currency=Currency.from_string(product["currency"]),
+        )
+
+    @staticmethod
+    def _stream_product_info(
+        response: ResponseProtocol, ids: typing.Iterable[int]
+    ) -> typing.Dict[int, ProductInfo]:
+        stream = DeGiroBase._stream_data(response)
+        with contextlib.closing(response):
+            products = {
+                int(identifier): DeGiroBase._parse_product(product)
+                for identifier, product in stream
+            }
+        if not stream.found:
+            raise Exception(f"No products found with ids {ids}.")
+        return products
+
+    @staticmethod
+    def _stream_product_data(
+        response: ResponseProtocol,
+    ) -> typing.Dict[int, ProductInfo]:
+        with contextlib.closing(response):
+            return {
+                int(identifier): DeGiroBase._parse_product(product)
+                for identifier, product in DeGiroBase._stream_data(response)
+            }
@@ -1,16 +1,52 @@
-from typing import Callable
+from __future__ import annotations
+
+from typing import Callable, Optional
 
 from . import DeGiroWrapper
+from .async_de_giro_wrapper import AsyncDeGiroWrapper
+from .de_giro_session import SessionSource
+from stockplot.requests_wrapper.async_requests_protocol import AsyncRequestsProtocol
 from stockplot.requests_wrapper.requests_protocol import RequestsProtocol
 
-__all__ = ("DeGiroFactory",)
+__all__ = ("AsyncDeGiroFactory", "DeGiroFactory")
 
 
 class DeGiroFactory:
-    def __init__(self, requests_factory: Callable[[], RequestsProtocol]) -> None:
+    def __init__(
+        self,
+        requests_factory: Callable[[], RequestsProtocol],
+        session_source: Optional[SessionSource] = None,
+    ) -> None:
         self._requests_factory = requests_factory
+        self._session_source = session_source
 
     def create(self, user: str, password: str) -> DeGiroWrapper:
         return DeGiroWrapper(
-            user=user, password=password, requests=self._requests_factory()
+            user=user,
+            password=password,
+            requests=self._requests_factory(),
+            session_source=self._session_source,
+        )
+
+    def with_session_source(self, session_source: SessionSource) -> DeGiroFactory:
+        return DeGiroFactory(
+            requests_factory=self._requests_factory, session_source=session_source
+        )
+
+
+class AsyncDeGiroFactory:
+    def __init__(
+        self,
+        requests_factory: Callable[[], AsyncRequestsProtocol],
+        max_concurrency: int = 8,
+    ) -> None:
+        self._requests_factory = requests_factory
+        self._max_concurrency = max_concurrency
+
+    def create(self, user: str, password: str) -> AsyncDeGiroWrapper:
+        return AsyncDeGiroWrapper(
+            user=user,
+            password=password,
+            requests=self._requests_factory(),
+            max_concurrency=self._max_concurrency,
         )
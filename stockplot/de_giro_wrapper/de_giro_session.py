@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Protocol
+
+__all__ = ("DeGiroSession", "SessionExpiredError", "SessionSource")
+
+
+@dataclass(frozen=True)
+class DeGiroSession:
+    session_id: str
+    account_id: int
+
+
+class SessionExpiredError(Exception):
+    pass
+
+
+class SessionSource(Protocol):
+    def acquire(self, user: str, password: str) -> DeGiroSession:
+        ...
+
+    def renew(self, user: str, password: str, expired: DeGiroSession) -> DeGiroSession:
+        ...
+
+    def release(self, user: str, session: DeGiroSession) -> None:
+        ...
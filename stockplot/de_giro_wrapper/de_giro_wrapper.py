@@ -1,121 +1,177 @@
 from __future__ import annotations
 
 import datetime
-import json
 import typing
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import pytz
-
-from .product_info import ProductInfo
+from .date_windows import DateWindow, month_windows
+from .de_giro_base import DeGiroBase
+from .de_giro_session import DeGiroSession, SessionExpiredError, SessionSource
+from .product_info import ProductInfo, ProductInfoBatch
 from .transaction import Transaction
-from ..currency import Currency
+from .transaction_frame import TransactionFrame
 from ..requests_wrapper.requests_protocol import RequestsProtocol
+from ..requests_wrapper.response_protocol import ResponseProtocol
+from ..service import bind_context
 
 __all__ = ("DeGiroWrapper",)
 
 
-class DeGiroWrapper:
-    _LOGIN_URL = "https://trader.degiro.nl/login/secure/login"
-    _CLIENT_INFO_URL = "https://trader.degiro.nl/pa/secure/client"
-    _LOGOUT_URL = "https://trader.degiro.nl/trading/secure/logout"
-
-    _TRANSACTIONS_URL = "https://trader.degiro.nl/reporting/secure/v4/transactions"
-    _PRODUCT_INFO_URL = (
-        "https://trader.degiro.nl/product_search/secure/v5/products/info"
-    )
+class DeGiroWrapper(DeGiroBase):
+    _SESSION_EXPIRED_STATUS = 401
 
-    def __init__(self, user: str, password: str, requests: RequestsProtocol) -> None:
-        self._user = user
-        self._password = password
+    def __init__(
+        self,
+        user: str,
+        password: str,
+        requests: RequestsProtocol,
+        session_source: typing.Optional[SessionSource] = None,
+    ) -> None:
+        super().__init__(user=user, password=password)
         self._requests = requests
-        self._session_id: typing.Optional[str] = None
-        self._account_id: typing.Optional[int] = None
+        self._session_source = session_source
 
     def __enter__(self) -> DeGiroWrapper:
+        if self._session_source is None:
+            self.open_session()
+        else:
+            self._set_session(self._session_source.acquire(self._user, self._password))
+        return self
+
+    def open_session(self) -> DeGiroSession:
         self._login()
         self._get_client_info()
-        return self
+        return DeGiroSession(session_id=self._session_id, account_id=self._account_id)
+
+    def close_session(self, session: DeGiroSession) -> None:
+        self._set_session(session)
+        self._logout()
 
     def _login(self) -> None:
-        json_params = {
-            "username": self._user,
-            "password": self._password,
-            "isPassCodeReset": False,
-            "isRedirectToMobile": False,
-        }
-        response = self._requests.post(url=DeGiroWrapper._LOGIN_URL, json=json_params)
-        self._session_id = response.json()["sessionId"]
+        response = self._requests.post(**self._login_request())
+        self._session_id = self._parse_session_id(response.json())
 
     def _get_client_info(self) -> None:
-        response = self._requests.get(
-            url=DeGiroWrapper._CLIENT_INFO_URL, params={"sessionId": self._session_id}
-        )
-        self._account_id = response.json()["data"]["intAccount"]
+        response = self._requests.get(**self._client_info_request())
+        self._account_id = self._parse_account_id(response.json())
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        self._logout()
+        if self._session_source is None:
+            self._logout()
+        else:
+            self._session_source.release(self._user, self.session)
 
     def _logout(self) -> None:
-        logout_params = {"intAccount": self._account_id, "sessionId": self._session_id}
-        self._requests.get(
-            url=f"{DeGiroWrapper._LOGOUT_URL};jsessionid={self._session_id}",
-            params=logout_params,
+        self._requests.get(**self._logout_request())
+
+    def _send(
+        self,
+        method: typing.Callable[..., ResponseProtocol],
+        build_request: typing.Callable[..., typing.Dict],
+        *args,
+    ) -> ResponseProtocol:
+        response = method(**build_request(*args))
+        if response.status_code != DeGiroWrapper._SESSION_EXPIRED_STATUS:
+            return response
+
+        # A streamed 401 still holds its connection until it is closed.
+        response.close()
+        if self._session_source is None:
+            raise SessionExpiredError(f"Session expired for user {self._user}.")
+
+        self._set_session(
+            self._session_source.renew(self._user, self._password, self.session)
         )
+        return method(**build_request(*args))
 
     def get_transactions(
         self, start_date: datetime.datetime, end_date: datetime.datetime
     ) -> typing.List[Transaction]:
-        transactions_parameters = {
-            "fromDate": start_date.strftime("%d/%m/%Y"),
-            "toDate": end_date.strftime("%d/%m/%Y"),
-            "group_transactions_by_order": False,
-            "intAccount": self._account_id,
-            "sessionId": self._session_id,
-        }
-
-        transaction_response = self._requests.get(
-            url=DeGiroWrapper._TRANSACTIONS_URL, params=transactions_parameters
+        transaction_response = self._send(
+            self._requests.get, self._transactions_request, start_date, end_date
+        )
+        return self._stream_transactions(transaction_response)
+
+    def get_transaction_frame(
+        self, start_date: datetime.datetime, end_date: datetime.datetime
+    ) -> TransactionFrame:
+        transaction_response = self._send(
+            self._requests.get, self._transactions_request, start_date, end_date
         )
-        return [
-            Transaction(
-                product_id=transaction["productId"],
-                quantity=transaction["quantity"],
-                transaction_datetime=datetime.datetime.strptime(
-                    transaction["date"], "%Y-%m-%dT%H:%M:%S%z"
-                )
-                .astimezone(pytz.utc)
-                .replace(tzinfo=None),
+        return self._stream_transaction_frame(transaction_response)
+
+    def get_transactions_windowed(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+        windows: typing.Optional[typing.Sequence[DateWindow]] = None,
+        max_workers: int = 4,
+    ) -> typing.List[Transaction]:
+        transactions = list(
+            self.iter_transactions_windowed(
+                start_date=start_date,
+                end_date=end_date,
+                windows=windows,
+                max_workers=max_workers,
             )
-            for transaction in transaction_response.json()["data"]
-        ]
+        )
+        transactions.sort(key=_transaction_order)
+        return transactions
+
+    def iter_transactions_windowed(
+        self,
+        start_date: datetime.datetime,
+        end_date: datetime.datetime,
+        windows: typing.Optional[typing.Sequence[DateWindow]] = None,
+        max_workers: int = 4,
+    ) -> typing.Iterator[Transaction]:
+        if windows is None:
+            windows = month_windows(start_date, end_date)
+
+        seen_ids: typing.Set[int] = set()
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [
+                executor.submit(bind_context(self.get_transactions), start, end)
+                for start, end in windows
+            ]
+            for future in as_completed(futures):
+                for transaction in sorted(future.result(), key=_transaction_order):
+                    if transaction.id is not None:
+                        if transaction.id in seen_ids:
+                            continue
+                        seen_ids.add(transaction.id)
+                    yield transaction
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     def get_product_info_by_id(
         self, ids: typing.Set[int]
     ) -> typing.Dict[int, ProductInfo]:
-        product_info_parameters = {
-            "intAccount": self._account_id,
-            "sessionId": self._session_id,
-        }
-        headers = {"content-type": "application/json"}
-        serialized_ids = json.dumps(list(ids))
-
-        product_info_response = self._requests.post(
-            url=DeGiroWrapper._PRODUCT_INFO_URL,
-            headers=headers,
-            params=product_info_parameters,
-            data=serialized_ids,
+        product_info_response = self._send(
+            self._requests.post, self._product_info_request, ids
         )
+        return self._stream_product_info(product_info_response, ids)
+
+    def get_product_info_chunked(
+        self, ids: typing.Set[int], chunk_size: int = 500, max_workers: int = 4
+    ) -> ProductInfoBatch:
+        batch = ProductInfoBatch()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for products in executor.map(
+                bind_context(self._get_product_data), self._chunk_ids(ids, chunk_size)
+            ):
+                batch.products.update(products)
+
+        batch.unresolved = set(ids) - batch.products.keys()
+        return batch
+
+    def _get_product_data(self, ids: typing.List[int]) -> typing.Dict[int, ProductInfo]:
+        product_info_response = self._send(
+            self._requests.post, self._product_info_request, ids
+        )
+        return self._stream_product_data(product_info_response)
 
-        if "data" not in product_info_response.json():
-            raise Exception(f"No products found with ids {ids}.")
 
-        return {
-            int(identifier): ProductInfo(
-                id=int(product["id"]),
-                isin=product["isin"],
-                name=product["name"],
-                symbol=product["symbol"],
-                currency=Currency.from_string(product["currency"]),
-            )
-            for identifier, product in product_info_response.json()["data"].items()
-        }
+def _transaction_order(transaction: Transaction) -> typing.Tuple:
+    return transaction.transaction_datetime, transaction.id or 0
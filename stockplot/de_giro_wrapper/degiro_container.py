@@ -1,13 +1,24 @@
-from .de_giro_factory import DeGiroFactory
+from .de_giro_factory import AsyncDeGiroFactory, DeGiroFactory
+from ..requests_wrapper.async_requests_service import async_requests_service
 from ..requests_wrapper.requests_service import requests_service
-from ..service import Service
+from ..service import Lifetime, Service
 
-__all__ = ("de_giro_factory_service",)
+__all__ = ("async_de_giro_factory_service", "de_giro_factory_service")
 
 
+# The factories are shared, so they look the request layer up for every
+# wrapper they create; overriding requests later still takes effect.
 def _get_factory() -> DeGiroFactory:
-    requests = requests_service.get()
-    return DeGiroFactory(requests_factory=requests)
+    return DeGiroFactory(requests_factory=lambda: requests_service.get()())
 
 
-de_giro_factory_service: Service[DeGiroFactory] = Service(value=_get_factory)
+def _get_async_factory() -> AsyncDeGiroFactory:
+    return AsyncDeGiroFactory(requests_factory=lambda: async_requests_service.get()())
+
+
+de_giro_factory_service: Service[DeGiroFactory] = Service(
+    value=_get_factory, lifetime=Lifetime.SINGLETON
+)
+async_de_giro_factory_service: Service[AsyncDeGiroFactory] = Service(
+    value=_get_async_factory, lifetime=Lifetime.SINGLETON
+)
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+
+from .product_info import ProductInfo, ProductInfoBatch
+from ..currency import Currency
+
+__all__ = ("ProductCatalog", "ProductView")
+
+Products = typing.Union[
+    typing.Mapping[int, ProductInfo], typing.Iterable[ProductInfo], ProductInfoBatch
+]
+
+
+def _grow(array: np.ndarray, size: int) -> np.ndarray:
+    if size <= len(array):
+        return array
+    grown = np.empty(max(size, 2 * len(array), 16), dtype=array.dtype)
+    grown[: len(array)] = array
+    return grown
+
+
+class _StringPool:
+    # Strings stored as UTF-8 in a shared buffer and referred to by their
+    # position in its offset table; for values that are only ever read back.
+    def __init__(self) -> None:
+        self._data = bytearray()
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def string(self, code: int) -> str:
+        return self._data[self._offsets[code] : self._offsets[code + 1]].decode()
+
+    def append_many(self, values: typing.Sequence[str]) -> np.ndarray:
+        return np.fromiter(map(self._append, values), np.int32, len(values))
+
+    def _append(self, value: str) -> int:
+        self._data += value.encode()
+        self._offsets = _grow(self._offsets, self._count + 2)
+        self._count += 1
+        self._offsets[self._count] = len(self._data)
+        return self._count - 1
+
+
+class _SortedIndex:
+    # A sorted copy of one column plus the row each entry came from, searched
+    # with binary search.
+    __slots__ = ("keys", "rows")
+
+    def __init__(self, column: np.ndarray) -> None:
+        self.rows = np.argsort(column, kind="stable").astype(np.int32)
+        self.keys = column[self.rows]
+
+    def row(self, key: typing.Any) -> typing.Optional[int]:
+        position = self.keys.searchsorted(key)
+        if position < len(self.keys) and self.keys.item(position) == key:
+            return self.rows.item(position)
+        return None
+
+    def rows_of(self, key: typing.Any) -> np.ndarray:
+        start = self.keys.searchsorted(key)
+        end = self.keys.searchsorted(key, side="right")
+        return self.rows[start:end]
+
+    def rows_many(self, keys: np.ndarray) -> np.ndarray:
+        # Unknown keys map to -1.
+        if not len(self.keys):
+            return np.full(len(keys), -1, dtype=np.int64)
+        positions = np.minimum(self.keys.searchsorted(keys), len(self.keys) - 1)
+        return np.where(self.keys[positions] == keys, self.rows[positions], -1)
+
+
+def _encode(values: typing.Iterable[str], width: int) -> np.ndarray:
+    # Fixed-width byte strings, at least `width` bytes wide and widened to fit
+    # the longest value.
+    encoded = np.array([value.encode() for value in values], dtype=np.bytes_)
+    return encoded.astype(f"S{max(width, encoded.dtype.itemsize)}")
+
+
+class ProductView:
+    __slots__ = ("_catalog", "_row")
+
+    def __init__(self, catalog: ProductCatalog, row: int) -> None:
+        self._catalog = catalog
+        self._row = row
+
+    @property
+    def id(self) -> int:
+        return int(self._catalog._ids[self._row])
+
+    @property
+    def isin(self) -> str:
+        return self._catalog._isins[self._row].decode()
+
+    @property
+    def name(self) -> str:
+        return self._catalog._name_pool.string(self._catalog._names[self._row])
+
+    @property
+    def symbol(self) -> str:
+        return self._catalog._symbols[self._row].decode()
+
+    @property
+    def currency(self) -> Currency:
+        return self._catalog._currencies[self._catalog._currency_codes[self._row]]
+
+    def to_product_info(self) -> ProductInfo:
+        return ProductInfo(
+            id=self.id,
+            isin=self.isin,
+            name=self.name,
+            symbol=self.symbol,
+            currency=self.currency,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, (ProductInfo, ProductView)):
+            return NotImplemented
+        return (self.id, self.isin, self.name, self.symbol, self.currency) == (
+            other.id,
+            other.isin,
+            other.name,
+            other.symbol,
+            other.currency,
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.to_product_info())
+
+    def __repr__(self) -> str:
+        return f"ProductView({self.to_product_info()!r})"
+
+
+class ProductCatalog:
+    # Products are stored as columns in insertion order, so a row never moves
+    # and views stay valid across merges. ISINs and symbols are fixed-width
+    # byte strings and names live in a shared UTF-8 pool. Lookups binary
+    # search sorted copies of the id, ISIN and symbol columns.
+    def __init__(self, products: typing.Optional[Products] = None) -> None:
+        self._size = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._isins = np.empty(0, dtype="S12")
+        self._symbols = np.empty(0, dtype="S8")
+        self._names = np.empty(0, dtype=np.int32)
+        self._currency_codes = np.empty(0, dtype=np.int16)
+
+        self._name_pool = _StringPool()
+        self._currencies: typing.List[Currency] = []
+        self._id_index = _SortedIndex(self._ids)
+        # Built on the first lookup after a merge.
+        self._indexes: typing.Dict[str, _SortedIndex] = {}
+
+        if products is not None:
+            self.merge(products)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, product_id: object) -> bool:
+        return (
+            isinstance(product_id, (int, np.integer))
+            and self._id_index.row(product_id) is not None
+        )
+
+    def __iter__(self) -> typing.Iterator[ProductView]:
+        return (ProductView(self, row) for row in range(self._size))
+
+    def __getitem__(self, product_id: int) -> ProductView:
+        product = self.get(product_id)
+        if product is None:
+            raise KeyError(product_id)
+        return product
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[: self._size]
+
+    def get(self, product_id: int) -> typing.Optional[ProductView]:
+        row = self._id_index.row(product_id)
+        return None if row is None else ProductView(self, row)
+
+    def get_many(self, ids: typing.Iterable[int]) -> typing.Dict[int, ProductView]:
+        ids = np.fromiter(ids, np.int64)
+        rows = self._id_index.rows_many(ids)
+        found = rows != -1
+        return {
+            product_id: ProductView(self, row)
+            for product_id, row in zip(ids[found].tolist(), rows[found].tolist())
+        }
+
+    def by_isin(self, isin: str) -> typing.List[ProductView]:
+        return self._lookup("isin", self._isins, isin)
+
+    def by_symbol(self, symbol: str) -> typing.List[ProductView]:
+        return self._lookup("symbol", self._symbols, symbol)
+
+    def _lookup(
+        self, column: str, values: np.ndarray, value: str
+    ) -> typing.List[ProductView]:
+        key = value.encode()
+        # A longer key would be truncated to the column width and could match.
+        if len(key) > values.dtype.itemsize:
+            return []
+
+        index = self._indexes.get(column)
+        if index is None:
+            index = self._indexes[column] = _SortedIndex(values[: self._size])
+        # The same ISIN or symbol can be listed on several exchanges; the
+        # stable sort keeps its listings in insertion order.
+        return [ProductView(self, row) for row in index.rows_of(key).tolist()]
+
+    def merge(self, products: Products) -> int:
+        if isinstance(products, ProductInfoBatch):
+            products = products.products
+        if isinstance(products, typing.Mapping):
+            products = products.values()
+        products = list(products)
+        if not products:
+            return 0
+
+        ids = np.fromiter((p.id for p in products), np.int64, len(products))
+        # Later entries for the same id win.
+        ids, first = np.unique(ids[::-1], return_index=True)
+        products = [products[len(products) - 1 - index] for index in first]
+
+        rows = self._id_index.rows_many(ids)
+        new = rows == -1
+        added = int(np.count_nonzero(new))
+        rows[new] = self._size + np.arange(added)
+        self._reserve(self._size + added)
+        self._size += added
+
+        isins = _encode((p.isin for p in products), self._isins.dtype.itemsize)
+        symbols = _encode((p.symbol for p in products), self._symbols.dtype.itemsize)
+        self._isins = self._isins.astype(isins.dtype, copy=False)
+        self._symbols = self._symbols.astype(symbols.dtype, copy=False)
+
+        self._ids[rows] = ids
+        self._isins[rows] = isins
+        self._symbols[rows] = symbols
+        self._names[rows] = self._name_codes(products, rows, new)
+        self._currency_codes[rows] = [self._currency_code(p.currency) for p in products]
+
+        if added:
+            self._id_index = _SortedIndex(self.ids)
+        self._indexes.clear()
+        return added
+
+    def _name_codes(
+        self, products: typing.List[ProductInfo], rows: np.ndarray, new: np.ndarray
+    ) -> np.ndarray:
+        # Refreshing a product usually leaves its name alone, so existing rows
+        # keep their stored name unless it actually changed.
+        codes = np.empty(len(products), dtype=np.int32)
+        changed = new.copy()
+        for position in np.flatnonzero(~new):
+            code = self._names[rows[position]]
+            codes[position] = code
+            changed[position] = self._name_pool.string(code) != products[position].name
+        positions = np.flatnonzero(changed)
+        codes[positions] = self._name_pool.append_many(
+            [products[position].name for position in positions]
+        )
+        return codes
+
+    def _currency_code(self, currency: Currency) -> int:
+        try:
+            return self._currencies.index(currency)
+        except ValueError:
+            self._currencies.append(currency)
+            return len(self._currencies) - 1
+
+    def _reserve(self, size: int) -> None:
+        self._ids = _grow(self._ids, size)
+        self._isins = _grow(self._isins, size)
+        self._names = _grow(self._names, size)
+        self._symbols = _grow(self._symbols, size)
+        self._currency_codes = _grow(self._currency_codes, size)
@@ -1,8 +1,9 @@
-from dataclasses import dataclass
+import typing
+from dataclasses import dataclass, field
 
 from ..currency import Currency
 
-__all__ = ("ProductInfo",)
+__all__ = ("ProductInfo", "ProductInfoBatch")
 
 
 @dataclass(frozen=True)
@@ -12,3 +13,9 @@ class ProductInfo:
     name: str
     symbol: str
     currency: Currency
+
+
+@dataclass
+class ProductInfoBatch:
+    products: typing.Dict[int, ProductInfo] = field(default_factory=dict)
+    unresolved: typing.Set[int] = field(default_factory=set)
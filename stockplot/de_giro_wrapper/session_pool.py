@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import datetime
+import threading
+import time
+import typing
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from .de_giro_factory import DeGiroFactory
+from .de_giro_session import DeGiroSession
+
+__all__ = ("SessionPool",)
+
+
+@dataclass
+class _PooledSession:
+    password: str
+    session: typing.Optional[DeGiroSession] = None
+    last_used: float = 0.0
+    leases: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class SessionPool:
+    def __init__(
+        self,
+        factory: DeGiroFactory,
+        max_sessions: int = 16,
+        max_idle: datetime.timedelta = datetime.timedelta(minutes=25),
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._factory = factory
+        self._max_sessions = max_sessions
+        self._max_idle = max_idle.total_seconds()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: typing.OrderedDict[str, _PooledSession] = OrderedDict()
+        # Entries whose password changed while leased, until their last release.
+        self._replaced: typing.List[typing.Tuple[str, _PooledSession]] = []
+        self._logins = 0
+        self._logouts = 0
+
+    def __enter__(self) -> SessionPool:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @property
+    def factory(self) -> DeGiroFactory:
+        return self._factory.with_session_source(self)
+
+    @property
+    def logins(self) -> int:
+        return self._logins
+
+    @property
+    def logouts(self) -> int:
+        return self._logouts
+
+    def acquire(self, user: str, password: str) -> DeGiroSession:
+        with self._lock:
+            entry = self._entries.get(user)
+            stale = None
+            if entry is None or entry.password != password:
+                stale = self._replace(user, entry)
+                entry = self._entries[user] = _PooledSession(password=password)
+            self._entries.move_to_end(user)
+            entry.leases += 1
+
+        if stale is not None:
+            self._logout(user, stale)
+
+        try:
+            with entry.lock:
+                idle = self._clock() - entry.last_used
+                if entry.session is not None and idle > self._max_idle:
+                    self._logout(user, entry)
+                    entry.session = None
+                if entry.session is None:
+                    entry.session = self._login(user, password)
+                entry.last_used = self._clock()
+                session = entry.session
+        except BaseException:
+            with self._lock:
+                entry.leases -= 1
+            raise
+
+        self._evict_idle()
+        return session
+
+    def renew(self, user: str, password: str, expired: DeGiroSession) -> DeGiroSession:
+        stale = None
+        with self._lock:
+            entry = self._entries.get(user)
+            if entry is None or entry.password != password:
+                entry = next(
+                    (
+                        replaced
+                        for name, replaced in self._replaced
+                        if name == user and replaced.session == expired
+                    ),
+                    None,
+                )
+            if entry is None:
+                # The entry was closed or replaced while this lease was out,
+                # so the lease moves to a fresh one.
+                stale = self._replace(user, self._entries.get(user))
+                entry = self._entries[user] = _PooledSession(password=password)
+                entry.leases = 1
+
+        if stale is not None:
+            self._logout(user, stale)
+
+        with entry.lock:
+            # Another lease may already have replaced the expired session.
+            if entry.session is None or entry.session == expired:
+                entry.session = self._login(user, password)
+            entry.last_used = self._clock()
+            return entry.session
+
+    def release(self, user: str, session: DeGiroSession) -> None:
+        retired = None
+        with self._lock:
+            for index, (name, replaced) in enumerate(self._replaced):
+                if name == user and replaced.session == session:
+                    replaced.leases -= 1
+                    if replaced.leases == 0:
+                        retired = replaced
+                        del self._replaced[index]
+                    break
+            else:
+                entry = self._entries.get(user)
+                if entry is None:
+                    return
+                entry.leases -= 1
+                entry.last_used = self._clock()
+
+        if retired is not None:
+            self._logout(user, retired)
+        self._evict_idle()
+
+    def close(self) -> None:
+        with self._lock:
+            entries = list(self._entries.items()) + self._replaced
+            self._entries.clear()
+            self._replaced = []
+
+        # One failed logout must not leave the remaining sessions open; the
+        # first error is raised once every session has been tried.
+        errors = []
+        for user, entry in entries:
+            try:
+                self._logout(user, entry)
+            except Exception as error:
+                errors.append(error)
+        if errors:
+            raise errors[0]
+
+    def _evict_idle(self) -> None:
+        evicted = []
+        with self._lock:
+            for user in list(self._entries):
+                if len(self._entries) <= self._max_sessions:
+                    break
+                entry = self._entries[user]
+                if entry.leases == 0:
+                    evicted.append((user, self._entries.pop(user)))
+
+        for user, entry in evicted:
+            self._logout(user, entry)
+
+    def _replace(
+        self, user: str, entry: typing.Optional[_PooledSession]
+    ) -> typing.Optional[_PooledSession]:
+        # Called under self._lock. Returns the entry to log out now, if any.
+        if entry is None:
+            return None
+        if entry.leases == 0:
+            return entry
+        self._replaced.append((user, entry))
+        return None
+
+    def _login(self, user: str, password: str) -> DeGiroSession:
+        session = self._factory.create(user=user, password=password).open_session()
+        with self._lock:
+            self._logins += 1
+        return session
+
+    def _logout(self, user: str, entry: _PooledSession) -> None:
+        if entry.session is None:
+            return
+
+        wrapper = self._factory.create(user=user, password=entry.password)
+        wrapper.close_session(entry.session)
+        with self._lock:
+            self._logouts += 1
@@ -0,0 +1,140 @@
+import datetime
+import functools
+import typing
+
+import numpy as np
+
+__all__ = ("parse_timestamp", "parse_timestamps")
+
+# DeGiro sends fixed-width local times with a UTC offset: 2021-03-28T03:30:00+02:00
+_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+_WIDTH = 25
+_SEPARATORS = {4: b"-", 7: b"-", 10: b"T", 13: b":", 16: b":", 22: b":"}
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+_DIGITS = (0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18, 20, 21, 23, 24)
+
+
+def _parse_slow(value: str) -> datetime.datetime:
+    return (
+        datetime.datetime.strptime(value, _FORMAT)
+        .astimezone(datetime.timezone.utc)
+        .replace(tzinfo=None)
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _offset(value: str) -> typing.Optional[datetime.timedelta]:
+    if len(value) != 6 or value[0] not in "+-" or value[3] != ":":
+        return None
+    digits = value[1:3] + value[4:6]
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+
+    hours, minutes = int(value[1:3]), int(value[4:6])
+    # Out-of-range offsets go through strptime, as in parse_timestamps.
+    if hours > 23 or minutes > 59:
+        return None
+    delta = datetime.timedelta(hours=hours, minutes=minutes)
+    return -delta if value[0] == "-" else delta
+
+
+def _is_fixed_layout(value: str) -> bool:
+    if len(value) != _WIDTH:
+        return False
+    if value[4] != "-" or value[7] != "-" or value[10] != "T":
+        return False
+    if value[13] != ":" or value[16] != ":":
+        return False
+
+    digits = value[0:4] + value[5:7] + value[8:10] + value[11:13] + value[14:16]
+    digits += value[17:19]
+    return digits.isascii() and digits.isdigit()
+
+
+def parse_timestamp(value: str) -> datetime.datetime:
+    if _is_fixed_layout(value):
+        offset = _offset(value[19:])
+        if offset is not None:
+            try:
+                local = datetime.datetime(
+                    int(value[0:4]),
+                    int(value[5:7]),
+                    int(value[8:10]),
+                    int(value[11:13]),
+                    int(value[14:16]),
+                    int(value[17:19]),
+                )
+            except ValueError:
+                pass
+            else:
+                return local - offset
+
+    return _parse_slow(value)
+
+
+def _days_from_civil(
+    year: np.ndarray, month: np.ndarray, day: np.ndarray
+) -> np.ndarray:
+    # Howard Hinnant's days_from_civil, vectorised over int64 arrays.
+    year = year - (month <= 2)
+    era = np.floor_divide(year, 400)
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + np.where(month > 2, -3, 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def parse_timestamps(values: typing.Sequence[str]) -> np.ndarray:
+    count = len(values)
+    if count == 0:
+        return np.empty(0, dtype="datetime64[ns]")
+
+    try:
+        # One spare byte so longer strings are not silently truncated to fit.
+        raw = np.array(values, dtype=f"S{_WIDTH + 1}")
+    except UnicodeEncodeError:
+        return np.array([_parse_slow(value) for value in values], "datetime64[ns]")
+
+    lengths = np.char.str_len(raw)
+    chars = raw.view(np.uint8).reshape(count, _WIDTH + 1)
+
+    valid = lengths == _WIDTH
+    for position, separator in _SEPARATORS.items():
+        valid &= chars[:, position] == separator[0]
+    valid &= (chars[:, 19] == ord("+")) | (chars[:, 19] == ord("-"))
+
+    digits = chars[:, _DIGITS].astype(np.int64) - ord("0")
+    valid &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 4] * 10 + digits[:, 5]
+    day = digits[:, 6] * 10 + digits[:, 7]
+    hour = digits[:, 8] * 10 + digits[:, 9]
+    minute = digits[:, 10] * 10 + digits[:, 11]
+    second = digits[:, 12] * 10 + digits[:, 13]
+    offset_hour = digits[:, 14] * 10 + digits[:, 15]
+    offset_minute = digits[:, 16] * 10 + digits[:, 17]
+
+    valid &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_index = np.clip(month - 1, 0, 11)
+    valid &= day <= _DAYS_IN_MONTH[month_index] + (leap & (month == 2))
+    valid &= (hour <= 23) & (minute <= 59) & (second <= 59)
+    valid &= (offset_hour <= 23) & (offset_minute <= 59)
+
+    sign = np.where(chars[:, 19] == ord("-"), -1, 1)
+    seconds = (
+        _days_from_civil(year, month, day) * 86400
+        + hour * 3600
+        + minute * 60
+        + second
+        - sign * (offset_hour * 3600 + offset_minute * 60)
+    )
+    result = (seconds * 1_000_000_000).astype("datetime64[ns]")
+
+    # Anything outside the fixed layout, or an impossible date such as
+    # 2021-02-30, goes through strptime so errors match the original parser.
+    for index in np.flatnonzero(~valid):
+        result[index] = np.datetime64(_parse_slow(values[index]), "ns")
+
+    return result
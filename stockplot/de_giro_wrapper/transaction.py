@@ -1,5 +1,6 @@
 import datetime
-from dataclasses import dataclass
+import typing
+from dataclasses import dataclass, field
 
 __all__ = ("Transaction",)
 
@@ -9,3 +10,4 @@ class Transaction:
     product_id: int
     quantity: int
     transaction_datetime: datetime.datetime  # cue in timezone bullshit.
+    id: typing.Optional[int] = field(default=None, compare=False)
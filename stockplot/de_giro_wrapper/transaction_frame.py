@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+
+from .timestamps import parse_timestamps
+from .transaction import Transaction
+
+__all__ = ("TransactionFrame",)
+
+_MISSING_ID = -1
+
+
+def _quantity_array(quantities: typing.Sequence) -> np.ndarray:
+    array = np.asarray(quantities)
+    if array.dtype.kind == "i":
+        return array.astype(np.int64, copy=False)
+    return array.astype(np.float64, copy=False)
+
+
+class TransactionFrame(typing.Sequence[Transaction]):
+    def __init__(
+        self,
+        product_id: np.ndarray,
+        quantity: np.ndarray,
+        transaction_time: np.ndarray,
+        id: typing.Optional[np.ndarray] = None,
+    ) -> None:
+        if id is None:
+            id = np.full(len(product_id), _MISSING_ID, dtype=np.int64)
+
+        if not len(product_id) == len(quantity) == len(transaction_time) == len(id):
+            raise ValueError("All transaction columns must have the same length.")
+
+        self.product_id = np.asarray(product_id, dtype=np.int64)
+        self.quantity = _quantity_array(quantity)
+        self.transaction_time = np.asarray(transaction_time, dtype="datetime64[ns]")
+        self.id = np.asarray(id, dtype=np.int64)
+
+    @staticmethod
+    def empty() -> TransactionFrame:
+        return TransactionFrame(
+            product_id=np.empty(0, dtype=np.int64),
+            quantity=np.empty(0, dtype=np.int64),
+            transaction_time=np.empty(0, dtype="datetime64[ns]"),
+        )
+
+    @staticmethod
+    def from_payload(rows: typing.Sequence[typing.Dict]) -> TransactionFrame:
+        if not rows:
+            return TransactionFrame.empty()
+
+        return TransactionFrame(
+            product_id=np.fromiter(
+                (row["productId"] for row in rows), dtype=np.int64, count=len(rows)
+            ),
+            quantity=_quantity_array([row["quantity"] for row in rows]),
+            transaction_time=parse_timestamps([row["date"] for row in rows]),
+            id=np.fromiter(
+                (row.get("id", _MISSING_ID) for row in rows),
+                dtype=np.int64,
+                count=len(rows),
+            ),
+        )
+
+    @staticmethod
+    def from_transactions(
+        transactions: typing.Iterable[Transaction],
+    ) -> TransactionFrame:
+        transactions = list(transactions)
+        if not transactions:
+            return TransactionFrame.empty()
+
+        return TransactionFrame(
+            product_id=np.array([t.product_id for t in transactions], dtype=np.int64),
+            quantity=_quantity_array([t.quantity for t in transactions]),
+            transaction_time=np.array(
+                [t.transaction_datetime for t in transactions],
+                dtype="datetime64[ns]",
+            ),
+            id=np.array(
+                [_MISSING_ID if t.id is None else t.id for t in transactions],
+                dtype=np.int64,
+            ),
+        )
+
+    @staticmethod
+    def concat(frames: typing.Sequence[TransactionFrame]) -> TransactionFrame:
+        if not frames:
+            return TransactionFrame.empty()
+
+        return TransactionFrame(
+            product_id=np.concatenate([frame.product_id for frame in frames]),
+            quantity=np.concatenate([frame.quantity for frame in frames]),
+            transaction_time=np.concatenate(
+                [frame.transaction_time for frame in frames]
+            ),
+            id=np.concatenate([frame.id for frame in frames]),
+        )
+
+    def take(self, indices: np.ndarray) -> TransactionFrame:
+        return TransactionFrame(
+            product_id=self.product_id[indices],
+            quantity=self.quantity[indices],
+            transaction_time=self.transaction_time[indices],
+            id=self.id[indices],
+        )
+
+    def sorted_by_time(self) -> TransactionFrame:
+        return self.take(np.lexsort((self.id, self.transaction_time)))
+
+    def __len__(self) -> int:
+        return len(self.product_id)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> Transaction:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> TransactionFrame:
+        ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return TransactionFrame(
+                product_id=self.product_id[index],
+                quantity=self.quantity[index],
+                transaction_time=self.transaction_time[index],
+                id=self.id[index],
+            )
+
+        identifier = int(self.id[index])
+        quantity = self.quantity[index]
+        return Transaction(
+            product_id=int(self.product_id[index]),
+            quantity=(
+                int(quantity) if self.quantity.dtype.kind == "i" else float(quantity)
+            ),
+            transaction_datetime=self.transaction_time[index]
+            .astype("datetime64[us]")
+            .item(),
+            id=None if identifier == _MISSING_ID else identifier,
+        )
+
+    def __iter__(self) -> typing.Iterator[Transaction]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_pandas(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "id": self.id,
+                "product_id": self.product_id,
+                "quantity": self.quantity,
+                "transaction_datetime": self.transaction_time,
+            },
+            copy=False,
+        )
@@ -0,0 +1,3 @@
+from .fx_rate_table import FxRateTable
+
+__all__ = ("FxRateTable",)
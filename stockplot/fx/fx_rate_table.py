@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import datetime
+import typing
+
+import numpy as np
+
+from ..currency import Currency
+from ..prices.price_cache import PriceCache
+
+__all__ = ("FxRateTable",)
+
+# Minor units quoted by exchanges without an FX pair of their own, as the
+# currency they divide and the size of one unit in it.
+_SUBUNITS: typing.Dict[Currency, typing.Tuple[Currency, float]] = {
+    Currency.GBX: (Currency.GBP, 0.01),
+}
+
+
+class FxRateTable:
+    # Rates are quoted as units of the base currency per one unit of currency.
+    def __init__(self, base: Currency) -> None:
+        self._base = base
+        self._days: typing.Dict[Currency, np.ndarray] = {}
+        self._rates: typing.Dict[Currency, np.ndarray] = {}
+
+    @property
+    def base(self) -> Currency:
+        return self._base
+
+    @property
+    def currencies(self) -> typing.List[Currency]:
+        return [self._base, *self._rates]
+
+    def add_series(
+        self, currency: Currency, days: np.ndarray, rates: np.ndarray
+    ) -> None:
+        if currency is self._base:
+            raise ValueError(f"{currency.code} is the base currency.")
+
+        days = np.asarray(days, dtype="datetime64[D]")
+        rates = np.asarray(rates, dtype=np.float64)
+        if days.shape != rates.shape:
+            raise ValueError("Days and rates must have the same shape.")
+
+        known = ~np.isnan(rates)
+        order = np.argsort(days[known], kind="stable")
+        self._days[currency] = days[known][order]
+        self._rates[currency] = rates[known][order]
+
+    @staticmethod
+    def from_price_cache(
+        cache: PriceCache,
+        base: Currency,
+        currencies: typing.Iterable[Currency],
+        start: datetime.date,
+        end: datetime.date,
+    ) -> FxRateTable:
+        table = FxRateTable(base=base)
+        quoted = {
+            _SUBUNITS.get(currency, (currency, 1.0))[0] for currency in currencies
+        }
+        quoted.discard(base)
+        symbols = {currency: f"{currency.code}{base.code}=X" for currency in quoted}
+        prices = cache.get_many(list(symbols.values()), start, end)
+        for currency, symbol in symbols.items():
+            series = prices.series(symbol)
+            table.add_series(currency, series.days, series.close)
+        return table
+
+    def rates(self, currency: Currency, days: np.ndarray) -> np.ndarray:
+        days = np.asarray(days, dtype="datetime64[D]")
+        if currency is self._base:
+            return np.ones(days.shape, dtype=np.float64)
+
+        if currency not in self._rates and currency in _SUBUNITS:
+            parent, factor = _SUBUNITS[currency]
+            return self.rates(parent, days) * factor
+
+        if currency not in self._rates:
+            raise KeyError(f"No {currency.code}/{self._base.code} rates loaded.")
+
+        # The last quote on or before each day, i.e. weekends and holidays
+        # carry the previous rate forward.
+        known_days = self._days[currency]
+        index = np.searchsorted(known_days, days, "right") - 1
+        result = self._rates[currency][np.clip(index, 0, None)]
+        return np.where(index >= 0, result, np.nan)
+
+    def rate_matrix(
+        self, currencies: typing.Sequence[Currency], days: np.ndarray
+    ) -> np.ndarray:
+        unique = list(dict.fromkeys(currencies))
+        per_currency = np.stack([self.rates(currency, days) for currency in unique])
+        position = {currency: row for row, currency in enumerate(unique)}
+        rows = np.fromiter(
+            (position[currency] for currency in currencies),
+            dtype=np.int64,
+            count=len(currencies),
+        )
+        return per_currency[rows]
+
+    def to_base(
+        self,
+        values: np.ndarray,
+        currencies: typing.Sequence[Currency],
+        days: np.ndarray,
+    ) -> np.ndarray:
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape != (len(currencies), len(days)):
+            raise ValueError(
+                f"Expected a {len(currencies)} x {len(days)} matrix, "
+                f"got {values.shape}."
+            )
+        return values * self.rate_matrix(currencies, days)
+
+    def convert(
+        self,
+        values: np.ndarray,
+        source: Currency,
+        target: Currency,
+        days: np.ndarray,
+    ) -> np.ndarray:
+        if source is target:
+            return np.asarray(values, dtype=np.float64)
+        return values * self.rates(source, days) / self.rates(target, days)
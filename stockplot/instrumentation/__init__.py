@@ -0,0 +1,26 @@
+from .instrumentation_service import recorder_service, use_instrumentation
+from .instrumented_requests import InstrumentedRequests
+from .recorder import (
+    CounterSample,
+    HistogramSample,
+    MetricsRecorder,
+    MetricsSnapshot,
+    NullRecorder,
+    Recorder,
+)
+from .sinks import JsonLinesSink, MemorySink, PrometheusTextSink
+
+__all__ = (
+    "CounterSample",
+    "HistogramSample",
+    "InstrumentedRequests",
+    "JsonLinesSink",
+    "MemorySink",
+    "MetricsRecorder",
+    "MetricsSnapshot",
+    "NullRecorder",
+    "PrometheusTextSink",
+    "Recorder",
+    "recorder_service",
+    "use_instrumentation",
+)
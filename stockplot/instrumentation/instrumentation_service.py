@@ -0,0 +1,43 @@
+import typing
+
+from .instrumented_requests import InstrumentedRequests
+from .recorder import MetricsRecorder, NullRecorder, Recorder
+from ..requests_wrapper.requests_protocol import RequestsProtocol
+from ..requests_wrapper.requests_service import requests_service
+from ..service import Service
+
+__all__ = ("recorder_service", "use_instrumentation")
+
+_NULL_RECORDER = NullRecorder()
+
+
+class _InstrumentedFactory:
+    def __init__(
+        self, base: typing.Callable[[], RequestsProtocol], recorder: Recorder
+    ) -> None:
+        self.base = base
+        self._recorder = recorder
+
+    def __call__(self) -> InstrumentedRequests:
+        return InstrumentedRequests(self.base(), self._recorder)
+
+
+def use_instrumentation(
+    recorder: typing.Optional[MetricsRecorder] = None,
+) -> MetricsRecorder:
+    # Without this call nothing is wrapped, so the request path pays nothing
+    # and the remaining record points only reach a no-op recorder.
+    recorder = recorder or MetricsRecorder()
+    recorder_service.overwrite(new=lambda: recorder)
+
+    # Wraps the process-wide binding rather than a scoped override, and
+    # never an earlier instrumentation, so repeated calls count each request
+    # once.
+    base = requests_service.registered()
+    if isinstance(base, _InstrumentedFactory):
+        base = base.base
+    requests_service.overwrite(new=_InstrumentedFactory(base, recorder))
+    return recorder
+
+
+recorder_service: Service[Recorder] = Service(value=lambda: _NULL_RECORDER)
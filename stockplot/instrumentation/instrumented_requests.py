@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import re
+import time
+import typing
+from urllib.parse import urlsplit
+
+from .recorder import Recorder
+from ..requests_wrapper.requests_protocol import RequestsProtocol
+from ..requests_wrapper.response_protocol import ResponseProtocol
+
+__all__ = ("InstrumentedRequests", "endpoint_of")
+
+_SESSION_SUFFIX = re.compile(r";jsessionid=[^/?]*")
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_of(url: str) -> str:
+    # Session ids and numeric ids would give every request its own series.
+    path = _SESSION_SUFFIX.sub("", urlsplit(url).path)
+    return _NUMERIC_SEGMENT.sub("/{id}", path) or "/"
+
+
+class _InstrumentedResponse:
+    # Time spent waiting on the underlying body iterator counts as network
+    # time; time between chunks, spent by the caller decoding them, counts as
+    # parse time.
+    def __init__(
+        self,
+        response: ResponseProtocol,
+        recorder: Recorder,
+        labels: typing.Dict[str, str],
+    ) -> None:
+        self._response = response
+        self._recorder = recorder
+        self._labels = labels
+        self.status_code = response.status_code
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self._response, name)
+
+    def json(self) -> typing.Dict:
+        started = time.perf_counter()
+        try:
+            return self._response.json()
+        finally:
+            self._recorder.observe(
+                "http_parse_seconds", time.perf_counter() - started, **self._labels
+            )
+            content = getattr(self._response, "content", None)
+            if isinstance(content, (bytes, bytearray)):
+                self._recorder.increment(
+                    "http_response_bytes_total", len(content), **self._labels
+                )
+
+    def iter_content(self, chunk_size: int = 1) -> typing.Iterator[bytes]:
+        chunks = iter(self._response.iter_content(chunk_size=chunk_size))
+        received = 0
+        network = 0.0
+        started = time.perf_counter()
+        try:
+            while True:
+                before = time.perf_counter()
+                chunk = next(chunks, None)
+                network += time.perf_counter() - before
+                if chunk is None:
+                    return
+                received += len(chunk)
+                yield chunk
+        finally:
+            total = time.perf_counter() - started
+            self._recorder.observe("http_read_seconds", network, **self._labels)
+            self._recorder.observe(
+                "http_parse_seconds", total - network, **self._labels
+            )
+            self._recorder.increment(
+                "http_response_bytes_total", received, **self._labels
+            )
+
+
+class InstrumentedRequests:
+    def __init__(self, requests: RequestsProtocol, recorder: Recorder) -> None:
+        self._requests = requests
+        self._recorder = recorder
+
+    def get(self, *args, **kwargs) -> ResponseProtocol:
+        return self._send("GET", self._requests.get, args, kwargs)
+
+    def post(self, *args, **kwargs) -> ResponseProtocol:
+        return self._send("POST", self._requests.post, args, kwargs)
+
+    def _send(
+        self,
+        method_name: str,
+        method: typing.Callable[..., ResponseProtocol],
+        args: typing.Tuple,
+        kwargs: typing.Dict,
+    ) -> ResponseProtocol:
+        labels = {
+            "method": method_name,
+            "endpoint": endpoint_of(kwargs.get("url") or args[0]),
+        }
+        started = time.perf_counter()
+        try:
+            response = method(*args, **kwargs)
+        except Exception as error:
+            self._recorder.increment(
+                "http_errors_total", error=type(error).__name__, **labels
+            )
+            raise
+        finally:
+            self._recorder.observe(
+                "http_request_seconds", time.perf_counter() - started, **labels
+            )
+
+        self._recorder.increment(
+            "http_responses_total", status=str(response.status_code), **labels
+        )
+        data = kwargs.get("data") or kwargs.get("json")
+        if isinstance(data, (str, bytes)):
+            self._recorder.increment("http_request_bytes_total", len(data), **labels)
+        return _InstrumentedResponse(response, self._recorder, labels)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+import typing
+from dataclasses import dataclass
+
+__all__ = (
+    "CounterSample",
+    "HistogramSample",
+    "MetricsRecorder",
+    "MetricsSnapshot",
+    "NullRecorder",
+    "Recorder",
+)
+
+Labels = typing.Tuple[typing.Tuple[str, str], ...]
+
+# Seconds; spans a fast cache lookup up to a slow DeGiro report.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Recorder(typing.Protocol):
+    enabled: bool
+
+    def increment(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        ...
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        ...
+
+
+class NullRecorder:
+    enabled = False
+
+    def increment(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        pass
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        pass
+
+
+@dataclass(frozen=True)
+class CounterSample:
+    name: str
+    labels: Labels
+    value: float
+
+
+@dataclass(frozen=True)
+class HistogramSample:
+    name: str
+    labels: Labels
+    bounds: typing.Tuple[float, ...]
+    counts: typing.Tuple[int, ...]  # per bucket, the last one is +Inf
+    total: float
+    count: int
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    time: float
+    counters: typing.List[CounterSample]
+    histograms: typing.List[HistogramSample]
+
+
+class _Histogram:
+    __slots__ = ("counts", "total")
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * (buckets + 1)
+        self.total = 0.0
+
+
+class MetricsRecorder:
+    enabled = True
+
+    def __init__(
+        self,
+        buckets: typing.Sequence[float] = DEFAULT_BUCKETS,
+        clock: typing.Callable[[], float] = time.time,
+    ) -> None:
+        self._bounds = tuple(sorted(buckets))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._counters: typing.Dict[typing.Tuple[str, Labels], float] = {}
+        self._histograms: typing.Dict[typing.Tuple[str, Labels], _Histogram] = {}
+
+    def increment(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        bucket = bisect.bisect_left(self._bounds, value)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(len(self._bounds))
+            histogram.counts[bucket] += 1
+            histogram.total += value
+
+    def counter(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0.0)
+
+    def snapshot(self) -> MetricsSnapshot:
+        with self._lock:
+            counters = [
+                CounterSample(name=name, labels=labels, value=value)
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                HistogramSample(
+                    name=name,
+                    labels=labels,
+                    bounds=self._bounds,
+                    counts=tuple(histogram.counts),
+                    total=histogram.total,
+                    count=sum(histogram.counts),
+                )
+                for (name, labels), histogram in sorted(
+                    self._histograms.items(), key=lambda item: item[0]
+                )
+            ]
+        return MetricsSnapshot(
+            time=self._clock(), counters=counters, histograms=histograms
+        )
+
+    def export(self, sink: MetricsSink) -> None:
+        sink.write(self.snapshot())
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class MetricsSink(typing.Protocol):
+    def write(self, snapshot: MetricsSnapshot) -> None:
+        ...
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import typing
+
+from .recorder import Labels, MetricsSnapshot
+
+__all__ = ("JsonLinesSink", "MemorySink", "PrometheusTextSink")
+
+
+class MemorySink:
+    def __init__(self) -> None:
+        self._snapshots: typing.List[MetricsSnapshot] = []
+
+    @property
+    def snapshots(self) -> typing.List[MetricsSnapshot]:
+        return self._snapshots
+
+    def write(self, snapshot: MetricsSnapshot) -> None:
+        self._snapshots.append(snapshot)
+
+
+class JsonLinesSink:
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+
+    def write(self, snapshot: MetricsSnapshot) -> None:
+        lines = [
+            {
+                "time": snapshot.time,
+                "type": "counter",
+                "name": sample.name,
+                "labels": dict(sample.labels),
+                "value": sample.value,
+            }
+            for sample in snapshot.counters
+        ]
+        lines.extend(
+            {
+                "time": snapshot.time,
+                "type": "histogram",
+                "name": sample.name,
+                "labels": dict(sample.labels),
+                "bounds": list(sample.bounds),
+                "counts": list(sample.counts),
+                "sum": sample.total,
+                "count": sample.count,
+            }
+            for sample in snapshot.histograms
+        )
+        with self._lock, open(self._path, "a") as file:
+            for line in lines:
+                file.write(json.dumps(line))
+                file.write("\n")
+
+
+def _labels(
+    labels: Labels, extra: typing.Optional[typing.Tuple[str, str]] = None
+) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class PrometheusTextSink:
+    # Writes the text exposition format for node_exporter's textfile collector,
+    # replacing the file atomically so a scrape never sees half of it.
+    def __init__(self, path: str, prefix: str = "stockplot_") -> None:
+        self._path = path
+        self._prefix = prefix
+        self._lock = threading.Lock()
+
+    def write(self, snapshot: MetricsSnapshot) -> None:
+        lines: typing.List[str] = []
+        typed: typing.Set[str] = set()
+
+        for sample in snapshot.counters:
+            name = self._prefix + sample.name
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{_labels(sample.labels)} {_number(sample.value)}")
+
+        for histogram in snapshot.histograms:
+            name = self._prefix + histogram.name
+            if name not in typed:
+                lines.append(f"# TYPE {name} histogram")
+                typed.add(name)
+            cumulative = 0
+            for bound, count in zip((*histogram.bounds, math.inf), histogram.counts):
+                cumulative += count
+                labels = _labels(histogram.labels, ("le", _number(bound)))
+                lines.append(f"{name}_bucket{labels} {cumulative}")
+            labels = _labels(histogram.labels)
+            lines.append(f"{name}_sum{labels} {_number(histogram.total)}")
+            lines.append(f"{name}_count{labels} {histogram.count}")
+
+        with self._lock:
+            with open(f"{self._path}.tmp", "w") as file:
+                file.write("\n".join(lines) + "\n")
+            os.replace(f"{self._path}.tmp", self._path)
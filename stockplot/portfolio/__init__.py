@@ -0,0 +1,13 @@
+from .analytics import AnalyticsSeries, AnalyticsWindow, PortfolioAnalytics
+from .portfolio_engine import PortfolioEngine
+from .rollup import ROLLUP_LEVELS, RollupIndex, RollupWindow
+
+__all__ = (
+    "AnalyticsSeries",
+    "AnalyticsWindow",
+    "PortfolioAnalytics",
+    "PortfolioEngine",
+    "ROLLUP_LEVELS",
+    "RollupIndex",
+    "RollupWindow",
+)
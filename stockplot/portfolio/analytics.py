@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import datetime
+import threading
+import typing
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..currency import Currency
+from ..fx.fx_rate_table import FxRateTable
+from ..prices.price_series import PriceMatrix
+from .portfolio_engine import PortfolioEngine
+
+__all__ = ("AnalyticsSeries", "AnalyticsWindow", "PortfolioAnalytics")
+
+_DAYS_PER_YEAR = 365.0
+
+
+@dataclass(frozen=True)
+class AnalyticsWindow:
+    days: np.ndarray
+    value: np.ndarray
+    time_weighted_return: np.ndarray
+    drawdown: np.ndarray
+    max_drawdown: float
+    money_weighted_return: float
+    contribution: np.ndarray
+    realized_pnl: np.ndarray
+    unrealized_pnl: np.ndarray
+
+
+@dataclass(frozen=True)
+class AnalyticsSeries:
+    product_ids: np.ndarray
+    days: np.ndarray
+    market_value: np.ndarray  # products x days
+    value: np.ndarray
+    flows: np.ndarray  # money put in (buys) minus money taken out (sells)
+    daily_returns: np.ndarray
+    daily_contribution: np.ndarray  # products x days, sums to daily_returns
+    event_columns: np.ndarray
+    event_rows: np.ndarray
+    event_quantities: np.ndarray
+    realized_by_event: np.ndarray
+    _cost_curve: typing.Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+    def _column(self, day: datetime.date) -> int:
+        column = int(np.searchsorted(self.days, np.datetime64(day, "D"), "right")) - 1
+        return min(max(column, 0), len(self.days) - 1)
+
+    def window(
+        self,
+        start: typing.Optional[datetime.date] = None,
+        end: typing.Optional[datetime.date] = None,
+    ) -> AnalyticsWindow:
+        if len(self.days) == 0:
+            raise ValueError("No days to analyse.")
+
+        first = 0 if start is None else self._column(start)
+        last = len(self.days) - 1 if end is None else self._column(end)
+        if last < first:
+            raise ValueError(f"Window end {end} is before its start {start}.")
+
+        # Returns are measured from the close of the first day onwards.
+        returns = np.concatenate([[0.0], self.daily_returns[first + 1 : last + 1]])
+        growth = np.cumprod(1.0 + returns)
+        drawdown = growth / np.maximum.accumulate(growth) - 1.0
+
+        products = len(self.product_ids)
+        in_window = (self.event_columns >= first) & (self.event_columns <= last)
+        realized = np.bincount(
+            self.event_rows[in_window],
+            weights=self.realized_by_event[in_window],
+            minlength=products,
+        )
+
+        return AnalyticsWindow(
+            days=self.days[first : last + 1],
+            value=self.value[first : last + 1],
+            time_weighted_return=growth - 1.0,
+            drawdown=drawdown,
+            max_drawdown=float(drawdown.min()),
+            money_weighted_return=self._money_weighted_return(first, last),
+            contribution=self.daily_contribution[:, first + 1 : last + 1].sum(axis=1),
+            realized_pnl=realized,
+            unrealized_pnl=self.market_value[:, last] - self._open_cost(last),
+        )
+
+    def _open_cost(self, last: int) -> np.ndarray:
+        products = len(self.product_ids)
+        until = self.event_columns <= last
+        rows = self.event_rows[until]
+        quantities = self.event_quantities[until]
+        bought = np.bincount(
+            rows, weights=np.clip(quantities, 0, None), minlength=products
+        )
+        sold = np.bincount(
+            rows, weights=np.clip(-quantities, 0, None), minlength=products
+        )
+        offsets = self._cost_curve[0]
+        return _cost_at(offsets + bought, self._cost_curve) - _cost_at(
+            offsets + np.minimum(sold, bought), self._cost_curve
+        )
+
+    def _money_weighted_return(self, first: int, last: int) -> float:
+        # The opening value is treated as invested on the first day and the
+        # closing value as paid out on the last one.
+        flows = np.concatenate([[self.value[first]], self.flows[first + 1 : last + 1]])
+        flows = -flows
+        flows[-1] += self.value[last]
+        years = np.arange(len(flows), dtype=np.float64) / _DAYS_PER_YEAR
+        return _solve_irr(flows, years)
+
+
+def _solve_irr(flows: np.ndarray, years: np.ndarray) -> float:
+    if not (flows < 0).any() or not (flows > 0).any():
+        return float("nan")
+
+    def npv(log_rate: float) -> float:
+        return float(np.dot(flows, np.exp(-log_rate * years)))
+
+    # Bisection on log(1 + rate) is slower than Newton but cannot diverge.
+    low, high = -10.0, 10.0
+    if npv(low) * npv(high) > 0:
+        return float("nan")
+    for _ in range(100):
+        middle = (low + high) / 2.0
+        if npv(middle) > 0:
+            low = middle
+        else:
+            high = middle
+    return float(np.expm1((low + high) / 2.0))
+
+
+def _cost_at(
+    quantity: np.ndarray, curve: typing.Tuple[np.ndarray, np.ndarray, np.ndarray]
+) -> np.ndarray:
+    _, points, costs = curve
+    if len(points) == 0:
+        return np.zeros(len(quantity), dtype=np.float64)
+    return np.interp(quantity, points, costs)
+
+
+def _within_product_cumsum(
+    rows: np.ndarray, values: np.ndarray, products: int
+) -> np.ndarray:
+    # Running total per product over events already ordered by row, then time.
+    totals = np.bincount(rows, weights=values, minlength=products)
+    starts = np.cumsum(totals) - totals
+    return np.cumsum(values) - starts[rows]
+
+
+def _fifo(
+    rows: np.ndarray, quantities: np.ndarray, prices: np.ndarray, products: int
+) -> typing.Tuple[np.ndarray, typing.Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    # Under FIFO the cost of the first q units bought of a product is a
+    # piecewise linear function of q, so the cost of any sale is the difference
+    # of that function at the cumulative units sold before and after it. Laying
+    # every product's curve end to end on one axis lets a single np.interp
+    # price all sales at once.
+    order = np.argsort(rows, kind="stable")
+    rows, quantities, prices = rows[order], quantities[order], prices[order]
+
+    bought = np.clip(quantities, 0, None)
+    sold = np.clip(-quantities, 0, None)
+    total_bought = np.bincount(rows, weights=bought, minlength=products)
+    stride = float(total_bought.max(initial=0.0)) + 1.0
+    offsets = np.arange(products, dtype=np.float64) * stride
+
+    cost_before_product = np.cumsum(
+        np.bincount(rows, weights=bought * prices, minlength=products)
+    )
+    cost_before_product = np.concatenate([[0.0], cost_before_product[:-1]])
+
+    buys = quantities > 0
+    points = np.concatenate(
+        [
+            offsets,
+            offsets[rows[buys]] + _within_product_cumsum(rows, bought, products)[buys],
+        ]
+    )
+    costs = np.concatenate(
+        [
+            cost_before_product,
+            cost_before_product[rows[buys]]
+            + _within_product_cumsum(rows, bought * prices, products)[buys],
+        ]
+    )
+    curve_order = np.argsort(points, kind="stable")
+    curve = (offsets, points[curve_order], costs[curve_order])
+
+    cumulative_sold = _within_product_cumsum(rows, sold, products)
+    sold_after = np.minimum(cumulative_sold, total_bought[rows])
+    sold_before = np.minimum(cumulative_sold - sold, total_bought[rows])
+    cost = _cost_at(offsets[rows] + sold_after, curve) - _cost_at(
+        offsets[rows] + sold_before, curve
+    )
+    realized = np.where(buys, 0.0, sold * prices - cost)
+
+    result = np.empty_like(realized)
+    result[order] = realized
+    return result, curve
+
+
+def _compute(engine: PortfolioEngine, prices: np.ndarray) -> AnalyticsSeries:
+    holdings = engine.holdings
+    if prices.shape != holdings.shape:
+        raise ValueError(
+            f"Expected a {holdings.shape[0]} x {holdings.shape[1]} price matrix, "
+            f"got {prices.shape}."
+        )
+    products, days = holdings.shape
+
+    # Unknown prices value a position at zero rather than poisoning the total.
+    prices = np.nan_to_num(prices, nan=0.0)
+    market_value = holdings * prices
+    value = market_value.sum(axis=0)
+
+    columns = np.empty(0, dtype=np.int64)
+    if days:
+        columns = (engine.event_times.astype("datetime64[D]") - engine.days[0]).astype(
+            np.int64
+        )
+    rows = engine.event_rows
+    quantities = engine.event_quantities
+    trade_prices = prices[rows, columns]
+
+    product_flows = np.zeros((products, days), dtype=np.float64)
+    np.add.at(product_flows, (rows, columns), quantities * trade_prices)
+    flows = product_flows.sum(axis=0)
+
+    previous_value = np.concatenate([[0.0], value[:-1]])[:days]
+    previous_market_value = np.hstack([np.zeros((products, 1)), market_value[:, :-1]])[
+        :, :days
+    ]
+    invested = previous_value > 0
+    daily_returns = np.divide(
+        value - flows - previous_value,
+        previous_value,
+        out=np.zeros(days, dtype=np.float64),
+        where=invested,
+    )
+    daily_contribution = np.divide(
+        market_value - product_flows - previous_market_value,
+        previous_value,
+        out=np.zeros((products, days), dtype=np.float64),
+        where=invested,
+    )
+
+    realized, curve = _fifo(rows, quantities, trade_prices, products)
+    return AnalyticsSeries(
+        product_ids=engine.product_ids,
+        days=engine.days,
+        market_value=market_value,
+        value=value,
+        flows=flows,
+        daily_returns=daily_returns,
+        daily_contribution=daily_contribution,
+        event_columns=columns,
+        event_rows=rows,
+        event_quantities=quantities,
+        realized_by_event=realized,
+        _cost_curve=curve,
+    )
+
+
+class PortfolioAnalytics:
+    # Prices are in the base currency, one row per engine product and one
+    # column per engine day. Trades are valued at that day's close.
+    def __init__(self, engine: PortfolioEngine, max_entries: int = 4) -> None:
+        self._engine = engine
+        self._max_entries = max_entries
+        self._cache: OrderedDict[typing.Tuple[int, typing.Hashable], AnalyticsSeries]
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def engine(self) -> PortfolioEngine:
+        return self._engine
+
+    def series(
+        self, prices: np.ndarray, prices_version: typing.Hashable
+    ) -> AnalyticsSeries:
+        key = (self._engine.version, prices_version)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+            series = _compute(self._engine, np.asarray(prices, dtype=np.float64))
+            self._cache[key] = series
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+            return series
+
+    def window(
+        self,
+        prices: np.ndarray,
+        prices_version: typing.Hashable,
+        start: typing.Optional[datetime.date] = None,
+        end: typing.Optional[datetime.date] = None,
+    ) -> AnalyticsWindow:
+        return self.series(prices, prices_version).window(start, end)
+
+    def align_prices(
+        self,
+        matrix: PriceMatrix,
+        symbols: typing.Mapping[int, str],
+        fx: typing.Optional[FxRateTable] = None,
+        currencies: typing.Optional[typing.Mapping[int, Currency]] = None,
+    ) -> np.ndarray:
+        product_ids = self._engine.product_ids
+        days = self._engine.days
+        filled = matrix.forward_filled()
+
+        # Engine days outside the matrix take the nearest earlier close.
+        columns = np.searchsorted(filled.days, days, "right") - 1
+        known = columns >= 0
+        position = {symbol: row for row, symbol in enumerate(filled.symbols)}
+
+        prices = np.full((len(product_ids), len(days)), np.nan, dtype=np.float64)
+        for row, product_id in enumerate(product_ids.tolist()):
+            symbol = symbols.get(product_id)
+            if symbol is None or symbol not in position:
+                continue
+            prices[row, known] = filled.values[position[symbol], columns[known]]
+
+        if fx is not None:
+            if currencies is None:
+                raise ValueError("Currencies are required to convert prices.")
+            prices = fx.to_base(
+                prices,
+                [currencies.get(product_id, fx.base) for product_id in product_ids],
+                days,
+            )
+        return prices
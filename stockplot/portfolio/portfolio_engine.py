@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import datetime
+import typing
+
+import numpy as np
+
+from ..de_giro_wrapper.transaction import Transaction
+from ..de_giro_wrapper.transaction_frame import TransactionFrame
+
+__all__ = ("PortfolioEngine",)
+
+Transactions = typing.Union[TransactionFrame, typing.Iterable[Transaction]]
+
+_MISSING_ID = -1
+
+
+def _as_frame(transactions: Transactions) -> TransactionFrame:
+    if isinstance(transactions, TransactionFrame):
+        return transactions
+    return TransactionFrame.from_transactions(transactions)
+
+
+def _as_day(value: typing.Union[datetime.date, np.datetime64]) -> np.datetime64:
+    return np.datetime64(value, "D")
+
+
+class PortfolioEngine:
+    def __init__(
+        self,
+        transactions: typing.Optional[Transactions] = None,
+        start_day: typing.Optional[datetime.date] = None,
+    ) -> None:
+        self._product_ids: typing.List[int] = []
+        self._product_index: typing.Dict[int, int] = {}
+        self._start_day = None if start_day is None else _as_day(start_day)
+        self._holdings = np.zeros((0, 0), dtype=np.float64)
+
+        self._times = np.empty(0, dtype="datetime64[ns]")
+        self._rows = np.empty(0, dtype=np.int64)
+        self._quantities = np.empty(0, dtype=np.float64)
+        self._seen_ids: typing.Set[int] = set()
+        self._version = 0
+
+        if transactions is not None:
+            self.add(transactions)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def product_ids(self) -> np.ndarray:
+        return np.array(self._product_ids, dtype=np.int64)
+
+    @property
+    def days(self) -> np.ndarray:
+        if self._start_day is None:
+            return np.empty(0, dtype="datetime64[D]")
+        return self._start_day + np.arange(self._holdings.shape[1])
+
+    @property
+    def holdings(self) -> np.ndarray:
+        return self._holdings
+
+    @property
+    def event_times(self) -> np.ndarray:
+        return self._times
+
+    @property
+    def event_rows(self) -> np.ndarray:
+        return self._rows
+
+    @property
+    def event_quantities(self) -> np.ndarray:
+        return self._quantities
+
+    def copy(self) -> PortfolioEngine:
+        # add() updates holdings in place, so readers that must not see a
+        # half-applied batch work on a copy and swap it in afterwards.
+        engine = PortfolioEngine.__new__(PortfolioEngine)
+        engine.__dict__.update(self.__dict__)
+        engine._product_ids = list(self._product_ids)
+        engine._product_index = dict(self._product_index)
+        engine._holdings = self._holdings.copy()
+        engine._seen_ids = set(self._seen_ids)
+        return engine
+
+    def row(self, product_id: int) -> int:
+        return self._product_index[product_id]
+
+    def add(self, transactions: Transactions) -> int:
+        frame = self._without_seen(_as_frame(transactions))
+        if len(frame) == 0:
+            return 0
+
+        rows = self._rows_for(frame.product_id)
+        days = frame.transaction_time.astype("datetime64[D]")
+        first_day = days.min()
+
+        if self._start_day is None:
+            self._start_day = first_day
+        elif first_day < self._start_day:
+            self._prepend_days(int((self._start_day - first_day).astype(int)))
+
+        self._grow_days(int((days.max() - self._start_day).astype(int)) + 1)
+
+        # Only columns from the earliest new day onwards can change, so the
+        # cumulative sum is applied to that slice rather than the full matrix.
+        columns = (days - self._start_day).astype(np.int64)
+        first_column = int(columns.min())
+        delta = np.zeros(
+            (self._holdings.shape[0], self._holdings.shape[1] - first_column),
+            dtype=np.float64,
+        )
+        np.add.at(delta, (rows, columns - first_column), frame.quantity)
+        self._holdings[:, first_column:] += np.cumsum(delta, axis=1)
+
+        self._merge_events(frame.transaction_time, rows, frame.quantity)
+        self._version += 1
+        return len(frame)
+
+    def extend_to(self, day: datetime.date) -> None:
+        if self._start_day is None:
+            self._start_day = _as_day(day)
+        days = self._holdings.shape[1]
+        self._grow_days(int((_as_day(day) - self._start_day).astype(int)) + 1)
+        # A longer day axis invalidates anything cached against the old one.
+        if self._holdings.shape[1] != days:
+            self._version += 1
+
+    def holdings_on(self, day: datetime.date) -> np.ndarray:
+        if self._start_day is None:
+            return np.zeros(0, dtype=np.float64)
+
+        column = int((_as_day(day) - self._start_day).astype(int))
+        if column < 0:
+            return np.zeros(len(self._product_ids), dtype=np.float64)
+        return self._holdings[:, min(column, self._holdings.shape[1] - 1)].copy()
+
+    def holdings_at(self, moment: datetime.datetime) -> np.ndarray:
+        moment = np.datetime64(moment, "ns")
+        day = moment.astype("datetime64[D]")
+        result = self.holdings_on(day - np.timedelta64(1, "D"))
+
+        start = np.searchsorted(self._times, day.astype("datetime64[ns]"), "left")
+        stop = np.searchsorted(self._times, moment, "right")
+        np.add.at(result, self._rows[start:stop], self._quantities[start:stop])
+        return result
+
+    def position(self, product_id: int, moment: datetime.datetime) -> float:
+        if product_id not in self._product_index:
+            return 0.0
+
+        mask = self._rows == self._product_index[product_id]
+        times = self._times[mask]
+        stop = np.searchsorted(times, np.datetime64(moment, "ns"), "right")
+        return float(self._quantities[mask][:stop].sum())
+
+    def _without_seen(self, frame: TransactionFrame) -> TransactionFrame:
+        if len(frame) == 0:
+            return frame
+
+        keep = np.ones(len(frame), dtype=bool)
+        for index, identifier in enumerate(frame.id.tolist()):
+            if identifier == _MISSING_ID:
+                continue
+            if identifier in self._seen_ids:
+                keep[index] = False
+            else:
+                self._seen_ids.add(identifier)
+
+        return frame if keep.all() else frame.take(np.flatnonzero(keep))
+
+    def _rows_for(self, product_ids: np.ndarray) -> np.ndarray:
+        unique, inverse = np.unique(product_ids, return_inverse=True)
+        new_products = [
+            int(product_id)
+            for product_id in unique
+            if int(product_id) not in self._product_index
+        ]
+        for product_id in new_products:
+            self._product_index[product_id] = len(self._product_ids)
+            self._product_ids.append(product_id)
+
+        if new_products:
+            self._holdings = np.vstack(
+                [
+                    self._holdings,
+                    np.zeros(
+                        (len(new_products), self._holdings.shape[1]), dtype=np.float64
+                    ),
+                ]
+            )
+
+        lookup = np.array(
+            [self._product_index[int(product_id)] for product_id in unique],
+            dtype=np.int64,
+        )
+        return lookup[inverse.reshape(-1)]
+
+    def _prepend_days(self, count: int) -> None:
+        padding = np.zeros((self._holdings.shape[0], count), dtype=np.float64)
+        self._holdings = np.hstack([padding, self._holdings])
+        self._start_day = self._start_day - np.timedelta64(count, "D")
+
+    def _grow_days(self, count: int) -> None:
+        missing = count - self._holdings.shape[1]
+        if missing <= 0:
+            return
+
+        if self._holdings.shape[1] == 0:
+            last = np.zeros((self._holdings.shape[0], 1), dtype=np.float64)
+        else:
+            last = self._holdings[:, -1:]
+        self._holdings = np.hstack([self._holdings, np.repeat(last, missing, axis=1)])
+
+    def _merge_events(
+        self, times: np.ndarray, rows: np.ndarray, quantities: np.ndarray
+    ) -> None:
+        times = np.concatenate([self._times, times])
+        order = np.argsort(times, kind="stable")
+        self._times = times[order]
+        self._rows = np.concatenate([self._rows, rows])[order]
+        self._quantities = np.concatenate(
+            [self._quantities, quantities.astype(np.float64)]
+        )[order]
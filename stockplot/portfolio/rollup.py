@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import datetime
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+from .analytics import AnalyticsSeries
+
+__all__ = ("ROLLUP_LEVELS", "RollupIndex", "RollupWindow")
+
+ROLLUP_LEVELS = ("day", "week", "month", "year")
+
+_STATS = ("first", "last", "min", "max", "sum", "count")
+
+
+def _bucket_start(level: str, days: np.ndarray) -> np.ndarray:
+    if level == "day":
+        return days
+    if level == "week":
+        # 1970-01-01 was a Thursday; weeks start on Monday.
+        return days - (days.astype(np.int64) + 3) % 7
+    if level == "month":
+        return days.astype("datetime64[M]").astype("datetime64[D]")
+    return days.astype("datetime64[Y]").astype("datetime64[D]")
+
+
+def _reduce(values: np.ndarray, offsets: np.ndarray) -> typing.Dict[str, np.ndarray]:
+    # Stats per run of columns starting at each offset. Missing values are
+    # skipped by min, max and mean, but first and last are taken as they are.
+    ends = np.append(offsets[1:], values.shape[1]) - 1
+    known = ~np.isnan(values)
+    return {
+        "first": values[:, offsets],
+        "last": values[:, ends],
+        "min": np.fmin.reduceat(values, offsets, axis=1),
+        "max": np.fmax.reduceat(values, offsets, axis=1),
+        "sum": np.add.reduceat(np.where(known, values, 0.0), offsets, axis=1),
+        "count": np.add.reduceat(known.astype(np.int64), offsets, axis=1),
+    }
+
+
+def _combine(
+    left: typing.Dict[str, np.ndarray], right: typing.Dict[str, np.ndarray]
+) -> typing.Dict[str, np.ndarray]:
+    return {
+        "first": left["first"],
+        "last": right["last"],
+        "min": np.fmin(left["min"], right["min"]),
+        "max": np.fmax(left["max"], right["max"]),
+        "sum": left["sum"] + right["sum"],
+        "count": left["count"] + right["count"],
+    }
+
+
+@dataclass(frozen=True)
+class RollupWindow:
+    level: str
+    starts: np.ndarray  # first day of each bucket, clipped to the window
+    first: np.ndarray  # series x buckets, as are the other stats
+    last: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    mean: np.ndarray
+
+
+class _Level:
+    def __init__(self, name: str, series: int) -> None:
+        self.name = name
+        self.size = 0
+        self.starts = np.empty(0, dtype="datetime64[D]")
+        self.stats = {
+            stat: np.empty((series, 0), dtype=np.int64 if stat == "count" else float)
+            for stat in _STATS
+        }
+
+    def extend(self, days: np.ndarray, values: np.ndarray) -> None:
+        keys = _bucket_start(self.name, days)
+        offsets = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        starts = keys[offsets]
+        stats = _reduce(values, offsets)
+
+        # The current last bucket may still be filling up (e.g. this month),
+        # in which case the first new bucket is folded into it.
+        if self.size and starts[0] == self.starts[self.size - 1]:
+            last = self.size - 1
+            merged = _combine(
+                {stat: array[:, last : last + 1] for stat, array in self.stats.items()},
+                {stat: array[:, :1] for stat, array in stats.items()},
+            )
+            for stat, array in merged.items():
+                self.stats[stat][:, last : last + 1] = array
+            starts = starts[1:]
+            stats = {stat: array[:, 1:] for stat, array in stats.items()}
+
+        self._reserve(self.size + len(starts))
+        self.starts[self.size : self.size + len(starts)] = starts
+        for stat, array in stats.items():
+            self.stats[stat][:, self.size : self.size + len(starts)] = array
+        self.size += len(starts)
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(self.starts)
+        if size <= capacity:
+            return
+
+        # Doubling keeps daily appends amortised O(1) per bucket.
+        capacity = max(size, 2 * capacity, 16)
+        starts = np.empty(capacity, dtype="datetime64[D]")
+        starts[: self.size] = self.starts[: self.size]
+        self.starts = starts
+        for stat, array in self.stats.items():
+            grown = np.empty((array.shape[0], capacity), dtype=array.dtype)
+            grown[:, : self.size] = array[:, : self.size]
+            self.stats[stat] = grown
+
+    def span(self, first: np.datetime64, last: np.datetime64) -> typing.Tuple[int, int]:
+        # Buckets overlapping [first, last]; days without data have no bucket.
+        starts = self.starts[: self.size]
+        return (
+            int(np.searchsorted(starts, _bucket_start(self.name, first), "left")),
+            int(np.searchsorted(starts, last, "right")),
+        )
+
+
+class RollupIndex:
+    # One row per series and one column per day, e.g. the portfolio value
+    # followed by each product's market value. Days may have gaps.
+    def __init__(
+        self,
+        days: typing.Optional[np.ndarray] = None,
+        values: typing.Optional[np.ndarray] = None,
+        series: int = 1,
+    ) -> None:
+        if values is not None:
+            series = np.atleast_2d(values).shape[0]
+        self._series = series
+        self._levels = {name: _Level(name, series) for name in ROLLUP_LEVELS}
+        if days is not None and values is not None:
+            self.append(days, values)
+
+    @staticmethod
+    def from_analytics(series: AnalyticsSeries) -> RollupIndex:
+        # Row 0 is the portfolio value, then one row per series.product_ids.
+        return RollupIndex(
+            days=series.days,
+            values=np.vstack([series.value[np.newaxis, :], series.market_value]),
+        )
+
+    @property
+    def series(self) -> int:
+        return self._series
+
+    @property
+    def days(self) -> np.ndarray:
+        day = self._levels["day"]
+        return day.starts[: day.size]
+
+    def append(self, days: np.ndarray, values: np.ndarray) -> None:
+        days = np.asarray(days, dtype="datetime64[D]")
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        if values.shape != (self._series, len(days)):
+            raise ValueError(
+                f"Expected a {self._series} x {len(days)} matrix, got {values.shape}."
+            )
+        if len(days) == 0:
+            return
+        if (np.diff(days) <= np.timedelta64(0, "D")).any():
+            raise ValueError("Days must be strictly increasing.")
+
+        known = self.days
+        if len(known) and days[0] <= known[-1]:
+            raise ValueError(f"Day {days[0]} is not after the last day {known[-1]}.")
+
+        for level in self._levels.values():
+            level.extend(days, values)
+
+    def level(self, name: str) -> RollupWindow:
+        level = self._levels[name]
+        return self._window(level, 0, level.size)
+
+    def window(
+        self,
+        start: typing.Optional[datetime.date] = None,
+        end: typing.Optional[datetime.date] = None,
+        width: int = 1000,
+    ) -> RollupWindow:
+        if width < 1:
+            raise ValueError(f"Width must be positive, got {width}.")
+
+        days = self.days
+        if len(days) == 0:
+            raise ValueError("No days to roll up.")
+        first = days[0] if start is None else max(np.datetime64(start, "D"), days[0])
+        last = days[-1] if end is None else min(np.datetime64(end, "D"), days[-1])
+        if last < first:
+            raise ValueError(f"Window end {end} is before its start {start}.")
+
+        day = self._levels["day"]
+        lower, upper = day.span(first, last)
+        if lower == upper:
+            return self._window(day, lower, upper)
+
+        # The coarsest level that still has a bucket per pixel. Levels grow by
+        # at most ~12x, so at most ~12 * width buckets are read whatever the
+        # length of the history.
+        for name in reversed(ROLLUP_LEVELS):
+            level = self._levels[name]
+            lower, upper = level.span(first, last)
+            if upper - lower >= width or name == "day":
+                break
+
+        return self._clip(level, lower, self._window(level, lower, upper), first, last)
+
+    def _window(self, level: _Level, lower: int, upper: int) -> RollupWindow:
+        stats = {stat: array[:, lower:upper] for stat, array in level.stats.items()}
+        return self._as_window(level.name, level.starts[lower:upper], stats)
+
+    @staticmethod
+    def _as_window(
+        name: str, starts: np.ndarray, stats: typing.Dict[str, np.ndarray]
+    ) -> RollupWindow:
+        count = stats["count"]
+        mean = np.divide(
+            stats["sum"],
+            count,
+            out=np.full(count.shape, np.nan),
+            where=count > 0,
+        )
+        return RollupWindow(
+            level=name,
+            starts=starts,
+            first=stats["first"],
+            last=stats["last"],
+            min=stats["min"],
+            max=stats["max"],
+            mean=mean,
+        )
+
+    def _clip(
+        self,
+        level: _Level,
+        lower: int,
+        window: RollupWindow,
+        first: np.datetime64,
+        last: np.datetime64,
+    ) -> RollupWindow:
+        if level.name == "day":
+            return window
+
+        # The outer buckets can reach past the window; they are recomputed
+        # from the days inside it, which is at most a year of data per edge.
+        day = self._levels["day"]
+        values = day.stats["first"]
+        starts = window.starts.copy()
+        stats = {
+            "first": window.first.copy(),
+            "last": window.last.copy(),
+            "min": window.min.copy(),
+            "max": window.max.copy(),
+            "mean": window.mean.copy(),
+        }
+        empty: typing.List[int] = []
+        for column in {0, len(starts) - 1}:
+            following = lower + column + 1
+            bucket_end = (
+                level.starts[following] - np.timedelta64(1, "D")
+                if following < level.size
+                else day.starts[day.size - 1]
+            )
+            if starts[column] >= first and bucket_end <= last:
+                continue
+
+            begin, stop = day.span(max(starts[column], first), min(bucket_end, last))
+            if begin == stop:
+                # Only days outside the window fell into this bucket.
+                empty.append(column)
+                continue
+            part = _reduce(values[:, begin:stop], np.array([0]))
+            starts[column] = day.starts[begin]
+            for stat in ("first", "last", "min", "max"):
+                stats[stat][:, column] = part[stat][:, 0]
+            count = part["count"][:, 0]
+            stats["mean"][:, column] = np.divide(
+                part["sum"][:, 0],
+                count,
+                out=np.full(count.shape, np.nan),
+                where=count > 0,
+            )
+
+        if empty:
+            starts = np.delete(starts, empty)
+            stats = {
+                stat: np.delete(array, empty, axis=1) for stat, array in stats.items()
+            }
+        return RollupWindow(level=level.name, starts=starts, **stats)
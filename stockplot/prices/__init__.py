@@ -0,0 +1,5 @@
+from .price_cache import CachedPrices, PriceCache
+from .price_provider import PriceProvider
+from .price_series import PriceMatrix, PriceSeries
+
+__all__ = ("CachedPrices", "PriceCache", "PriceMatrix", "PriceProvider", "PriceSeries")
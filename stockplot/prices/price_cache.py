@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import os
+import threading
+import typing
+
+import numpy as np
+
+from .price_provider import PriceProvider
+from ..instrumentation.instrumentation_service import recorder_service
+from .price_series import PriceMatrix, PriceSeries
+
+__all__ = ("CachedPrices", "PriceCache")
+
+_ONE_DAY = np.timedelta64(1, "D")
+
+
+def _as_day(value: typing.Union[datetime.date, np.datetime64]) -> np.datetime64:
+    return np.datetime64(value, "D")
+
+
+def _to_date(value: np.datetime64) -> datetime.date:
+    return value.astype(datetime.date)
+
+
+class PriceCache:
+    def __init__(
+        self,
+        directory: str,
+        provider: PriceProvider,
+        today: typing.Callable[[], datetime.date] = datetime.date.today,
+    ) -> None:
+        self._directory = directory
+        self._provider = provider
+        self._today = today
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, symbol: str, suffix: str) -> str:
+        # Symbols such as "BRK/B" or "^GSPC" are not safe file names.
+        digest = hashlib.sha1(symbol.encode()).hexdigest()[:16]
+        return os.path.join(self._directory, f"{digest}.{suffix}")
+
+    def coverage(
+        self, symbol: str
+    ) -> typing.Optional[typing.Tuple[np.datetime64, np.datetime64]]:
+        try:
+            with open(self._path(symbol, "json")) as file:
+                meta = json.load(file)
+        except FileNotFoundError:
+            return None
+        return np.datetime64(meta["first"], "D"), np.datetime64(meta["last"], "D")
+
+    def load(self, symbol: str) -> PriceSeries:
+        if self.coverage(symbol) is None:
+            return PriceSeries.empty()
+
+        days = np.load(self._path(symbol, "days.npy"), mmap_mode="r")
+        close = np.load(self._path(symbol, "close.npy"), mmap_mode="r")
+        return PriceSeries(days=days.view("datetime64[D]"), close=close)
+
+    def _store(
+        self,
+        symbol: str,
+        series: PriceSeries,
+        first: np.datetime64,
+        last: np.datetime64,
+    ) -> None:
+        # Write to temporary names first so readers never see half a file.
+        for suffix, array in (
+            ("days.npy", np.ascontiguousarray(series.days.astype("datetime64[D]"))),
+            ("close.npy", np.ascontiguousarray(series.close, dtype=np.float64)),
+        ):
+            path = self._path(symbol, suffix)
+            with open(f"{path}.tmp", "wb") as file:
+                np.save(file, array.view(np.int64) if suffix == "days.npy" else array)
+            os.replace(f"{path}.tmp", path)
+
+        meta_path = self._path(symbol, "json")
+        with open(f"{meta_path}.tmp", "w") as file:
+            json.dump({"symbol": symbol, "first": str(first), "last": str(last)}, file)
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+    def _missing_ranges(
+        self, symbol: str, start: np.datetime64, end: np.datetime64
+    ) -> typing.List[typing.Tuple[np.datetime64, np.datetime64]]:
+        coverage = self.coverage(symbol)
+        if coverage is None:
+            return [(start, end)]
+
+        first, last = coverage
+        missing = []
+        if start < first:
+            missing.append((start, first - _ONE_DAY))
+        if end > last:
+            missing.append((last + _ONE_DAY, end))
+        return missing
+
+    def get(self, symbol: str, start: datetime.date, end: datetime.date) -> PriceSeries:
+        return self.get_many([symbol], start, end).series(symbol)
+
+    def get_many(
+        self,
+        symbols: typing.Sequence[str],
+        start: datetime.date,
+        end: datetime.date,
+    ) -> CachedPrices:
+        start_day, end_day = _as_day(start), _as_day(end)
+        with self._lock:
+            self._fill(symbols, start_day, end_day)
+            return CachedPrices(
+                {
+                    symbol: self.load(symbol).between(start_day, end_day)
+                    for symbol in symbols
+                },
+                start_day,
+                end_day,
+            )
+
+    def _fill(
+        self, symbols: typing.Sequence[str], start: np.datetime64, end: np.datetime64
+    ) -> None:
+        # Today's close is still moving, so coverage never extends past yesterday.
+        settled = _as_day(self._today()) - _ONE_DAY
+
+        pending: typing.Dict[str, typing.List] = {}
+        for symbol in symbols:
+            for first, last in self._missing_ranges(symbol, start, end):
+                pending.setdefault(symbol, []).append((first, last))
+
+        recorder = recorder_service.get()()
+        if recorder.enabled:
+            recorder.increment(
+                "cache_hits_total", len(symbols) - len(pending), cache="prices"
+            )
+            recorder.increment("cache_misses_total", len(pending), cache="prices")
+
+        rounds = max((len(ranges) for ranges in pending.values()), default=0)
+        fetched: typing.Dict[str, typing.List[PriceSeries]] = {}
+        for index in range(rounds):
+            request = {
+                symbol: (_to_date(ranges[index][0]), _to_date(ranges[index][1]))
+                for symbol, ranges in pending.items()
+                if index < len(ranges)
+            }
+            for symbol, series in self._provider.fetch_many(request).items():
+                fetched.setdefault(symbol, []).append(series)
+
+        for symbol, ranges in pending.items():
+            coverage = self.coverage(symbol)
+            first = min([start] + ([coverage[0]] if coverage else []))
+            last = max([min(end, settled)] + ([coverage[1]] if coverage else []))
+            merged = PriceSeries.merge(
+                [self._materialise(self.load(symbol))] + fetched.get(symbol, [])
+            )
+            self._store(symbol, merged, first, max(first - _ONE_DAY, last))
+
+    @staticmethod
+    def _materialise(series: PriceSeries) -> PriceSeries:
+        return PriceSeries(days=np.array(series.days), close=np.array(series.close))
+
+
+class CachedPrices:
+    def __init__(
+        self,
+        series: typing.Dict[str, PriceSeries],
+        start: np.datetime64,
+        end: np.datetime64,
+    ) -> None:
+        self._series = series
+        self._start = start
+        self._end = end
+
+    def series(self, symbol: str) -> PriceSeries:
+        return self._series[symbol]
+
+    def matrix(self) -> PriceMatrix:
+        symbols = list(self._series)
+        days = np.arange(self._start, self._end + _ONE_DAY, dtype="datetime64[D]")
+        values = np.full((len(symbols), len(days)), np.nan, dtype=np.float64)
+        for row, symbol in enumerate(symbols):
+            series = self._series[symbol]
+            columns = (series.days - self._start).astype(np.int64)
+            values[row, columns] = series.close
+        return PriceMatrix(symbols=symbols, days=days, values=values)
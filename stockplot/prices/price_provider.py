@@ -0,0 +1,13 @@
+import datetime
+from typing import Dict, Protocol, Tuple
+
+from .price_series import PriceSeries
+
+__all__ = ("PriceProvider",)
+
+
+class PriceProvider(Protocol):
+    def fetch_many(
+        self, ranges: Dict[str, Tuple[datetime.date, datetime.date]]
+    ) -> Dict[str, PriceSeries]:
+        ...
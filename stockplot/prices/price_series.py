@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+__all__ = ("PriceMatrix", "PriceSeries")
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    days: np.ndarray  # datetime64[D], strictly increasing
+    close: np.ndarray  # float64
+
+    @staticmethod
+    def empty() -> PriceSeries:
+        return PriceSeries(
+            days=np.empty(0, dtype="datetime64[D]"),
+            close=np.empty(0, dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def between(self, start: np.datetime64, end: np.datetime64) -> PriceSeries:
+        first = np.searchsorted(self.days, start, "left")
+        last = np.searchsorted(self.days, end, "right")
+        return PriceSeries(days=self.days[first:last], close=self.close[first:last])
+
+    @staticmethod
+    def merge(series: typing.Iterable[PriceSeries]) -> PriceSeries:
+        series = [part for part in series if len(part)]
+        if not series:
+            return PriceSeries.empty()
+
+        days = np.concatenate([part.days for part in series])
+        close = np.concatenate([part.close for part in series])
+        # Later parts win when the same day appears twice.
+        _, reversed_index = np.unique(days[::-1], return_index=True)
+        index = len(days) - 1 - reversed_index
+        return PriceSeries(days=days[index], close=close[index])
+
+
+@dataclass(frozen=True)
+class PriceMatrix:
+    symbols: typing.List[str]
+    days: np.ndarray  # datetime64[D]
+    values: np.ndarray  # float64, symbols x days, NaN where no price is known
+
+    def row(self, symbol: str) -> np.ndarray:
+        return self.values[self.symbols.index(symbol)]
+
+    def forward_filled(self) -> PriceMatrix:
+        if self.values.size == 0:
+            return self
+
+        known = ~np.isnan(self.values)
+        index = np.where(known, np.arange(self.values.shape[1]), 0)
+        np.maximum.accumulate(index, axis=1, out=index)
+        filled = np.take_along_axis(self.values, index, axis=1)
+        return PriceMatrix(symbols=self.symbols, days=self.days, values=filled)
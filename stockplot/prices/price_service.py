@@ -0,0 +1,10 @@
+from .price_provider import PriceProvider
+from .yahoo_price_provider import YahooPriceProvider
+from ..service import Lifetime, Service
+
+__all__ = ("price_provider_service",)
+
+
+price_provider_service: Service[PriceProvider] = Service(
+    value=YahooPriceProvider, lifetime=Lifetime.SINGLETON
+)
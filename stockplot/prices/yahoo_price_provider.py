@@ -0,0 +1,56 @@
+import datetime
+import typing
+from collections import defaultdict
+
+import numpy as np
+
+from .price_series import PriceSeries
+
+__all__ = ("YahooPriceProvider",)
+
+
+class YahooPriceProvider:
+    def __init__(self, threads: bool = True) -> None:
+        self._threads = threads
+
+    def fetch_many(
+        self, ranges: typing.Dict[str, typing.Tuple[datetime.date, datetime.date]]
+    ) -> typing.Dict[str, PriceSeries]:
+        # Symbols sharing a date range are downloaded in one yfinance call.
+        groups: typing.Dict[typing.Tuple, typing.List[str]] = defaultdict(list)
+        for symbol, date_range in ranges.items():
+            groups[date_range].append(symbol)
+
+        result: typing.Dict[str, PriceSeries] = {}
+        for (start, end), symbols in groups.items():
+            result.update(self._download(symbols, start, end))
+        return result
+
+    def _download(
+        self, symbols: typing.List[str], start: datetime.date, end: datetime.date
+    ) -> typing.Dict[str, PriceSeries]:
+        import yfinance
+
+        frame = yfinance.download(
+            tickers=" ".join(symbols),
+            start=start.isoformat(),
+            end=(end + datetime.timedelta(days=1)).isoformat(),
+            group_by="ticker",
+            auto_adjust=False,
+            progress=False,
+            threads=self._threads,
+        )
+
+        result = {}
+        for symbol in symbols:
+            if frame.empty:
+                result[symbol] = PriceSeries.empty()
+                continue
+
+            columns = frame[symbol] if len(symbols) > 1 else frame
+            close = columns["Close"].dropna()
+            result[symbol] = PriceSeries(
+                days=close.index.values.astype("datetime64[D]"),
+                close=close.to_numpy(dtype=np.float64),
+            )
+        return result
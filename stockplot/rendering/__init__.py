@@ -0,0 +1,14 @@
+from .chart_renderer import ChartRenderer, RenderJob, RenderResult
+from .charts import AllocationChart, Chart, ReturnsChart, ValueChart
+from .downsample import downsample
+
+__all__ = (
+    "AllocationChart",
+    "Chart",
+    "ChartRenderer",
+    "RenderJob",
+    "RenderResult",
+    "ReturnsChart",
+    "ValueChart",
+    "downsample",
+)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import os
+import time
+import typing
+from dataclasses import dataclass
+
+from .charts import Chart
+
+__all__ = ("ChartRenderer", "RenderJob", "RenderResult")
+
+_FORMATS = {".png": "png", ".svg": "svg"}
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    chart: Chart
+    path: str
+    width: int = 1200  # pixels
+    height: int = 600
+    dpi: int = 100
+
+    @property
+    def format(self) -> str:
+        suffix = os.path.splitext(self.path)[1].lower()
+        if suffix not in _FORMATS:
+            raise ValueError(f"Unsupported chart format {suffix!r} for {self.path}.")
+        return _FORMATS[suffix]
+
+    def digest(self) -> str:
+        settings = f"{self.format}:{self.width}x{self.height}@{self.dpi}"
+        return hashlib.sha256(f"{self.chart.digest()}\0{settings}".encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    path: str
+    rendered: bool
+    seconds: float
+
+
+def _digest_path(path: str) -> str:
+    return f"{path}.sha256"
+
+
+def _is_current(job: RenderJob) -> bool:
+    try:
+        with open(_digest_path(job.path)) as file:
+            stored = file.read().strip()
+    except FileNotFoundError:
+        return False
+    return stored == job.digest() and os.path.exists(job.path)
+
+
+def _render(job: RenderJob) -> RenderResult:
+    # Figures are built on the Agg canvas directly; going through pyplot
+    # would pick an interactive backend and import its GUI toolkit.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    started = time.perf_counter()
+    figure = Figure(figsize=(job.width / job.dpi, job.height / job.dpi), dpi=job.dpi)
+    FigureCanvasAgg(figure)
+    job.chart.draw(figure.add_subplot(), job.width)
+    figure.tight_layout()
+
+    directory = os.path.dirname(job.path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temporary = f"{job.path}.tmp"
+    figure.savefig(temporary, format=job.format, dpi=job.dpi)
+    os.replace(temporary, job.path)
+    with open(_digest_path(job.path), "w") as file:
+        file.write(job.digest())
+    return RenderResult(
+        path=job.path, rendered=True, seconds=time.perf_counter() - started
+    )
+
+
+class ChartRenderer:
+    def __init__(self, max_workers: typing.Optional[int] = None) -> None:
+        self._max_workers = max_workers
+
+    def render(self, job: RenderJob) -> RenderResult:
+        if _is_current(job):
+            return RenderResult(path=job.path, rendered=False, seconds=0.0)
+        return _render(job)
+
+    def render_many(
+        self, jobs: typing.Sequence[RenderJob]
+    ) -> typing.List[RenderResult]:
+        # Up-to-date figures are skipped here, so their data is never shipped
+        # to a worker process.
+        results: typing.List[typing.Optional[RenderResult]] = [None] * len(jobs)
+        pending = []
+        for index, job in enumerate(jobs):
+            if _is_current(job):
+                results[index] = RenderResult(
+                    path=job.path, rendered=False, seconds=0.0
+                )
+            else:
+                pending.append(index)
+
+        if len(pending) == 1 or self._max_workers == 1:
+            for index in pending:
+                results[index] = _render(jobs[index])
+        elif pending:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._max_workers
+            ) as executor:
+                futures = {
+                    executor.submit(_render, jobs[index]): index for index in pending
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    results[futures[future]] = future.result()
+
+        return typing.cast(typing.List[RenderResult], results)
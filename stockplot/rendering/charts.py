@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import typing
+from dataclasses import dataclass
+
+import numpy as np
+
+from .downsample import downsample
+
+__all__ = ("AllocationChart", "Chart", "ReturnsChart", "ValueChart")
+
+
+def _digest(kind: str, title: str, *arrays: np.ndarray) -> str:
+    digest = hashlib.sha256(f"{kind}\0{title}".encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"\0{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _stride(length: int, width: int) -> slice:
+    return slice(None, None, max(1, length // width))
+
+
+@dataclass(frozen=True)
+class ValueChart:
+    days: np.ndarray
+    value: np.ndarray
+    title: str = "Portfolio value"
+
+    def digest(self) -> str:
+        return _digest("value", self.title, self.days, self.value)
+
+    def draw(self, axes: typing.Any, width: int) -> None:
+        days, value = downsample(self.days, self.value, width)
+        axes.plot(days, value, linewidth=1.0)
+        axes.set_title(self.title)
+        axes.grid(True, alpha=0.3)
+
+
+@dataclass(frozen=True)
+class AllocationChart:
+    days: np.ndarray
+    labels: typing.Tuple[str, ...]
+    market_value: np.ndarray  # labels x days
+    title: str = "Allocation"
+
+    def digest(self) -> str:
+        return _digest(
+            "allocation",
+            "\0".join((self.title, *self.labels)),
+            self.days,
+            self.market_value,
+        )
+
+    def draw(self, axes: typing.Any, width: int) -> None:
+        # Stacked areas need one shared x axis, so every layer is decimated on
+        # the same stride instead of being downsampled independently.
+        step = _stride(len(self.days), width)
+        total = self.market_value.sum(axis=0)
+        shares = np.divide(
+            self.market_value,
+            total,
+            out=np.zeros_like(self.market_value, dtype=np.float64),
+            where=total > 0,
+        )
+        axes.stackplot(self.days[step], shares[:, step], labels=self.labels)
+        axes.set_ylim(0.0, 1.0)
+        axes.set_title(self.title)
+        axes.legend(loc="upper left", fontsize="small")
+
+
+@dataclass(frozen=True)
+class ReturnsChart:
+    days: np.ndarray
+    returns: np.ndarray
+    drawdown: np.ndarray
+    title: str = "Returns"
+
+    def digest(self) -> str:
+        return _digest("returns", self.title, self.days, self.returns, self.drawdown)
+
+    def draw(self, axes: typing.Any, width: int) -> None:
+        days, returns = downsample(self.days, self.returns, width)
+        axes.plot(days, returns, linewidth=1.0, label="Time-weighted return")
+        days, drawdown = downsample(self.days, self.drawdown, width)
+        axes.fill_between(days, drawdown, 0.0, alpha=0.3, label="Drawdown")
+        axes.axhline(0.0, color="black", linewidth=0.5)
+        axes.set_title(self.title)
+        axes.legend(loc="upper left", fontsize="small")
+
+
+Chart = typing.Union[AllocationChart, ReturnsChart, ValueChart]
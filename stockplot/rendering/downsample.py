@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+
+__all__ = ("downsample",)
+
+
+def downsample(
+    x: np.ndarray, y: np.ndarray, width: int
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    # Keeps the first, lowest, highest and last point of every pixel column,
+    # which draws the same line as the full series at that width.
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    if width < 1:
+        raise ValueError(f"Width must be positive, got {width}.")
+    if len(y) <= 4 * width:
+        return x, y
+
+    edges = np.linspace(0, len(y), width + 1).astype(np.int64)
+    starts = edges[:-1]
+    stops = edges[1:] - 1
+
+    # NaN gaps should not win the min/max, so they are masked out per bucket.
+    low = np.where(np.isnan(y), np.inf, y)
+    high = np.where(np.isnan(y), -np.inf, y)
+    argmin = _bucket_arg(low, starts, np.minimum)
+    argmax = _bucket_arg(high, starts, np.maximum)
+
+    index = np.stack([starts, argmin, argmax, stops], axis=1)
+    index.sort(axis=1)
+    index = index.reshape(-1)
+    keep = np.concatenate([[True], index[1:] != index[:-1]])
+    index = index[keep]
+    return x[index], y[index]
+
+
+def _bucket_arg(values: np.ndarray, starts: np.ndarray, reduce: np.ufunc) -> np.ndarray:
+    best = reduce.reduceat(values, starts)
+    bucket = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(values))))
+    hits = np.flatnonzero(values == best[bucket])
+    # The first hit per bucket; buckets whose values are all NaN fall back to
+    # their first index.
+    first = np.full(len(starts), -1, dtype=np.int64)
+    order = hits[::-1]
+    first[bucket[order]] = order
+    return np.where(first >= 0, first, starts)
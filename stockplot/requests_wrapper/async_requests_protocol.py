@@ -0,0 +1,13 @@
+from typing import Protocol
+
+from .response_protocol import ResponseProtocol
+
+__all__ = ("AsyncRequestsProtocol",)
+
+
+class AsyncRequestsProtocol(Protocol):
+    async def get(self, *args, **kwargs) -> ResponseProtocol:
+        ...
+
+    async def post(self, *args, **kwargs) -> ResponseProtocol:
+        ...
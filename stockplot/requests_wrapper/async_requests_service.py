@@ -0,0 +1,15 @@
+from .async_requests_protocol import AsyncRequestsProtocol
+from .requests_service import requests_service
+from .threaded_async_requests import ThreadedAsyncRequests
+from ..service import Service
+
+__all__ = ("async_requests_service",)
+
+
+def _get_async_requests() -> AsyncRequestsProtocol:
+    return ThreadedAsyncRequests(requests=requests_service.get()())
+
+
+async_requests_service: Service[AsyncRequestsProtocol] = Service(
+    value=_get_async_requests
+)
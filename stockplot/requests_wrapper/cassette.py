@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import re
+import struct
+import threading
+import typing
+import zlib
+
+import numpy as np
+
+from .requests_protocol import RequestsProtocol
+from .requests_service import requests_service
+from .response_protocol import ResponseProtocol
+
+__all__ = (
+    "CassetteMiss",
+    "CassettePlayer",
+    "CassetteRecorder",
+    "CassetteResponse",
+    "record_cassette",
+    "replay_cassette",
+)
+
+# File layout: magic, zlib-compressed bodies back to back, an index of
+# fixed-size records sorted by request digest, and a footer pointing at it.
+_MAGIC = b"SPCAS01\n"
+_FOOTER = struct.Struct("<QQ8s")  # index offset, entries, magic
+_INDEX = np.dtype(
+    [("digest", "S20"), ("offset", "<u8"), ("length", "<u4"), ("status", "<u4")]
+)
+
+_REDACTED = "REDACTED"
+_SECRET_KEYS = frozenset({"password", "sessionId", "username"})
+_SESSION_IN_URL = re.compile(r";jsessionid=[^/?]*")
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+def _redact(value: typing.Any) -> typing.Any:
+    if isinstance(value, dict):
+        return {
+            key: _REDACTED if key in _SECRET_KEYS else _redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(item) for item in value]
+    return value
+
+
+def _redact_body(body: bytes) -> bytes:
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return body
+    return json.dumps(_redact(payload), separators=(",", ":")).encode()
+
+
+def _request_digest(method: str, args: typing.Tuple, kwargs: typing.Dict) -> bytes:
+    # Request bodies take part as well as method, URL and params, since
+    # chunked product lookups share everything else.
+    url = _SESSION_IN_URL.sub(f";jsessionid={_REDACTED}", kwargs.get("url") or args[0])
+    body = kwargs.get("json")
+    if body is None and isinstance(kwargs.get("data"), (str, bytes)):
+        body = kwargs["data"]
+        try:
+            body = json.loads(body)
+        except ValueError:
+            body = body.decode() if isinstance(body, bytes) else body
+    key = json.dumps(
+        [method, url, _redact(kwargs.get("params") or {}), _redact(body)],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha1(key.encode()).digest()
+
+
+class CassetteResponse:
+    def __init__(self, status_code: int, compressed: typing.Union[bytes, memoryview]):
+        self.status_code = status_code
+        self._compressed = compressed
+
+    @property
+    def content(self) -> bytes:
+        return zlib.decompress(self._compressed)
+
+    def json(self) -> typing.Dict:
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 1) -> typing.Iterator[bytes]:
+        decompressor = zlib.decompressobj()
+        step = max(chunk_size, 1)
+        for start in range(0, len(self._compressed), step):
+            chunk = decompressor.decompress(self._compressed[start : start + step])
+            if chunk:
+                yield chunk
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+    def close(self) -> None:
+        pass
+
+
+class _RecordedResponse:
+    def __init__(self, status_code: int, content: bytes) -> None:
+        self.status_code = status_code
+        self.content = content
+
+    def json(self) -> typing.Dict:
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size: int = 1) -> typing.Iterator[bytes]:
+        step = max(chunk_size, 1)
+        for start in range(0, len(self.content), step):
+            yield self.content[start : start + step]
+
+    def close(self) -> None:
+        pass
+
+
+class CassetteRecorder:
+    def __init__(self, requests: RequestsProtocol, path: str, level: int = 6) -> None:
+        self._requests = requests
+        self._level = level
+        self._lock = threading.Lock()
+        self._index: typing.List[typing.Tuple[bytes, int, int, int]] = []
+        self._file = open(path, "wb")
+        self._file.write(_MAGIC)
+
+    def __enter__(self) -> CassetteRecorder:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def get(self, *args, **kwargs) -> ResponseProtocol:
+        return self._record("GET", self._requests.get, args, kwargs)
+
+    def post(self, *args, **kwargs) -> ResponseProtocol:
+        return self._record("POST", self._requests.post, args, kwargs)
+
+    def _record(
+        self,
+        method_name: str,
+        method: typing.Callable[..., ResponseProtocol],
+        args: typing.Tuple,
+        kwargs: typing.Dict,
+    ) -> ResponseProtocol:
+        response = method(*args, **kwargs)
+        body = b"".join(response.iter_content(chunk_size=64 * 1024))
+        compressed = zlib.compress(_redact_body(body), self._level)
+        digest = _request_digest(method_name, args, kwargs)
+
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(compressed)
+            self._index.append((digest, offset, len(compressed), response.status_code))
+
+        # The caller sees the unredacted body; only the file is scrubbed.
+        return _RecordedResponse(response.status_code, body)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+
+            index = np.array(self._index, dtype=_INDEX)
+            index = index[np.argsort(index["digest"], kind="stable")]
+            index_offset = self._file.tell()
+            self._file.write(index.tobytes())
+            self._file.write(_FOOTER.pack(index_offset, len(index), _MAGIC))
+            self._file.close()
+
+
+class CassettePlayer:
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(_MAGIC)] != _MAGIC:
+            raise ValueError(f"{path} is not a cassette.")
+
+        index_offset, entries, magic = _FOOTER.unpack_from(
+            self._map, len(self._map) - _FOOTER.size
+        )
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is truncated or was never closed.")
+
+        self._index = np.frombuffer(
+            self._map, dtype=_INDEX, count=entries, offset=index_offset
+        )
+        self._lock = threading.Lock()
+        self._replayed: typing.Dict[bytes, int] = {}
+
+    def __enter__(self) -> CassettePlayer:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, *args, **kwargs) -> ResponseProtocol:
+        return self._replay("GET", args, kwargs)
+
+    def post(self, *args, **kwargs) -> ResponseProtocol:
+        return self._replay("POST", args, kwargs)
+
+    def _replay(
+        self, method_name: str, args: typing.Tuple, kwargs: typing.Dict
+    ) -> ResponseProtocol:
+        digest = _request_digest(method_name, args, kwargs)
+        first = int(np.searchsorted(self._index["digest"], digest, "left"))
+        last = int(np.searchsorted(self._index["digest"], digest, "right"))
+        if first == last:
+            raise CassetteMiss(
+                f"No recorded response for {method_name} "
+                f"{kwargs.get('url') or args[0]}."
+            )
+
+        # Repeated requests get their recordings in order; the last one
+        # is replayed again once they run out.
+        with self._lock:
+            count = self._replayed.get(digest, 0)
+            self._replayed[digest] = count + 1
+        entry = self._index[min(first + count, last - 1)]
+
+        start = int(entry["offset"])
+        body = memoryview(self._map)[start : start + int(entry["length"])]
+        return CassetteResponse(int(entry["status"]), body)
+
+    def close(self) -> None:
+        # The index is a view of the map and has to go first. Responses still
+        # holding a body view keep the map alive until they are collected.
+        self._index = self._index[:0].copy()
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+
+def record_cassette(path: str) -> CassetteRecorder:
+    recorder = CassetteRecorder(requests_service.get()(), path)
+    requests_service.overwrite(new=lambda: recorder)
+    return recorder
+
+
+def replay_cassette(path: str) -> CassettePlayer:
+    player = CassettePlayer(path)
+    requests_service.overwrite(new=lambda: player)
+    return player
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import codecs
+import json
+import typing
+
+__all__ = ("JsonMemberStream",)
+
+_WHITESPACE = " \t\n\r"
+_NUMBER = frozenset("0123456789.eE+-")
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    def __init__(self, chunks: typing.Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._exhausted = False
+
+    def _fill(self, minimum: int = 1) -> bool:
+        # Reads until at least `minimum` unconsumed characters are buffered.
+        # Consumed text is dropped on every refill, so the buffer never holds
+        # much more than one chunk and twice the value being decoded.
+        if self._exhausted:
+            return False
+
+        parts = [self._buffer[self._position :]]
+        before = size = len(parts[0])
+        for chunk in self._chunks:
+            text = self._text.decode(chunk)
+            if text:
+                parts.append(text)
+                size += len(text)
+                if size >= minimum:
+                    break
+        else:
+            parts.append(self._text.decode(b"", final=True))
+            size += len(parts[-1])
+            self._exhausted = True
+
+        self._buffer = "".join(parts)
+        self._position = 0
+        return size > before
+
+    def _error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self._buffer, self._position)
+
+    def peek(self) -> str:
+        while True:
+            while (
+                self._position < len(self._buffer)
+                and self._buffer[self._position] in _WHITESPACE
+            ):
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def expect(self, character: str) -> None:
+        if self.peek() != character:
+            raise self._error(f"Expecting {character!r}")
+        self._position += 1
+
+    def value(self) -> typing.Any:
+        while True:
+            if self.peek() == "":
+                raise self._error("Expecting value")
+            # An incomplete value is retried once the unconsumed text has
+            # doubled, so a value spanning k chunks is decoded O(log k) times.
+            pending = len(self._buffer) - self._position
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if self._fill(2 * pending):
+                    continue
+                raise
+            # A number cut after a digit, ".", exponent or sign decodes as a
+            # shorter number, so it is only final once a non-number character
+            # follows it or the stream ends.
+            if self._may_continue(value, end) and self._fill(2 * pending):
+                continue
+            self._position = end
+            return value
+
+    def _may_continue(self, value: typing.Any, end: int) -> bool:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        for position in range(end, len(self._buffer)):
+            if self._buffer[position] not in _NUMBER:
+                return False
+        return True
+
+    def drain(self) -> None:
+        for _ in self._chunks:
+            pass
+        self._exhausted = True
+
+
+class JsonMemberStream:
+    # Yields the items of one member of a top-level JSON object as they are
+    # decoded: array elements, or (name, value) pairs for an object. Values
+    # outside that member are decoded and dropped.
+    def __init__(self, chunks: typing.Iterable[bytes], key: str) -> None:
+        self._chunks = chunks
+        self._key = key
+        self._found = False
+
+    @property
+    def found(self) -> bool:
+        return self._found
+
+    def __iter__(self) -> typing.Iterator[typing.Any]:
+        reader = _Reader(self._chunks)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+
+        while True:
+            name = reader.value()
+            reader.expect(":")
+            if name == self._key:
+                self._found = True
+                yield from self._items(reader)
+                # The rest of the document is not needed, but reading it lets
+                # a streamed HTTP connection go back to its pool.
+                reader.drain()
+                return
+
+            reader.value()
+            if reader.peek() == "}":
+                return
+            reader.expect(",")
+
+    @staticmethod
+    def _items(reader: _Reader) -> typing.Iterator[typing.Any]:
+        opening = reader.peek()
+        if opening not in ("[", "{"):
+            if reader.value() is not None:
+                raise reader._error("Expecting an array or object member")
+            return
+
+        closing = "]" if opening == "[" else "}"
+        reader.expect(opening)
+        if reader.peek() == closing:
+            return
+
+        while True:
+            if opening == "[":
+                yield reader.value()
+            else:
+                name = reader.value()
+                reader.expect(":")
+                yield name, reader.value()
+
+            if reader.peek() == closing:
+                reader.expect(closing)
+                return
+            reader.expect(",")
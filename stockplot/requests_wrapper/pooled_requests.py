@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+import typing
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+
+__all__ = ("ConnectionStats", "PooledRequests")
+
+
+@dataclass(frozen=True)
+class ConnectionStats:
+    requests: int
+    connections_opened: int
+
+    @property
+    def connections_reused(self) -> int:
+        return self.requests - self.connections_opened
+
+
+class _CountingAdapter(HTTPAdapter):
+    # Counts through each host pool's public num_requests and num_connections.
+    # Pools are recorded as they are handed out, so urllib3's pool manager
+    # internals are never read.
+    def __init__(self, *args, **kwargs) -> None:
+        self._stats_lock = threading.Lock()
+        self._live: typing.Set[typing.Any] = set()
+        self._retired_requests = 0
+        self._retired_connections = 0
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        pools = self.poolmanager.pools
+        dispose = pools.dispose_func
+
+        # Host pools evicted from the manager take their counters with them.
+        def _dispose(pool) -> None:
+            self._retire(pool)
+            if dispose is not None:
+                dispose(pool)
+
+        pools.dispose_func = _dispose
+
+    def get_connection_with_tls_context(self, *args, **kwargs):
+        return self._track(super().get_connection_with_tls_context(*args, **kwargs))
+
+    def get_connection(self, *args, **kwargs):
+        return self._track(super().get_connection(*args, **kwargs))
+
+    def _track(self, pool):
+        with self._stats_lock:
+            self._live.add(pool)
+        return pool
+
+    def _retire(self, pool) -> None:
+        with self._stats_lock:
+            if pool in self._live:
+                self._live.discard(pool)
+                self._retired_requests += pool.num_requests
+                self._retired_connections += pool.num_connections
+
+    def stats(self) -> ConnectionStats:
+        with self._stats_lock:
+            total_requests = self._retired_requests
+            total_connections = self._retired_connections
+            for pool in self._live:
+                total_requests += pool.num_requests
+                total_connections += pool.num_connections
+
+        return ConnectionStats(
+            requests=total_requests, connections_opened=total_connections
+        )
+
+
+class PooledRequests:
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        timeout: typing.Optional[float] = 30.0,
+        pool_block: bool = False,
+    ) -> None:
+        self._timeout = timeout
+        self._adapter = _CountingAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self._session = requests.Session()
+        self._session.mount("https://", self._adapter)
+        self._session.mount("http://", self._adapter)
+
+    def __enter__(self) -> PooledRequests:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def get(self, *args, **kwargs) -> requests.models.Response:
+        kwargs.setdefault("timeout", self._timeout)
+        return self._session.get(*args, **kwargs)
+
+    def post(self, *args, **kwargs) -> requests.models.Response:
+        kwargs.setdefault("timeout", self._timeout)
+        return self._session.post(*args, **kwargs)
+
+    def stats(self) -> ConnectionStats:
+        return self._adapter.stats()
+
+    def close(self) -> None:
+        self._session.close()
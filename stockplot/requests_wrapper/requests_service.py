@@ -1,17 +1,39 @@
-import requests
+import typing
 
 from .requests_protocol import RequestsProtocol
-from ..service import Service
+from ..service import Lifetime, Service
 
-__all__ = ("requests_service",)
+if typing.TYPE_CHECKING:
+    from .pooled_requests import PooledRequests
 
+__all__ = ("requests_service", "use_pooled_requests")
 
-class _RequestsWrapper:
-    def get(self, *args, **kwargs) -> requests.models.Response:
-        return requests.get(*args, **kwargs)
 
-    def post(self, *args, **kwargs) -> requests.models.Response:
-        return requests.post(*args, **kwargs)
+def _get_shared_requests() -> RequestsProtocol:
+    # requests is only imported once something is actually sent.
+    from .pooled_requests import PooledRequests
 
+    return PooledRequests()
 
-requests_service: Service[RequestsProtocol] = Service(value=_RequestsWrapper)
+
+def use_pooled_requests(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    timeout: typing.Optional[float] = 30.0,
+    pool_block: bool = False,
+) -> "PooledRequests":
+    from .pooled_requests import PooledRequests
+
+    pooled = PooledRequests(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        timeout=timeout,
+        pool_block=pool_block,
+    )
+    requests_service.overwrite(new=lambda: pooled)
+    return pooled
+
+
+requests_service: Service[RequestsProtocol] = Service(
+    value=_get_shared_requests, lifetime=Lifetime.SINGLETON
+)
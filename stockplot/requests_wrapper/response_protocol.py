@@ -1,4 +1,4 @@
-from typing import Protocol, Dict
+from typing import Protocol, Dict, Iterator
 
 __all__ = ("ResponseProtocol",)
 
@@ -8,3 +8,9 @@ class ResponseProtocol(Protocol):
 
     def json(self) -> Dict:
         ...
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        ...
+
+    def close(self) -> None:
+        ...
@@ -0,0 +1,25 @@
+import asyncio
+import functools
+
+from .requests_protocol import RequestsProtocol
+from .response_protocol import ResponseProtocol
+
+__all__ = ("ThreadedAsyncRequests",)
+
+
+class ThreadedAsyncRequests:
+    def __init__(self, requests: RequestsProtocol) -> None:
+        self._requests = requests
+
+    async def get(self, *args, **kwargs) -> ResponseProtocol:
+        return await self._run(self._requests.get, *args, **kwargs)
+
+    async def post(self, *args, **kwargs) -> ResponseProtocol:
+        return await self._run(self._requests.post, *args, **kwargs)
+
+    @staticmethod
+    async def _run(method, *args, **kwargs) -> ResponseProtocol:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(method, *args, **kwargs)
+        )
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+import typing
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+from .requests_protocol import RequestsProtocol
+from .response_protocol import ResponseProtocol
+from ..instrumentation.instrumentation_service import recorder_service
+from ..instrumentation.instrumented_requests import endpoint_of
+
+__all__ = ("HostRateLimiter", "RetryPolicy", "ThrottledRequests")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 4
+    base_delay: float = 0.5  # seconds
+    max_delay: float = 8.0
+    statuses: typing.FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+    def delay(self, attempt: int, jitter: float) -> float:
+        # "Full jitter": a uniform draw below the exponential ceiling keeps
+        # clients that failed together from retrying together.
+        return jitter * min(self.max_delay, self.base_delay * 2**attempt)
+
+
+class HostRateLimiter:
+    def __init__(
+        self,
+        requests_per_second: float,
+        burst: int = 1,
+        clock: typing.Callable[[], float] = time.monotonic,
+        sleep: typing.Callable[[float], None] = time.sleep,
+    ) -> None:
+        if requests_per_second <= 0:
+            raise ValueError(
+                f"Requests per second must be positive, got {requests_per_second}."
+            )
+        if burst < 1:
+            raise ValueError(f"Burst must be at least 1, got {burst}.")
+
+        self._interval = 1.0 / requests_per_second
+        self._tolerance = (burst - 1) * self._interval
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next: typing.Dict[str, float] = {}
+
+    def wait(self, host: str) -> float:
+        # Each host keeps the time its next request is due; a caller reserves
+        # a slot under the lock and sleeps outside it.
+        with self._lock:
+            now = self._clock()
+            due = max(self._next.get(host, now), now)
+            delay = max(0.0, due - self._tolerance - now)
+            self._next[host] = due + self._interval
+
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+
+class ThrottledRequests:
+    def __init__(
+        self,
+        requests: RequestsProtocol,
+        max_concurrency: int = 8,
+        rate_limiter: typing.Optional[HostRateLimiter] = None,
+        retry: RetryPolicy = RetryPolicy(),
+        sleep: typing.Callable[[float], None] = time.sleep,
+        jitter: typing.Callable[[], float] = random.random,
+    ) -> None:
+        self._requests = requests
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._rate_limiter = rate_limiter
+        self._retry = retry
+        self._sleep = sleep
+        self._jitter = jitter
+        self._lock = threading.Lock()
+        self._retries = 0
+
+    @property
+    def retries(self) -> int:
+        return self._retries
+
+    def get(self, *args, **kwargs) -> ResponseProtocol:
+        return self._send(self._requests.get, args, kwargs)
+
+    def post(self, *args, **kwargs) -> ResponseProtocol:
+        return self._send(self._requests.post, args, kwargs)
+
+    def _send(
+        self,
+        method: typing.Callable[..., ResponseProtocol],
+        args: typing.Tuple,
+        kwargs: typing.Dict,
+    ) -> ResponseProtocol:
+        url = kwargs.get("url") or args[0]
+        host = urlsplit(url).netloc
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._rate_limiter.wait(host)
+
+            self._semaphore.acquire()
+            try:
+                response = method(*args, **kwargs)
+            except BaseException as error:
+                self._semaphore.release()
+                # Connection errors and timeouts from requests are OSErrors.
+                if (
+                    not isinstance(error, OSError)
+                    or attempt + 1 >= self._retry.attempts
+                ):
+                    raise
+            else:
+                if (
+                    response.status_code not in self._retry.statuses
+                    or attempt + 1 >= self._retry.attempts
+                ):
+                    return self._hold(response, kwargs)
+                # Hands a streamed body's connection back to the pool.
+                response.close()
+                self._semaphore.release()
+
+            with self._lock:
+                self._retries += 1
+            recorder = recorder_service.get()()
+            if recorder.enabled:
+                recorder.increment("http_retries_total", endpoint=endpoint_of(url))
+            self._sleep(self._retry.delay(attempt, self._jitter()))
+            attempt += 1
+
+    def _hold(
+        self, response: ResponseProtocol, kwargs: typing.Dict
+    ) -> ResponseProtocol:
+        # A streamed body is read after the call returns, so its permit is
+        # kept until the body has been consumed or the response closed.
+        if kwargs.get("stream"):
+            return _PermitResponse(response, self._semaphore.release)
+        self._semaphore.release()
+        return response
+
+
+class _PermitResponse:
+    def __init__(
+        self, response: ResponseProtocol, release: typing.Callable[[], None]
+    ) -> None:
+        self._response = response
+        self._release = release
+        self._lock = threading.Lock()
+        self._held = True
+        self.status_code = response.status_code
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self._response, name)
+
+    def json(self) -> typing.Dict:
+        try:
+            return self._response.json()
+        finally:
+            self._give_back()
+
+    def iter_content(self, chunk_size: int = 1) -> typing.Iterator[bytes]:
+        try:
+            yield from self._response.iter_content(chunk_size)
+        finally:
+            self._give_back()
+
+    def close(self) -> None:
+        try:
+            self._response.close()
+        finally:
+            self._give_back()
+
+    def _give_back(self) -> None:
+        with self._lock:
+            if not self._held:
+                return
+            self._held = False
+        self._release()
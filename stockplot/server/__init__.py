@@ -0,0 +1,15 @@
+from .portfolio_server import PortfolioServer
+from .portfolio_state import (
+    PortfolioSnapshot,
+    PortfolioState,
+    PriceSource,
+    prices_from_cache,
+)
+
+__all__ = (
+    "PortfolioServer",
+    "PortfolioSnapshot",
+    "PortfolioState",
+    "PriceSource",
+    "prices_from_cache",
+)
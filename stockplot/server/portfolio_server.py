@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import concurrent.futures
+import datetime
+import gzip
+import hashlib
+import http.server
+import io
+import json
+import threading
+import typing
+import urllib.parse
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .portfolio_state import PortfolioSnapshot, PortfolioState
+
+__all__ = ("PortfolioServer",)
+
+_JSON = "application/json"
+_NPY = "application/x-npy"
+
+
+class _HttpError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class _Table:
+    # Equal-length columns, sent as one JSON object or one structured .npy
+    # array. Meta fields go in the JSON object or in X-Stockplot-* headers.
+    columns: typing.Dict[str, np.ndarray]
+    meta: typing.Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class _Body:
+    content_type: str
+    raw: bytes
+    compressed: typing.Optional[bytes]
+    headers: typing.Dict[str, str]
+
+
+def _json_column(column: np.ndarray) -> typing.List:
+    if column.dtype.kind == "M":
+        return np.datetime_as_string(column).tolist()
+    if column.dtype.kind == "f":
+        # JSON has no NaN, so missing values become null.
+        return [None if value != value else value for value in column.tolist()]
+    return column.tolist()
+
+
+def _encode_json(table: _Table) -> bytes:
+    payload: typing.Dict[str, typing.Any] = dict(table.meta)
+    payload.update(
+        {name: _json_column(column) for name, column in table.columns.items()}
+    )
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _encode_npy(table: _Table) -> bytes:
+    columns = list(table.columns.items())
+    length = len(columns[0][1]) if columns else 0
+    array = np.empty(length, dtype=[(name, column.dtype) for name, column in columns])
+    for name, column in columns:
+        array[name] = column
+    buffer = io.BytesIO()
+    np.save(buffer, array, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def _day(query: typing.Dict[str, str], name: str) -> typing.Optional[datetime.date]:
+    value = query.get(name)
+    if value is None:
+        return None
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError:
+        raise _HttpError(400, f"{name} must be a YYYY-MM-DD date, got {value!r}.")
+
+
+def _matches(if_none_match: typing.Optional[str], etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match always uses weak comparison.
+    return "*" in tags or any(tag.removeprefix("W/") == etag[2:] for tag in tags)
+
+
+class _ResponseCache:
+    # Encoded bodies per (request, data version). Identical requests that
+    # arrive while one is being computed wait for it instead of repeating it.
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: typing.OrderedDict[typing.Hashable, _Body] = OrderedDict()
+        self._in_flight: typing.Dict[typing.Hashable, concurrent.futures.Future] = {}
+        self.computed = 0
+
+    def get(self, key: typing.Hashable, compute: typing.Callable[[], _Body]) -> _Body:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                return body
+
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = concurrent.futures.Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            body = compute()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(body)
+            with self._lock:
+                self.computed += 1
+                self._entries[key] = body
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+            return body
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+
+class _PooledHTTPServer(http.server.HTTPServer):
+    # Requests are handled on a fixed pool rather than a thread each, so a
+    # burst of dashboard refreshes cannot spawn unbounded threads.
+    def __init__(
+        self,
+        address: typing.Tuple[str, int],
+        handler: typing.Type[http.server.BaseHTTPRequestHandler],
+        max_workers: int,
+    ) -> None:
+        super().__init__(address, handler)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers)
+
+    def process_request(self, request, client_address) -> None:
+        self._executor.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._executor.shutdown(wait=True)
+
+
+class PortfolioServer:
+    def __init__(
+        self,
+        state: PortfolioState,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        max_workers: int = 8,
+        gzip_min_bytes: int = 1024,
+        max_cached: int = 64,
+    ) -> None:
+        self._state = state
+        self._gzip_min_bytes = gzip_min_bytes
+        self._cache = _ResponseCache(max_cached)
+        self._routes: typing.Dict[
+            str, typing.Callable[[PortfolioSnapshot, typing.Dict[str, str]], _Table]
+        ]
+        self._routes = {
+            "/transactions": self._transactions,
+            "/products": self._products,
+            "/holdings": self._holdings,
+            "/valuation": self._valuation,
+        }
+        self._server = _PooledHTTPServer((host, port), self._handler(), max_workers)
+        self._thread: typing.Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def computed(self) -> int:
+        return self._cache.computed
+
+    def __enter__(self) -> PortfolioServer:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self) -> None:
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def _handler(self) -> typing.Type[http.server.BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                server._get(self)
+
+            def do_POST(self) -> None:
+                server._post(self)
+
+            def log_message(self, format: str, *args: typing.Any) -> None:
+                pass
+
+        return Handler
+
+    def _get(self, request: http.server.BaseHTTPRequestHandler) -> None:
+        url = urllib.parse.urlsplit(request.path)
+        route = self._routes.get(url.path)
+        if route is None:
+            return self._error(request, _HttpError(404, f"No route {url.path}."))
+
+        query = dict(urllib.parse.parse_qsl(url.query))
+        binary = query.pop("format", "json") == "npy"
+        canonical = urllib.parse.urlencode(sorted(query.items()))
+        digest = hashlib.sha1(f"{url.path}?{canonical}&{binary}".encode()).hexdigest()
+
+        # The body is computed from one snapshot without holding any lock, so
+        # a refresh landing meanwhile cannot pair new data with an old ETag.
+        snapshot = self._state.snapshot()
+        # Weak, because the gzip and identity encodings share it.
+        etag = f'W/"{snapshot.version}-{digest[:16]}"'
+        if _matches(request.headers.get("If-None-Match"), etag):
+            request.send_response(304)
+            request.send_header("ETag", etag)
+            request.end_headers()
+            return
+
+        def compute() -> _Body:
+            try:
+                table = route(snapshot, query)
+            except ValueError as error:
+                raise _HttpError(400, str(error))
+            except LookupError as error:
+                raise _HttpError(404, str(error))
+            return self._encode(table, binary)
+
+        try:
+            body = self._cache.get(
+                (snapshot.version, url.path, canonical, binary), compute
+            )
+        except _HttpError as error:
+            return self._error(request, error)
+
+        accepts_gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+        content = body.raw
+        request.send_response(200)
+        request.send_header("Content-Type", body.content_type)
+        request.send_header("ETag", etag)
+        request.send_header("Cache-Control", "no-cache")
+        request.send_header("Vary", "Accept-Encoding")
+        if accepts_gzip and body.compressed is not None:
+            content = body.compressed
+            request.send_header("Content-Encoding", "gzip")
+        for name, value in body.headers.items():
+            request.send_header(name, value)
+        request.send_header("Content-Length", str(len(content)))
+        request.end_headers()
+        request.wfile.write(content)
+
+    def _post(self, request: http.server.BaseHTTPRequestHandler) -> None:
+        if urllib.parse.urlsplit(request.path).path != "/refresh":
+            return self._error(request, _HttpError(404, f"No route {request.path}."))
+
+        try:
+            added = self._state.refresh()
+        except Exception as error:
+            return self._error(request, _HttpError(502, f"Refresh failed: {error}"))
+        content = json.dumps({"added": added, "version": self._state.version}).encode()
+        request.send_response(200)
+        request.send_header("Content-Type", _JSON)
+        request.send_header("Content-Length", str(len(content)))
+        request.end_headers()
+        request.wfile.write(content)
+
+    def _error(
+        self, request: http.server.BaseHTTPRequestHandler, error: _HttpError
+    ) -> None:
+        content = json.dumps({"error": str(error)}).encode()
+        request.send_response(error.status)
+        request.send_header("Content-Type", _JSON)
+        request.send_header("Content-Length", str(len(content)))
+        request.end_headers()
+        request.wfile.write(content)
+
+    def _encode(self, table: _Table, binary: bool) -> _Body:
+        raw = _encode_npy(table) if binary else _encode_json(table)
+        compressed = None
+        if len(raw) >= self._gzip_min_bytes:
+            compressed = gzip.compress(raw, compresslevel=6)
+        headers = {}
+        if binary:
+            headers = {f"X-Stockplot-{key}": value for key, value in table.meta.items()}
+        return _Body(
+            content_type=_NPY if binary else _JSON,
+            raw=raw,
+            compressed=compressed,
+            headers=headers,
+        )
+
+    def _transactions(
+        self, snapshot: PortfolioSnapshot, query: typing.Dict[str, str]
+    ) -> _Table:
+        frame = snapshot.transactions()
+        product_id = query.get("product")
+        if product_id is not None:
+            frame = frame.take(np.flatnonzero(frame.product_id == int(product_id)))
+        return _Table(
+            columns={
+                "id": frame.id,
+                "productId": frame.product_id,
+                "quantity": frame.quantity,
+                "date": frame.transaction_time.astype("datetime64[s]"),
+            }
+        )
+
+    def _products(
+        self, snapshot: PortfolioSnapshot, query: typing.Dict[str, str]
+    ) -> _Table:
+        products = list(snapshot.products())
+        return _Table(
+            columns={
+                "id": np.array([p.id for p in products], dtype=np.int64),
+                "isin": np.array([p.isin for p in products], dtype=str),
+                "name": np.array([p.name for p in products], dtype=str),
+                "symbol": np.array([p.symbol for p in products], dtype=str),
+                "currency": np.array([p.currency.code for p in products], dtype=str),
+            }
+        )
+
+    def _holdings(
+        self, snapshot: PortfolioSnapshot, query: typing.Dict[str, str]
+    ) -> _Table:
+        return _Table(
+            columns={
+                "productId": snapshot.product_ids,
+                "quantity": snapshot.holdings(_day(query, "day")),
+            }
+        )
+
+    def _valuation(
+        self, snapshot: PortfolioSnapshot, query: typing.Dict[str, str]
+    ) -> _Table:
+        window = snapshot.valuation(
+            _day(query, "start"), _day(query, "end"), int(query.get("width", "1000"))
+        )
+
+        # Row 0 is the whole portfolio; ?product= picks one position instead.
+        row = 0
+        product_id = query.get("product")
+        if product_id is not None:
+            matches = np.flatnonzero(snapshot.product_ids == int(product_id))
+            if len(matches) == 0:
+                raise LookupError(f"Unknown product {product_id}.")
+            row = int(matches[0]) + 1
+
+        return _Table(
+            columns={
+                "day": window.starts,
+                "first": window.first[row],
+                "last": window.last[row],
+                "min": window.min[row],
+                "max": window.max[row],
+                "mean": window.mean[row],
+            },
+            meta={"level": window.level},
+        )
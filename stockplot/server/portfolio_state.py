@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import datetime
+import threading
+import typing
+
+import numpy as np
+
+from ..de_giro_wrapper.de_giro_wrapper import DeGiroWrapper
+from ..de_giro_wrapper.product_catalog import ProductCatalog
+from ..de_giro_wrapper.product_info import ProductInfo
+from ..de_giro_wrapper.transaction_frame import TransactionFrame
+from ..fx.fx_rate_table import FxRateTable
+from ..portfolio.analytics import PortfolioAnalytics
+from ..portfolio.portfolio_engine import PortfolioEngine
+from ..portfolio.rollup import RollupIndex, RollupWindow
+from ..prices.price_cache import PriceCache
+from ..storage.product_info_cache import ProductInfoCache
+
+__all__ = ("PortfolioSnapshot", "PortfolioState", "PriceSource", "prices_from_cache")
+
+_MISSING_ID = -1
+
+# Base-currency closes with one row per engine product and one column per
+# engine day, as PortfolioAnalytics expects them.
+PriceSource = typing.Callable[
+    [PortfolioEngine, typing.Mapping[int, ProductInfo]], np.ndarray
+]
+
+
+def prices_from_cache(
+    cache: PriceCache, fx: typing.Optional[FxRateTable] = None
+) -> PriceSource:
+    def prices(
+        engine: PortfolioEngine, products: typing.Mapping[int, ProductInfo]
+    ) -> np.ndarray:
+        symbols = {
+            identifier: product.symbol for identifier, product in products.items()
+        }
+        days = engine.days
+        matrix = cache.get_many(
+            sorted(set(symbols.values())),
+            days[0].astype(datetime.date),
+            days[-1].astype(datetime.date),
+        ).matrix()
+        currencies = {
+            identifier: product.currency for identifier, product in products.items()
+        }
+        return PortfolioAnalytics(engine).align_prices(
+            matrix, symbols, fx=fx, currencies=currencies
+        )
+
+    return prices
+
+
+def _utc_now() -> datetime.datetime:
+    # Naive UTC, like the transaction times.
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+class PortfolioSnapshot:
+    # One consistent version of the data. Snapshots are never changed once
+    # published, so they are read without any lock; refresh() publishes a
+    # new one instead.
+    def __init__(
+        self,
+        version: int,
+        frame: TransactionFrame,
+        engine: PortfolioEngine,
+        catalog: ProductCatalog,
+        prices: typing.Optional[PriceSource],
+    ) -> None:
+        self._version = version
+        self._frame = frame
+        self._engine = engine
+        self._catalog = catalog
+        self._prices = prices
+        self._rollup_lock = threading.Lock()
+        self._rollup: typing.Optional[RollupIndex] = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def engine(self) -> PortfolioEngine:
+        return self._engine
+
+    @property
+    def product_ids(self) -> np.ndarray:
+        return self._engine.product_ids
+
+    def transactions(self) -> TransactionFrame:
+        return self._frame
+
+    def products(self) -> ProductCatalog:
+        return self._catalog
+
+    def holdings(self, day: typing.Optional[datetime.date] = None) -> np.ndarray:
+        if day is None:
+            days = self._engine.days
+            if len(days) == 0:
+                return np.zeros(0, dtype=np.float64)
+            day = days[-1].astype(datetime.date)
+        return self._engine.holdings_on(day)
+
+    def valuation(
+        self,
+        start: typing.Optional[datetime.date] = None,
+        end: typing.Optional[datetime.date] = None,
+        width: int = 1000,
+    ) -> RollupWindow:
+        return self._rollup_index().window(start, end, width)
+
+    def _rollup_index(self) -> RollupIndex:
+        if self._prices is None:
+            raise LookupError("No price source is configured.")
+        if len(self._engine.days) == 0:
+            raise LookupError("No transactions have been loaded yet.")
+
+        # Only valuations of this version wait here, while prices are fetched
+        # and the index is built; other reads and refresh() do not.
+        with self._rollup_lock:
+            if self._rollup is None:
+                products = {
+                    identifier: self._catalog[identifier].to_product_info()
+                    for identifier in self._engine.product_ids.tolist()
+                    if identifier in self._catalog
+                }
+                series = PortfolioAnalytics(self._engine).series(
+                    self._prices(self._engine, products), prices_version=self._version
+                )
+                self._rollup = RollupIndex.from_analytics(series)
+            return self._rollup
+
+
+class PortfolioState:
+    # Everything the server answers from: one logged-in wrapper, the
+    # transactions seen so far and the products they refer to, published as
+    # snapshots. version changes whenever any of that does, and is what ETags
+    # are built from.
+    def __init__(
+        self,
+        wrapper: DeGiroWrapper,
+        start_date: datetime.datetime,
+        product_cache: typing.Optional[ProductInfoCache] = None,
+        prices: typing.Optional[PriceSource] = None,
+        overlap: datetime.timedelta = datetime.timedelta(days=7),
+        clock: typing.Callable[[], datetime.datetime] = _utc_now,
+    ) -> None:
+        self._wrapper = wrapper
+        self._product_cache = product_cache
+        self._prices = prices
+        self._overlap = overlap
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._synced_until = start_date
+        self._seen_ids: typing.Set[int] = set()
+        self._snapshot = PortfolioSnapshot(
+            version=0,
+            frame=TransactionFrame.empty(),
+            engine=PortfolioEngine(),
+            catalog=ProductCatalog(),
+            prices=prices,
+        )
+
+    @property
+    def version(self) -> int:
+        return self.snapshot().version
+
+    def snapshot(self) -> PortfolioSnapshot:
+        with self._lock:
+            return self._snapshot
+
+    def refresh(self) -> int:
+        # The next snapshot is built from copies outside the lock, so requests
+        # keep being answered from the previous version meanwhile.
+        with self._refresh_lock:
+            current = self.snapshot()
+            end_date = self._clock()
+            frame = self._wrapper.get_transaction_frame(
+                self._synced_until - self._overlap, end_date
+            )
+            frame = self._unseen(frame)
+            ids = {int(product_id) for product_id in np.unique(frame.product_id)}
+            missing = {
+                identifier for identifier in ids if identifier not in current.products()
+            }
+            products = self._fetch_products(missing) if missing else {}
+
+            self._synced_until = end_date
+            transactions, engine = current.transactions(), current.engine
+            if len(frame):
+                self._seen_ids.update(int(i) for i in frame.id if i != _MISSING_ID)
+                transactions = TransactionFrame.concat(
+                    [transactions, frame]
+                ).sorted_by_time()
+                engine = engine.copy()
+                engine.add(frame)
+            if len(transactions) and engine.days[-1] < np.datetime64(
+                end_date.date(), "D"
+            ):
+                # Holdings carry forward to today even without new trades.
+                if engine is current.engine:
+                    engine = engine.copy()
+                engine.extend_to(end_date.date())
+
+            catalog = current.products()
+            if products:
+                catalog = ProductCatalog(catalog)
+                catalog.merge(products)
+
+            if engine is not current.engine or catalog is not current.products():
+                with self._lock:
+                    self._snapshot = PortfolioSnapshot(
+                        version=current.version + 1,
+                        frame=transactions,
+                        engine=engine,
+                        catalog=catalog,
+                        prices=self._prices,
+                    )
+            return len(frame)
+
+    def _unseen(self, frame: TransactionFrame) -> TransactionFrame:
+        # Consecutive refreshes overlap, so rows already held are dropped.
+        keep = np.fromiter(
+            (
+                identifier == _MISSING_ID or identifier not in self._seen_ids
+                for identifier in frame.id.tolist()
+            ),
+            dtype=bool,
+            count=len(frame),
+        )
+        return frame if keep.all() else frame.take(np.flatnonzero(keep))
+
+    def _fetch_products(self, ids: typing.Set[int]) -> typing.Dict[int, ProductInfo]:
+        if self._product_cache is not None:
+            return self._product_cache.get_product_info_by_id(self._wrapper, ids)
+        return self._wrapper.get_product_info_by_id(ids)
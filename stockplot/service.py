@@ -1,21 +1,101 @@
-from typing import TypeVar, Optional, Callable, Generic
+import contextlib
+import contextvars
+import enum
+import threading
+from typing import Any, Callable, Generic, Iterator, Optional, TypeVar
+
+__all__ = ("Lifetime", "Service", "bind_context")
 
 T = TypeVar("T")
+R = TypeVar("R")
+
+_UNSET: Any = object()
+
+
+class Lifetime(enum.Enum):
+    TRANSIENT = "transient"  # a new instance on every call
+    SINGLETON = "singleton"  # built once per process, on first use
+    THREAD = "thread"  # built once per thread, on first use there
 
 
 class Service(Generic[T]):
-    def __init__(self, value: Callable[[], T]) -> None:
+    # Resolution order: an override() scoped to the current context, then a
+    # process-wide overwrite(), then the default value with its lifetime.
+    # Overrides are used as given, so they decide their own sharing.
+    def __init__(
+        self, value: Callable[[], T], lifetime: Lifetime = Lifetime.TRANSIENT
+    ) -> None:
         self._value = value
+        self._lifetime = lifetime
         self._overloaded: Optional[Callable[[], T]] = None
+        self._scoped: contextvars.ContextVar[Optional[Callable[[], T]]]
+        self._scoped = contextvars.ContextVar(f"service_{id(self)}", default=None)
+
+        self._lock = threading.Lock()
+        self._instance: T = _UNSET
+        self._local = threading.local()
+        self._default: Callable[[], T] = {
+            Lifetime.TRANSIENT: value,
+            Lifetime.SINGLETON: self._singleton,
+            Lifetime.THREAD: self._per_thread,
+        }[lifetime]
+
+    @property
+    def lifetime(self) -> Lifetime:
+        return self._lifetime
 
     def get(self) -> Callable[[], T]:
-        if self._overloaded:
-            return self._overloaded
+        scoped = self._scoped.get()
+        if scoped is not None:
+            return scoped
+
+        return self.registered()
 
-        return self._value
+    def registered(self) -> Callable[[], T]:
+        # What get() returns outside any override(): for decorating the
+        # process-wide binding without capturing a scoped test double.
+        overloaded = self._overloaded
+        return self._default if overloaded is None else overloaded
 
     def overwrite(self, new: Callable[[], T]) -> None:
         self._overloaded = new
 
     def reset(self) -> None:
         self._overloaded = None
+
+    @contextlib.contextmanager
+    def override(self, new: Callable[[], T]) -> Iterator[None]:
+        # Only visible to this thread or task and to work started through
+        # bind_context, so parallel tests cannot see each other's doubles.
+        token = self._scoped.set(new)
+        try:
+            yield
+        finally:
+            self._scoped.reset(token)
+
+    def _singleton(self) -> T:
+        instance = self._instance
+        if instance is _UNSET:
+            with self._lock:
+                instance = self._instance
+                if instance is _UNSET:
+                    instance = self._instance = self._value()
+        return instance
+
+    def _per_thread(self) -> T:
+        instance = getattr(self._local, "instance", _UNSET)
+        if instance is _UNSET:
+            instance = self._local.instance = self._value()
+        return instance
+
+
+def bind_context(function: Callable[..., R]) -> Callable[..., R]:
+    # Pool threads start from an empty context, which would hide scoped
+    # overrides from them. Every call runs in its own copy of the context
+    # that was current when the function was bound.
+    context = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> R:
+        return context.copy().run(function, *args, **kwargs)
+
+    return run
@@ -0,0 +1,11 @@
+from .degiro_csv_import import CsvImport, DeGiroCsvImporter
+from .product_info_cache import CacheStats, ProductInfoCache
+from .transaction_store import TransactionStore
+
+__all__ = (
+    "CacheStats",
+    "CsvImport",
+    "DeGiroCsvImporter",
+    "ProductInfoCache",
+    "TransactionStore",
+)
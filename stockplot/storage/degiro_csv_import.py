@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import csv
+import datetime
+import functools
+import hashlib
+import io
+import os
+import typing
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ..currency import Currency
+from ..de_giro_wrapper.product_catalog import ProductCatalog
+from ..de_giro_wrapper.product_info import ProductInfo
+from ..de_giro_wrapper.transaction_frame import TransactionFrame
+from .transaction_store import TransactionStore
+
+__all__ = ("CsvImport", "DeGiroCsvImporter")
+
+Path = typing.Union[str, "os.PathLike[str]"]
+
+_CHUNK_BYTES = 1 << 20
+_MASK62 = (1 << 62) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+# Columns by position, since the header text follows the account language:
+# Transactions.csv: Date, Time, Product, ISIN, Reference exchange, Venue,
+#   Quantity, Price, <price currency>, ..., Order ID
+# Account.csv: Date, Time, Value date, Product, ISIN, Description, FX,
+#   Change <currency>, <amount>, ...
+_TRANSACTION_COLUMNS = {"date": 0, "time": 1, "isin": 3, "quantity": 6}
+_TRANSACTION_CURRENCY = 8
+_ACCOUNT_ISIN = 4
+_ACCOUNT_CURRENCY = 7
+
+
+@dataclass
+class CsvImport:
+    transactions: TransactionFrame
+    # Listings found in the catalog, keyed by their DeGiro product id.
+    products: typing.Dict[int, ProductInfo] = field(default_factory=dict)
+    # ISINs the catalog does not know, with the synthetic product id their
+    # rows carry. Exports have no ticker, so these cannot be priced until the
+    # product is fetched from DeGiro and the file is imported again.
+    unresolved: typing.Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class _ParsedChunk:
+    isins: typing.List[str]
+    quantities: typing.List[str]
+    local_times: np.ndarray  # datetime64[m], account-local wall clock
+    keys: np.ndarray  # row digests, used for stable transaction ids
+    products: typing.Dict[str, str]  # isin -> currency code
+
+
+def _synthetic_id(isin: str) -> int:
+    # Exports carry ISINs but not DeGiro product ids. Negative ids can never
+    # clash with real ones and stay the same across imports. Transaction ids
+    # are negative too, which is how TransactionStore tells imported rows
+    # apart from synced ones.
+    digest = hashlib.blake2b(isin.encode(), digest_size=8).digest()
+    return -(int.from_bytes(digest, "little") & _MASK62) - 1
+
+
+def _rows(data: bytes) -> typing.Iterator[typing.List[str]]:
+    return csv.reader(io.StringIO(data.decode("utf-8-sig")))
+
+
+def _parse_transactions(data: bytes) -> _ParsedChunk:
+    isins, quantities, stamps, keys = [], [], [], []
+    products: typing.Dict[str, str] = {}
+    columns = _TRANSACTION_COLUMNS
+    for row in _rows(data):
+        if len(row) <= _TRANSACTION_CURRENCY or not row[columns["isin"]]:
+            continue
+
+        date, isin = row[columns["date"]], row[columns["isin"]]
+        isins.append(isin)
+        quantities.append(row[columns["quantity"]])
+        stamps.append(f"{date[6:10]}-{date[3:5]}-{date[0:2]}T{row[columns['time']]}")
+        digest = hashlib.blake2b(",".join(row).encode(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "little") & _MASK62)
+        products.setdefault(isin, row[_TRANSACTION_CURRENCY])
+
+    return _ParsedChunk(
+        isins=isins,
+        quantities=quantities,
+        local_times=np.array(stamps, dtype="datetime64[m]"),
+        keys=np.array(keys, dtype=np.int64),
+        products=products,
+    )
+
+
+def _parse_account(data: bytes) -> _ParsedChunk:
+    products: typing.Dict[str, str] = {}
+    for row in _rows(data):
+        if len(row) <= _ACCOUNT_CURRENCY or not row[_ACCOUNT_ISIN]:
+            continue
+        products.setdefault(row[_ACCOUNT_ISIN], row[_ACCOUNT_CURRENCY])
+
+    return _ParsedChunk(
+        isins=[],
+        quantities=[],
+        local_times=np.empty(0, dtype="datetime64[m]"),
+        keys=np.empty(0, dtype=np.int64),
+        products=products,
+    )
+
+
+def _chunks(path: Path, chunk_bytes: int) -> typing.Iterator[bytes]:
+    # Blocks are cut at the last newline so no row straddles two chunks; the
+    # header line is dropped from the first one.
+    with open(path, "rb") as file:
+        file.readline()
+        rest = b""
+        while True:
+            block = file.read(chunk_bytes)
+            if not block:
+                break
+            block = rest + block
+            end = block.rfind(b"\n") + 1
+            if end == 0:
+                rest = block
+                continue
+            rest = block[end:]
+            yield block[:end]
+        if rest.strip():
+            yield rest
+
+
+def _quantities(values: typing.List[str]) -> np.ndarray:
+    # Dutch exports use a decimal comma.
+    text = np.char.replace(np.array(values, dtype=str), ",", ".")
+    if (np.char.find(text, ".") < 0).all():
+        return text.astype(np.int64)
+    return text.astype(np.float64)
+
+
+@functools.lru_cache(maxsize=8)
+def _zone(name: str) -> datetime.tzinfo:
+    import zoneinfo
+
+    return zoneinfo.ZoneInfo(name)
+
+
+def _offsets(moments: np.ndarray, zone: datetime.tzinfo) -> np.ndarray:
+    return np.fromiter(
+        (
+            moment.replace(tzinfo=zone).utcoffset() // datetime.timedelta(minutes=1)
+            for moment in moments.astype(datetime.datetime)
+        ),
+        dtype=np.int64,
+        count=len(moments),
+    )
+
+
+def _to_utc(local_times: np.ndarray, timezone: str) -> np.ndarray:
+    # Exports show the wall clock of the account's timezone, whereas
+    # get_transactions returns naive UTC. Offsets are looked up per day, and
+    # per minute only on days where the offset changes.
+    zone = _zone(timezone)
+    days, inverse = np.unique(local_times.astype("datetime64[D]"), return_inverse=True)
+    inverse = inverse.reshape(-1)
+    first = _offsets(days.astype("datetime64[m]"), zone)
+    last = _offsets(days + np.timedelta64(1, "D") - np.timedelta64(1, "m"), zone)
+
+    offsets = first[inverse]
+    changing = np.flatnonzero((first != last)[inverse])
+    offsets[changing] = _offsets(local_times[changing], zone)
+    utc = local_times - offsets.astype("timedelta64[m]")
+    return utc.astype("datetime64[ns]")
+
+
+class DeGiroCsvImporter:
+    def __init__(
+        self,
+        catalog: typing.Optional[ProductCatalog] = None,
+        timezone: str = "Europe/Amsterdam",
+        max_workers: typing.Optional[int] = None,
+        chunk_bytes: int = _CHUNK_BYTES,
+    ) -> None:
+        self._catalog = catalog
+        self._timezone = timezone
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._chunk_bytes = chunk_bytes
+
+    def read_transactions(self, path: Path) -> CsvImport:
+        parsed = self._parse(path, _parse_transactions)
+        result = self._products(parsed)
+        by_isin = {product.isin: product.id for product in result.products.values()}
+        by_isin.update(result.unresolved)
+
+        isins = [isin for chunk in parsed for isin in chunk.isins]
+        if not isins:
+            return result
+
+        frame = TransactionFrame(
+            product_id=np.fromiter(
+                (by_isin[isin] for isin in isins), dtype=np.int64, count=len(isins)
+            ),
+            quantity=_quantities([q for chunk in parsed for q in chunk.quantities]),
+            transaction_time=_to_utc(
+                np.concatenate([chunk.local_times for chunk in parsed]),
+                self._timezone,
+            ),
+            id=self._ids(np.concatenate([chunk.keys for chunk in parsed])),
+        )
+        result.transactions = frame.sorted_by_time()
+        return result
+
+    def read_account(self, path: Path) -> CsvImport:
+        # Cash movements have no counterpart in the model; the statement only
+        # contributes the products it mentions.
+        return self._products(self._parse(path, _parse_account))
+
+    def load(
+        self,
+        path: Path,
+        store: TransactionStore,
+        account_id: int,
+    ) -> CsvImport:
+        result = self.read_transactions(path)
+        store.save(account_id, result.transactions)
+        if self._catalog is not None:
+            self._catalog.merge(result.products)
+        return result
+
+    def _parse(
+        self, path: Path, parse: typing.Callable[[bytes], _ParsedChunk]
+    ) -> typing.List[_ParsedChunk]:
+        chunks = _chunks(path, self._chunk_bytes)
+        if self._max_workers == 1 or os.path.getsize(path) <= self._chunk_bytes:
+            return [parse(chunk) for chunk in chunks]
+
+        # At most two chunks per worker are in flight, so memory stays flat
+        # however long the export is.
+        results: typing.List[_ParsedChunk] = []
+        pending: typing.Deque[concurrent.futures.Future] = collections.deque()
+        with concurrent.futures.ProcessPoolExecutor(self._max_workers) as executor:
+            for chunk in chunks:
+                if len(pending) >= 2 * self._max_workers:
+                    results.append(pending.popleft().result())
+                pending.append(executor.submit(parse, chunk))
+            results.extend(future.result() for future in pending)
+        return results
+
+    def _products(self, parsed: typing.List[_ParsedChunk]) -> CsvImport:
+        seen: typing.Dict[str, str] = {}
+        for chunk in parsed:
+            for isin, currency_code in chunk.products.items():
+                seen.setdefault(isin, currency_code)
+
+        result = CsvImport(transactions=TransactionFrame.empty())
+        for isin, currency_code in seen.items():
+            product = self._known(isin, Currency.from_string(currency_code))
+            if product is None:
+                result.unresolved[isin] = _synthetic_id(isin)
+            else:
+                result.products[product.id] = product
+        return result
+
+    def _known(self, isin: str, currency: Currency) -> typing.Optional[ProductInfo]:
+        if self._catalog is None:
+            return None
+
+        # Prefer the listing quoted in the currency the trade was priced in.
+        listings = self._catalog.by_isin(isin)
+        for listing in listings:
+            if listing.currency is currency:
+                return listing.to_product_info()
+        return listings[0].to_product_info() if listings else None
+
+    @staticmethod
+    def _ids(keys: np.ndarray) -> np.ndarray:
+        # Identical rows (the same fill reported twice) are told apart by how
+        # often the row has occurred so far, which keeps ids stable across
+        # re-imports of overlapping exports.
+        order = np.argsort(keys, kind="stable")
+        ordered = keys[order]
+        starts = np.flatnonzero(np.r_[True, ordered[1:] != ordered[:-1]])
+        lengths = np.diff(np.r_[starts, len(keys)])
+        occurrence = np.empty(len(keys), dtype=np.uint64)
+        occurrence[order] = np.arange(len(keys)) - np.repeat(starts, lengths)
+
+        with np.errstate(over="ignore"):
+            mixed = keys.astype(np.uint64) + occurrence * np.uint64(_GOLDEN)
+        return -((mixed & np.uint64(_MASK62)).astype(np.int64)) - 1
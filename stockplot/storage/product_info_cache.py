@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import datetime
+import sqlite3
+import threading
+import time
+import typing
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from ..currency import Currency
+from ..de_giro_wrapper.de_giro_wrapper import DeGiroWrapper
+from ..de_giro_wrapper.product_info import ProductInfo
+from ..instrumentation.instrumentation_service import recorder_service
+
+__all__ = ("CacheStats", "ProductInfoCache")
+
+ProductInfoFetcher = typing.Callable[[typing.Set[int]], typing.Dict[int, ProductInfo]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS product_info (
+    id INTEGER PRIMARY KEY,
+    isin TEXT NOT NULL,
+    name TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    size: int
+
+
+class ProductInfoCache:
+    def __init__(
+        self,
+        path: str = ":memory:",
+        max_size: int = 10_000,
+        ttl: datetime.timedelta = datetime.timedelta(days=7),
+        clock: typing.Callable[[], float] = time.time,
+    ) -> None:
+        self._max_size = max_size
+        self._ttl = ttl.total_seconds()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: typing.OrderedDict[int, typing.Tuple[ProductInfo, float]] = (
+            OrderedDict()
+        )
+        self._in_flight: typing.Dict[int, Future] = {}
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._load()
+
+    def __enter__(self) -> ProductInfoCache:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _load(self) -> None:
+        rows = self._connection.execute(
+            "SELECT id, isin, name, symbol, currency, fetched_at FROM product_info "
+            "WHERE fetched_at > ? ORDER BY fetched_at DESC LIMIT ?",
+            (self._clock() - self._ttl, self._max_size),
+        ).fetchall()
+        for identifier, isin, name, symbol, currency, fetched_at in reversed(rows):
+            product = ProductInfo(
+                id=identifier,
+                isin=isin,
+                name=name,
+                symbol=symbol,
+                currency=Currency.from_string(currency),
+            )
+            self._entries[identifier] = (product, fetched_at)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                coalesced=self._coalesced,
+                evictions=self._evictions,
+                size=len(self._entries),
+            )
+
+    def get(
+        self, ids: typing.Set[int], fetch: ProductInfoFetcher
+    ) -> typing.Dict[int, ProductInfo]:
+        found: typing.Dict[int, ProductInfo] = {}
+        waiting: typing.Dict[int, Future] = {}
+        missing: typing.Set[int] = set()
+        own_fetch: typing.Optional[Future] = None
+
+        with self._lock:
+            now = self._clock()
+            for identifier in ids:
+                entry = self._entries.get(identifier)
+                if entry is not None and now - entry[1] < self._ttl:
+                    self._entries.move_to_end(identifier)
+                    found[identifier] = entry[0]
+                    self._hits += 1
+                elif identifier in self._in_flight:
+                    waiting[identifier] = self._in_flight[identifier]
+                    self._coalesced += 1
+                else:
+                    missing.add(identifier)
+                    self._misses += 1
+
+            if missing:
+                own_fetch = Future()
+                for identifier in missing:
+                    self._in_flight[identifier] = own_fetch
+
+        recorder = recorder_service.get()()
+        if recorder.enabled:
+            recorder.increment("cache_hits_total", len(found), cache="product_info")
+            recorder.increment("cache_misses_total", len(missing), cache="product_info")
+            recorder.increment(
+                "cache_coalesced_total", len(waiting), cache="product_info"
+            )
+
+        if own_fetch is not None:
+            try:
+                fetched = fetch(missing)
+            except BaseException as exception:
+                own_fetch.set_exception(exception)
+                raise
+            else:
+                own_fetch.set_result(fetched)
+                self._put(fetched)
+                found.update(fetched)
+            finally:
+                with self._lock:
+                    for identifier in missing:
+                        self._in_flight.pop(identifier, None)
+
+        for identifier, future in waiting.items():
+            result = future.result()
+            if identifier in result:
+                found[identifier] = result[identifier]
+
+        return found
+
+    def get_product_info_by_id(
+        self, wrapper: DeGiroWrapper, ids: typing.Set[int]
+    ) -> typing.Dict[int, ProductInfo]:
+        return self.get(ids=ids, fetch=wrapper.get_product_info_by_id)
+
+    def _put(self, products: typing.Dict[int, ProductInfo]) -> None:
+        with self._lock:
+            now = self._clock()
+            for identifier, product in products.items():
+                self._entries[identifier] = (product, now)
+                self._entries.move_to_end(identifier)
+
+            evicted = []
+            while len(self._entries) > self._max_size:
+                identifier, _ = self._entries.popitem(last=False)
+                evicted.append((identifier,))
+            self._evictions += len(evicted)
+
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO product_info "
+                    "(id, isin, name, symbol, currency, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        (
+                            identifier,
+                            product.isin,
+                            product.name,
+                            product.symbol,
+                            product.currency.name,
+                            now,
+                        )
+                        for identifier, product in products.items()
+                    ),
+                )
+                self._connection.executemany(
+                    "DELETE FROM product_info WHERE id = ?", evicted
+                )
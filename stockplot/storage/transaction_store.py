@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import datetime
+import sqlite3
+import typing
+
+from ..de_giro_wrapper.date_windows import month_windows
+from ..de_giro_wrapper.de_giro_wrapper import DeGiroWrapper
+from ..de_giro_wrapper.transaction import Transaction
+
+__all__ = ("TransactionStore",)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_MINUTE = 60_000_000  # in microseconds
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    account_id INTEGER NOT NULL,
+    row_key TEXT NOT NULL,
+    id INTEGER,
+    product_id INTEGER NOT NULL,
+    quantity NUMERIC NOT NULL,
+    transaction_time INTEGER NOT NULL,
+    PRIMARY KEY (account_id, row_key)
+);
+CREATE INDEX IF NOT EXISTS transactions_by_time
+    ON transactions (account_id, transaction_time);
+CREATE INDEX IF NOT EXISTS transactions_by_product
+    ON transactions (account_id, product_id, transaction_time);
+CREATE TABLE IF NOT EXISTS sync_state (
+    account_id INTEGER PRIMARY KEY,
+    synced_until TEXT NOT NULL
+);
+"""
+
+
+# How many products the API's fills of one quantity and minute belong to,
+# restricted to one product unless the last parameter is negative.
+_SYNCED_PRODUCTS = (
+    "(SELECT COUNT(DISTINCT product_id) FROM transactions AS synced "
+    "WHERE synced.account_id = ? AND (synced.id IS NULL OR synced.id >= 0) "
+    "AND synced.quantity = ? AND synced.transaction_time >= ? "
+    "AND synced.transaction_time < ? AND (synced.product_id = ? OR ? < 0))"
+)
+
+
+def _naive_utc(value: datetime.datetime) -> datetime.datetime:
+    # Times are kept as naive UTC, like the transactions themselves.
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _to_micros(value: datetime.datetime) -> int:
+    return (_naive_utc(value) - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> datetime.datetime:
+    return _EPOCH + datetime.timedelta(microseconds=value)
+
+
+def _is_imported(transaction: Transaction) -> bool:
+    return transaction.id is not None and transaction.id < 0
+
+
+def _row_key(transaction: Transaction) -> str:
+    if transaction.id is not None:
+        return str(transaction.id)
+
+    # DeGiro always sends ids; the fallback keeps id-less rows idempotent too.
+    return (
+        f"{transaction.product_id}:{transaction.quantity}:"
+        f"{transaction.transaction_datetime.isoformat()}"
+    )
+
+
+def _minute(micros: int) -> typing.Tuple[int, int]:
+    start = micros - micros % _MINUTE
+    return start, start + _MINUTE
+
+
+class TransactionStore:
+    def __init__(
+        self,
+        path: str,
+        initial_start_date: datetime.datetime = datetime.datetime(2000, 1, 1),
+        overlap: datetime.timedelta = datetime.timedelta(days=7),
+    ) -> None:
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+        self._initial_start_date = initial_start_date
+        self._overlap = overlap
+
+    def __enter__(self) -> TransactionStore:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def last_synced(self, account_id: int) -> typing.Optional[datetime.datetime]:
+        row = self._connection.execute(
+            "SELECT synced_until FROM sync_state WHERE account_id = ?", (account_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return datetime.datetime.fromisoformat(row[0])
+
+    def save(self, account_id: int, transactions: typing.Iterable[Transaction]) -> None:
+        with self._connection:
+            self._save(account_id, transactions)
+
+    def _save(
+        self, account_id: int, transactions: typing.Iterable[Transaction]
+    ) -> None:
+        # Rows with negative ids come from CSV exports (DeGiroCsvImporter),
+        # which carry neither DeGiro's ids nor seconds. The same fill is
+        # matched across the two sources by quantity, minute and product, and
+        # the API's row wins. An imported row whose product could not be
+        # resolved (negative product id) only matches when the API's fills of
+        # that quantity and minute all belong to one product; otherwise both
+        # rows are kept and the imported one is reported by ambiguous().
+        synced, imported = [], []
+        for transaction in transactions:
+            row = (
+                account_id,
+                _row_key(transaction),
+                transaction.id,
+                transaction.product_id,
+                transaction.quantity,
+                _to_micros(transaction.transaction_datetime),
+            )
+            (imported if _is_imported(transaction) else synced).append(row)
+
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO transactions "
+            "(account_id, row_key, id, product_id, quantity, transaction_time) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            synced,
+        )
+        self._connection.executemany(
+            "DELETE FROM transactions WHERE account_id = ? AND id < 0 "
+            "AND quantity = ? AND transaction_time >= ? AND transaction_time < ? "
+            f"AND (product_id = ? OR (product_id < 0 AND {_SYNCED_PRODUCTS} = 1))",
+            (
+                (account, quantity, *_minute(time), product)
+                + (account, quantity, *_minute(time), -1, -1)
+                for account, _, _, product, quantity, time in synced
+            ),
+        )
+        # For a resolved product the count is 0 or 1, so the row is only
+        # skipped when the API already has its fill.
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO transactions "
+            "(account_id, row_key, id, product_id, quantity, transaction_time) "
+            f"SELECT ?, ?, ?, ?, ?, ? WHERE {_SYNCED_PRODUCTS} != 1",
+            (
+                (*row, row[0], row[4], *_minute(row[5]), row[3], row[3])
+                for row in imported
+            ),
+        )
+
+    def ambiguous(self, account_id: int) -> typing.List[Transaction]:
+        # Imported rows without a resolved product whose quantity and minute
+        # match API fills of more than one product.
+        rows = self._connection.execute(
+            "SELECT id, product_id, quantity, transaction_time FROM transactions "
+            "WHERE account_id = ? AND id < 0 AND product_id < 0 "
+            "ORDER BY transaction_time, id",
+            (account_id,),
+        ).fetchall()
+        return [
+            Transaction(
+                product_id=product,
+                quantity=quantity,
+                transaction_datetime=_from_micros(transaction_time),
+                id=identifier,
+            )
+            for identifier, product, quantity, transaction_time in rows
+            if self._connection.execute(
+                f"SELECT {_SYNCED_PRODUCTS}",
+                (account_id, quantity, *_minute(transaction_time), product, product),
+            ).fetchone()[0]
+            > 1
+        ]
+
+    def sync(
+        self,
+        wrapper: DeGiroWrapper,
+        end_date: typing.Optional[datetime.datetime] = None,
+        window_months: int = 12,
+    ) -> int:
+        account_id = wrapper.account_id
+        if account_id is None:
+            raise Exception("Wrapper must be logged in before syncing.")
+
+        if end_date is None:
+            end_date = datetime.datetime.now(datetime.timezone.utc)
+        end_date = _naive_utc(end_date)
+
+        last_synced = self.last_synced(account_id)
+        if last_synced is None:
+            start_date = self._initial_start_date
+        else:
+            start_date = max(self._initial_start_date, last_synced - self._overlap)
+
+        transactions = wrapper.get_transactions_windowed(
+            start_date=start_date,
+            end_date=end_date,
+            windows=month_windows(start_date, end_date, months=window_months),
+        )
+
+        with self._connection:
+            self._save(account_id, transactions)
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sync_state (account_id, synced_until) "
+                "VALUES (?, ?)",
+                (account_id, end_date.isoformat()),
+            )
+
+        return len(transactions)
+
+    def transactions(
+        self,
+        account_id: int,
+        product_id: typing.Optional[int] = None,
+        start_date: typing.Optional[datetime.datetime] = None,
+        end_date: typing.Optional[datetime.datetime] = None,
+    ) -> typing.List[Transaction]:
+        query = (
+            "SELECT id, product_id, quantity, transaction_time FROM transactions "
+            "WHERE account_id = ?"
+        )
+        parameters: typing.List[typing.Any] = [account_id]
+
+        if product_id is not None:
+            query += " AND product_id = ?"
+            parameters.append(product_id)
+
+        if start_date is not None:
+            query += " AND transaction_time >= ?"
+            parameters.append(_to_micros(start_date))
+
+        if end_date is not None:
+            query += " AND transaction_time <= ?"
+            parameters.append(_to_micros(end_date))
+
+        query += " ORDER BY transaction_time, id"
+
+        return [
+            Transaction(
+                product_id=product,
+                quantity=quantity,
+                transaction_datetime=_from_micros(transaction_time),
+                id=identifier,
+            )
+            for identifier, product, quantity, transaction_time in self._connection.execute(
+                query, parameters
+            )
+        ]
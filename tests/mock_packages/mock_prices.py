@@ -0,0 +1,25 @@
+import datetime
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from stockplot.prices import PriceSeries
+
+__all__ = ("StaticPriceProvider",)
+
+
+class StaticPriceProvider:
+    def __init__(self, prices: Dict[str, PriceSeries]) -> None:
+        self._prices = prices
+        self.calls: List[Dict[str, Tuple[datetime.date, datetime.date]]] = []
+
+    def fetch_many(
+        self, ranges: Dict[str, Tuple[datetime.date, datetime.date]]
+    ) -> Dict[str, PriceSeries]:
+        self.calls.append(dict(ranges))
+        return {
+            symbol: self._prices.get(symbol, PriceSeries.empty()).between(
+                np.datetime64(start, "D"), np.datetime64(end, "D")
+            )
+            for symbol, (start, end) in ranges.items()
+        }
@@ -1,12 +1,23 @@
 import json
-from dataclasses import dataclass
+import threading
+import time
+from dataclasses import dataclass, field
 from enum import Enum
 from json import JSONDecodeError
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterator, Tuple
 
 from stockplot.requests_wrapper.response_protocol import ResponseProtocol
 
-__all__ = ("MockTraffic", "MockRequests", "RequestMethod", "MockJsonResponse")
+__all__ = (
+    "AsyncMockRequests",
+    "MockTraffic",
+    "MockRequests",
+    "RequestMethod",
+    "MockJsonResponse",
+    "ReadGauge",
+    "SlowJsonResponse",
+    "UnorderedMockRequests",
+)
 
 
 class RequestMethod(Enum):
@@ -26,20 +37,67 @@ class MockTraffic:
 class MockJsonResponse:
     status_code: int
     _json: Dict
+    closed: bool = False
 
     def json(self) -> Dict:
         return self._json
 
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        body = json.dumps(self._json).encode()
+        for start in range(0, len(body), chunk_size):
+            yield body[start : start + chunk_size]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class ReadGauge:
+    # Records the most body reads that were in progress at the same time.
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._active = 0
+        self.peak = 0
+
+    def enter(self) -> None:
+        with self._lock:
+            self._active += 1
+            self.peak = max(self.peak, self._active)
+
+    def exit(self) -> None:
+        with self._lock:
+            self._active -= 1
+
+
+@dataclass
+class SlowJsonResponse(MockJsonResponse):
+    gauge: ReadGauge = field(default_factory=ReadGauge)
+    delay: float = 0.02
+
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        self.gauge.enter()
+        try:
+            time.sleep(self.delay)
+            yield from super().iter_content(chunk_size)
+        finally:
+            self.gauge.exit()
+
 
 @dataclass
 class MockResponseWithoutJson:
     status_code: int
+    closed: bool = False
 
     def json(self) -> Dict:
         raise JSONDecodeError(
             "Expecting value: line 1 column 1 (char 0).", doc="", pos=0
         )
 
+    def iter_content(self, chunk_size: int = 1) -> Iterator[bytes]:
+        return iter(())
+
+    def close(self) -> None:
+        self.closed = True
+
 
 class MockRequests:
     def __init__(self, expected_traffic: List[MockTraffic]) -> None:
@@ -87,3 +145,42 @@ class MockRequests:
 
     def _serialize_request(self, method: RequestMethod, *args, **kwargs) -> str:
         return f'Method: "{method.name}", args: "{json.dumps(args)}", kwargs: "{json.dumps(kwargs)}".'
+
+
+class UnorderedMockRequests:
+    def __init__(self, expected_traffic: List[MockTraffic]) -> None:
+        self._pending = list(expected_traffic)
+        self._lock = threading.Lock()
+
+    def get(self, *args, **kwargs) -> ResponseProtocol:
+        return self._get(RequestMethod.GET, args, kwargs)
+
+    def post(self, *args, **kwargs) -> ResponseProtocol:
+        return self._get(RequestMethod.POST, args, kwargs)
+
+    def _get(self, method: RequestMethod, args, kwargs) -> ResponseProtocol:
+        with self._lock:
+            for index, expected_request in enumerate(self._pending):
+                if (
+                    method == expected_request.method
+                    and args == expected_request.args
+                    and kwargs == expected_request.kwargs
+                ):
+                    del self._pending[index]
+                    return expected_request.response
+
+        raise Exception(
+            f'Unexpected request: Method: "{method.name}", '
+            f'args: "{json.dumps(args)}", kwargs: "{json.dumps(kwargs)}".'
+        )
+
+
+class AsyncMockRequests:
+    def __init__(self, expected_traffic: List[MockTraffic]) -> None:
+        self._requests = MockRequests(expected_traffic=expected_traffic)
+
+    async def get(self, *args, **kwargs) -> ResponseProtocol:
+        return self._requests.get(*args, **kwargs)
+
+    async def post(self, *args, **kwargs) -> ResponseProtocol:
+        return self._requests.post(*args, **kwargs)
@@ -0,0 +1,44 @@
+import datetime
+import threading
+from typing import Dict, List, Set, Tuple
+
+from stockplot import ProductInfo, Transaction, TransactionFrame
+
+__all__ = ("StaticDeGiroWrapper",)
+
+
+class StaticDeGiroWrapper:
+    # Answers like a logged-in DeGiroWrapper from in-memory data.
+    def __init__(
+        self,
+        transactions: List[Transaction],
+        products: Dict[int, ProductInfo],
+        account_id: int = 1,
+    ) -> None:
+        self.account_id = account_id
+        self.transactions = transactions
+        self.products = products
+        self.transaction_calls: List[Tuple[datetime.datetime, datetime.datetime]] = []
+        self.product_calls: List[Set[int]] = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_transaction_frame(
+        self, start_date: datetime.datetime, end_date: datetime.datetime
+    ) -> TransactionFrame:
+        self.release.wait()
+        self.transaction_calls.append((start_date, end_date))
+        return TransactionFrame.from_transactions(
+            t
+            for t in self.transactions
+            if start_date <= t.transaction_datetime <= end_date
+        )
+
+    def get_transactions_windowed(
+        self, start_date: datetime.datetime, end_date: datetime.datetime, **kwargs
+    ) -> List[Transaction]:
+        return list(self.get_transaction_frame(start_date, end_date))
+
+    def get_product_info_by_id(self, ids: Set[int]) -> Dict[int, ProductInfo]:
+        self.product_calls.append(set(ids))
+        return {i: self.products[i] for i in ids if i in self.products}
@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from stockplot import Currency
+
+__all__ = ("TestFromString",)
+
+
+class TestFromString(TestCase):
+    def test_declared_currencies(self) -> None:
+        self.assertIs(Currency.USD, Currency.from_string("usd"))
+        self.assertIs(Currency.EUR, Currency.from_string("EUR"))
+
+    def test_every_iso_code_is_a_member(self) -> None:
+        pound = Currency.from_string("gbp")
+
+        self.assertIs(Currency.GBP, pound)
+        self.assertIs(pound, Currency["GBP"])
+        self.assertIn(pound, list(Currency))
+        self.assertIsInstance(pound.value, int)
+        self.assertEqual("GBP", pound.code)
+        self.assertIs(Currency.JPY, Currency.from_string("JPY"))
+
+    def test_unknown_currency(self) -> None:
+        for value in ("", "EURO", "U$D", "XYZ", "ABC"):
+            with self.assertRaises(Exception) as context:
+                Currency.from_string(value)
+
+            self.assertEqual(f"Unknown currency {value}", str(context.exception))
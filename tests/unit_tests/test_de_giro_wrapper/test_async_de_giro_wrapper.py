@@ -0,0 +1,181 @@
+import typing
+from datetime import datetime
+from unittest import IsolatedAsyncioTestCase
+
+from stockplot import AsyncDeGiroWrapper, Currency, ProductInfo, Transaction
+from stockplot.de_giro_wrapper.de_giro_factory import AsyncDeGiroFactory
+from stockplot.de_giro_wrapper.degiro_container import async_de_giro_factory_service
+from stockplot.requests_wrapper.async_requests_service import async_requests_service
+from .utils import (
+    get_login_request,
+    get_client_info_request,
+    get_logout_request,
+    get_transactions_request,
+    get_product_info_request,
+)
+from ...mock_packages.mock_requests import (
+    AsyncMockRequests,
+    MockJsonResponse,
+    MockTraffic,
+    ReadGauge,
+    SlowJsonResponse,
+)
+
+__all__ = ("TestAsyncDeGiroWrapper",)
+
+
+class TestAsyncDeGiroWrapper(IsolatedAsyncioTestCase):
+    def _set_requests(self, traffic: typing.List[MockTraffic]) -> None:
+        traffic = [
+            get_login_request("user", "pass", "session_id"),
+            get_client_info_request("session_id", 0),
+            *traffic,
+            get_logout_request("session_id", 0),
+        ]
+
+        async_requests_service.overwrite(
+            new=lambda: AsyncMockRequests(expected_traffic=traffic)
+        )
+
+    def _start_test(self) -> AsyncDeGiroWrapper:
+        factory = async_de_giro_factory_service.get()
+        return factory().create(user="user", password="pass")
+
+    def tearDown(self) -> None:
+        async_requests_service.reset()
+
+    @staticmethod
+    def _transactions_response(
+        dates: typing.List[str], product_id: int = 1
+    ) -> MockJsonResponse:
+        return MockJsonResponse(
+            status_code=200,
+            _json={
+                "data": [
+                    {"id": i, "productId": product_id, "quantity": 1, "date": date}
+                    for i, date in enumerate(dates)
+                ]
+            },
+        )
+
+    @staticmethod
+    def _product_response(identifier: int) -> MockJsonResponse:
+        return MockJsonResponse(
+            status_code=200,
+            _json={
+                "data": {
+                    str(identifier): {
+                        "id": str(identifier),
+                        "isin": f"isin{identifier}",
+                        "name": f"name{identifier}",
+                        "symbol": f"S{identifier}",
+                        "currency": "USD",
+                    }
+                }
+            },
+        )
+
+    async def test_get_transactions(self) -> None:
+        start_date = datetime(1970, 1, 1)
+        end_date = datetime(1970, 1, 2)
+        response = self._transactions_response(["1970-01-01T01:00:00+01:00"])
+        self._set_requests([get_transactions_request(start_date, end_date, response)])
+
+        async with self._start_test() as de_giro:
+            actual = await de_giro.get_transactions(
+                start_date=start_date, end_date=end_date
+            )
+
+        expected = [
+            Transaction(
+                product_id=1, quantity=1, transaction_datetime=datetime(1970, 1, 1)
+            )
+        ]
+        self.assertEqual(expected, actual)
+
+    async def test_get_transactions_for_windows(self) -> None:
+        windows = [
+            (datetime(1970, 1, 1), datetime(1970, 1, 31)),
+            (datetime(1970, 2, 1), datetime(1970, 2, 28)),
+        ]
+        self._set_requests(
+            [
+                get_transactions_request(
+                    windows[0][0],
+                    windows[0][1],
+                    self._transactions_response(["1970-01-02T00:00:00+00:00"]),
+                ),
+                get_transactions_request(
+                    windows[1][0],
+                    windows[1][1],
+                    self._transactions_response(["1970-02-02T00:00:00+00:00"]),
+                ),
+            ]
+        )
+
+        async with self._start_test() as de_giro:
+            actual = await de_giro.get_transactions_for_windows(windows)
+
+        expected = [
+            [Transaction(1, 1, datetime(1970, 1, 2))],
+            [Transaction(1, 1, datetime(1970, 2, 2))],
+        ]
+        self.assertEqual(expected, actual)
+
+    async def test_body_reads_are_bounded_by_max_concurrency(self) -> None:
+        windows = [
+            (datetime(1970, 1, day), datetime(1970, 1, day)) for day in range(1, 7)
+        ]
+        gauge = ReadGauge()
+        responses = [
+            SlowJsonResponse(status_code=200, _json={"data": []}, gauge=gauge)
+            for _ in windows
+        ]
+        self._set_requests(
+            [
+                get_transactions_request(start, end, response)
+                for (start, end), response in zip(windows, responses)
+            ]
+        )
+        factory = AsyncDeGiroFactory(
+            requests_factory=async_requests_service.get(), max_concurrency=2
+        )
+
+        async with factory.create(user="user", password="pass") as de_giro:
+            await de_giro.get_transactions_for_windows(windows)
+
+        self.assertLessEqual(gauge.peak, 2)
+        self.assertTrue(all(response.closed for response in responses))
+
+    async def test_get_product_info_for_batches(self) -> None:
+        self._set_requests(
+            [
+                get_product_info_request({1}, self._product_response(1)),
+                get_product_info_request({2}, self._product_response(2)),
+            ]
+        )
+
+        async with self._start_test() as de_giro:
+            actual = await de_giro.get_product_info_for_batches([{1}, {2}])
+
+        expected = {
+            identifier: ProductInfo(
+                id=identifier,
+                isin=f"isin{identifier}",
+                name=f"name{identifier}",
+                symbol=f"S{identifier}",
+                currency=Currency.USD,
+            )
+            for identifier in (1, 2)
+        }
+        self.assertEqual(expected, actual)
+
+    async def test_only_missing_id(self) -> None:
+        ids = {999999999}
+        self._set_requests([get_product_info_request(ids, MockJsonResponse(200, {}))])
+
+        with self.assertRaises(expected_exception=Exception) as context:
+            async with self._start_test() as de_giro:
+                await de_giro.get_product_info_by_id(ids=ids)
+
+        self.assertEqual(f"No products found with ids {ids}.", str(context.exception))
@@ -0,0 +1,249 @@
+import threading
+import typing
+from datetime import datetime
+from unittest import TestCase
+
+from stockplot.de_giro_wrapper.batch_refresh import BatchRefresher, Credentials
+from stockplot.requests_wrapper.throttled_requests import (
+    HostRateLimiter,
+    RetryPolicy,
+    ThrottledRequests,
+)
+from .utils import (
+    get_client_info_request,
+    get_login_request,
+    get_logout_request,
+    get_product_info_request,
+    get_transactions_request,
+)
+from ...mock_packages.mock_requests import (
+    MockJsonResponse,
+    MockTraffic,
+    ReadGauge,
+    SlowJsonResponse,
+    UnorderedMockRequests,
+)
+
+__all__ = ("TestBatchRefresher", "TestThrottledRequests")
+
+_START = datetime(2021, 1, 1)
+_END = datetime(2021, 2, 1)
+
+
+def _account_traffic(index: int) -> typing.List[MockTraffic]:
+    session_id, account_id = f"session{index}", index
+    transactions = MockJsonResponse(
+        status_code=200,
+        _json={
+            "data": [
+                {
+                    "id": index,
+                    "productId": 100 + index,
+                    "quantity": 1,
+                    "date": "2021-01-04T10:00:00+01:00",
+                }
+            ]
+        },
+    )
+    products = MockJsonResponse(
+        status_code=200,
+        _json={
+            "data": {
+                str(100 + index): {
+                    "id": str(100 + index),
+                    "isin": f"isin{index}",
+                    "name": f"name{index}",
+                    "symbol": f"S{index}",
+                    "currency": "EUR",
+                }
+            }
+        },
+    )
+    return [
+        get_login_request(f"user{index}", "pass", session_id),
+        get_client_info_request(session_id, account_id),
+        get_transactions_request(_START, _END, transactions, session_id, account_id),
+        get_product_info_request([100 + index], products, session_id, account_id),
+        get_logout_request(session_id, account_id),
+    ]
+
+
+class _GatedRequests:
+    # The first `width` calls are held until all of them are in flight at
+    # once, so concurrency is shown without relying on timings.
+    def __init__(self, requests: UnorderedMockRequests, width: int) -> None:
+        self._requests = requests
+        self._width = width
+        self._lock = threading.Lock()
+        self._gate = threading.Event()
+        self.in_flight = 0
+        self.peak = 0
+
+    @property
+    def gate_opened(self) -> bool:
+        return self._gate.is_set()
+
+    def get(self, *args, **kwargs):
+        return self._call(self._requests.get, args, kwargs)
+
+    def post(self, *args, **kwargs):
+        return self._call(self._requests.post, args, kwargs)
+
+    def _call(self, method, args, kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            if self.in_flight >= self._width:
+                self._gate.set()
+        try:
+            self._gate.wait(timeout=10)
+            return method(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class TestBatchRefresher(TestCase):
+    def test_accounts_are_refreshed_concurrently(self) -> None:
+        accounts = 8
+        traffic = [
+            request for index in range(accounts) for request in _account_traffic(index)
+        ]
+        requests = _GatedRequests(UnorderedMockRequests(traffic), width=4)
+        refresher = BatchRefresher(
+            requests=requests, max_concurrency=4, requests_per_second=None
+        )
+
+        results = refresher.refresh(
+            [Credentials(f"user{index}", "pass") for index in range(accounts)],
+            _START,
+            _END,
+        )
+
+        self.assertEqual(
+            [f"user{index}" for index in range(accounts)], [r.user for r in results]
+        )
+        for index, result in enumerate(results):
+            self.assertTrue(result.ok, result.error)
+            self.assertEqual(index, result.account_id)
+            self.assertEqual([100 + index], [t.product_id for t in result.transactions])
+            self.assertEqual({100 + index}, result.products.keys())
+            self.assertEqual(
+                {"login", "transactions", "product_info", "logout"},
+                result.timings.keys(),
+            )
+        self.assertTrue(requests.gate_opened)
+        self.assertEqual(4, requests.peak)
+
+    def test_failures_are_reported_per_account(self) -> None:
+        failed_login = MockTraffic(
+            method=get_login_request("user1", "pass", "").method,
+            args=(),
+            kwargs=get_login_request("user1", "pass", "").kwargs,
+            response=MockJsonResponse(status_code=403, _json={}),
+        )
+        refresher = BatchRefresher(
+            requests=UnorderedMockRequests(_account_traffic(0) + [failed_login]),
+            requests_per_second=None,
+        )
+
+        ok, failed = refresher.refresh(
+            [Credentials("user0", "pass"), Credentials("user1", "pass")], _START, _END
+        )
+
+        self.assertTrue(ok.ok)
+        self.assertFalse(failed.ok)
+        self.assertEqual(["login"], list(failed.timings))
+
+
+class TestThrottledRequests(TestCase):
+    def test_transient_statuses_are_retried_with_backoff(self) -> None:
+        login = get_login_request("user", "pass", "session")
+        unavailable = [
+            MockTraffic(
+                method=login.method,
+                args=(),
+                kwargs=login.kwargs,
+                response=MockJsonResponse(status_code=503, _json={}),
+            )
+            for _ in range(2)
+        ]
+        delays: typing.List[float] = []
+        requests = ThrottledRequests(
+            UnorderedMockRequests(unavailable + [login]),
+            retry=RetryPolicy(attempts=3, base_delay=1.0),
+            sleep=delays.append,
+            jitter=lambda: 0.5,
+        )
+
+        response = requests.post(**login.kwargs)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([0.5, 1.0], delays)
+        self.assertEqual(2, requests.retries)
+        # Retried responses are closed, so their connections are released.
+        self.assertTrue(all(traffic.response.closed for traffic in unavailable))
+        self.assertFalse(response.closed)
+
+    def test_gives_up_after_the_last_attempt(self) -> None:
+        login = get_login_request("user", "pass", "session")
+        unavailable = MockTraffic(
+            method=login.method,
+            args=(),
+            kwargs=login.kwargs,
+            response=MockJsonResponse(status_code=429, _json={}),
+        )
+        requests = ThrottledRequests(
+            UnorderedMockRequests([unavailable, unavailable]),
+            retry=RetryPolicy(attempts=2),
+            sleep=lambda delay: None,
+        )
+
+        self.assertEqual(429, requests.post(**login.kwargs).status_code)
+
+    def test_streamed_body_reads_hold_a_permit(self) -> None:
+        gauge = ReadGauge()
+        traffic = [
+            get_transactions_request(
+                datetime(2021, 1, day),
+                datetime(2021, 1, day),
+                SlowJsonResponse(status_code=200, _json={"data": []}, gauge=gauge),
+            )
+            for day in range(1, 7)
+        ]
+        requests = ThrottledRequests(UnorderedMockRequests(traffic), max_concurrency=2)
+
+        def read(kwargs: typing.Dict) -> None:
+            response = requests.get(**kwargs)
+            for _ in response.iter_content(chunk_size=64):
+                pass
+            response.close()
+
+        threads = [
+            threading.Thread(target=read, args=(item.kwargs,)) for item in traffic
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=10)
+
+        self.assertLessEqual(gauge.peak, 2)
+        self.assertTrue(all(item.response.closed for item in traffic))
+
+    def test_rate_limiter_spaces_requests_per_host(self) -> None:
+        now = [0.0]
+        slept: typing.List[float] = []
+
+        def sleep(delay: float) -> None:
+            slept.append(delay)
+            now[0] += delay
+
+        limiter = HostRateLimiter(
+            requests_per_second=2.0, burst=2, clock=lambda: now[0], sleep=sleep
+        )
+
+        waits = [limiter.wait("a.example") for _ in range(4)]
+        other = limiter.wait("b.example")
+
+        self.assertEqual([0.0, 0.0, 0.5, 0.5], waits)
+        self.assertEqual(0.0, other)
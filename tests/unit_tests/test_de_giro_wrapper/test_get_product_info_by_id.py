@@ -64,6 +64,7 @@ class TestGetTransactions(TestCase):
                         "sessionId": session_id,
                     },
                     "data": json.dumps(list(ids)),
+                    "stream": True,
                 },
                 response=data,
             ),
@@ -0,0 +1,97 @@
+import typing
+from unittest import TestCase
+
+from stockplot import Currency, DeGiroWrapper, ProductInfo
+from stockplot.de_giro_wrapper.degiro_container import de_giro_factory_service
+from stockplot.requests_wrapper.requests_service import requests_service
+from .utils import (
+    get_login_request,
+    get_client_info_request,
+    get_logout_request,
+    get_product_info_request,
+)
+from ...mock_packages.mock_requests import (
+    MockJsonResponse,
+    MockTraffic,
+    UnorderedMockRequests,
+)
+
+__all__ = ("TestGetProductInfoChunked",)
+
+
+class TestGetProductInfoChunked(TestCase):
+    def _set_requests(self, traffic: typing.List[MockTraffic]) -> None:
+        traffic = [
+            get_login_request("user", "pass", "session_id"),
+            get_client_info_request("session_id", 0),
+            *traffic,
+            get_logout_request("session_id", 0),
+        ]
+        requests_service.overwrite(
+            new=lambda: UnorderedMockRequests(expected_traffic=traffic)
+        )
+
+    def _start_test(self) -> DeGiroWrapper:
+        factory = de_giro_factory_service.get()
+        return factory().create(user="user", password="pass")
+
+    def tearDown(self) -> None:
+        requests_service.reset()
+
+    @staticmethod
+    def _product(identifier: int) -> ProductInfo:
+        return ProductInfo(
+            id=identifier,
+            isin=f"isin{identifier}",
+            name=f"name{identifier}",
+            symbol=f"S{identifier}",
+            currency=Currency.EUR,
+        )
+
+    @staticmethod
+    def _response(ids: typing.List[int]) -> MockJsonResponse:
+        if not ids:
+            return MockJsonResponse(status_code=200, _json={})
+
+        return MockJsonResponse(
+            status_code=200,
+            _json={
+                "data": {
+                    str(identifier): {
+                        "id": str(identifier),
+                        "isin": f"isin{identifier}",
+                        "name": f"name{identifier}",
+                        "symbol": f"S{identifier}",
+                        "currency": "EUR",
+                    }
+                    for identifier in ids
+                }
+            },
+        )
+
+    def test_chunks_are_merged_and_unresolved_reported(self) -> None:
+        self._set_requests(
+            [
+                get_product_info_request([1, 2], self._response([1, 2])),
+                get_product_info_request([3, 4], self._response([3])),
+                get_product_info_request([5], self._response([])),
+            ]
+        )
+
+        with self._start_test() as de_giro:
+            actual = de_giro.get_product_info_chunked(
+                ids={5, 4, 3, 2, 1}, chunk_size=2, max_workers=3
+            )
+
+        self.assertEqual(
+            {identifier: self._product(identifier) for identifier in (1, 2, 3)},
+            actual.products,
+        )
+        self.assertEqual({4, 5}, actual.unresolved)
+
+    def test_invalid_chunk_size(self) -> None:
+        self._set_requests([])
+
+        with self.assertRaises(ValueError):
+            with self._start_test() as de_giro:
+                de_giro.get_product_info_chunked(ids={1}, chunk_size=0)
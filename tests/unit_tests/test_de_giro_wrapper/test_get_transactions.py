@@ -4,7 +4,12 @@ from unittest import TestCase
 from stockplot import DeGiroWrapper, Transaction
 from stockplot.de_giro_wrapper.degiro_container import de_giro_factory_service
 from stockplot.requests_wrapper.requests_service import requests_service
-from .utils import get_login_request, get_client_info_request, get_logout_request
+from .utils import (
+    get_login_request,
+    get_client_info_request,
+    get_logout_request,
+    get_transactions_request,
+)
 from ...mock_packages.mock_requests import (
     MockJsonResponse,
     MockTraffic,
@@ -90,6 +95,7 @@ class TestGetTransactions(TestCase):
                         "intAccount": 0,
                         "sessionId": "session_id",
                     },
+                    "stream": True,
                 },
                 response=mock_response,
             )
@@ -112,3 +118,21 @@ class TestGetTransactions(TestCase):
             actual = de_giro.get_transactions(start_date=start_date, end_date=end_date)
 
         self.assertEquals(expected, actual)
+        self.assertTrue(mock_response.closed)
+
+    def test_parse_error_closes_response(self) -> None:
+        mock_response = MockJsonResponse(
+            status_code=200, _json={"data": [{"quantity": 1, **self._dict_padding}]}
+        )
+
+        start_date = datetime(1970, 1, 1)
+        end_date = datetime(1970, 1, 1)
+        self._set_requests(
+            data=get_transactions_request(start_date, end_date, mock_response)
+        )
+
+        with self.assertRaises(KeyError):
+            with self._start_test() as de_giro:
+                de_giro.get_transactions(start_date=start_date, end_date=end_date)
+
+        self.assertTrue(mock_response.closed)
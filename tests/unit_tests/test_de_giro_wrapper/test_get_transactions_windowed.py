@@ -0,0 +1,140 @@
+import typing
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from stockplot import DeGiroWrapper, Transaction
+from stockplot.de_giro_wrapper.date_windows import fixed_windows, month_windows
+from stockplot.de_giro_wrapper.degiro_container import de_giro_factory_service
+from stockplot.requests_wrapper.requests_service import requests_service
+from .utils import (
+    get_login_request,
+    get_client_info_request,
+    get_logout_request,
+    get_transactions_request,
+)
+from ...mock_packages.mock_requests import (
+    MockJsonResponse,
+    MockTraffic,
+    UnorderedMockRequests,
+)
+
+__all__ = ("TestDateWindows", "TestGetTransactionsWindowed")
+
+
+class TestDateWindows(TestCase):
+    def test_month_windows(self) -> None:
+        actual = month_windows(datetime(2020, 11, 15), datetime(2021, 2, 3))
+
+        expected = [
+            (datetime(2020, 11, 15), datetime(2020, 11, 30)),
+            (datetime(2020, 12, 1), datetime(2020, 12, 31)),
+            (datetime(2021, 1, 1), datetime(2021, 1, 31)),
+            (datetime(2021, 2, 1), datetime(2021, 2, 3)),
+        ]
+        self.assertEqual(expected, actual)
+
+    def test_quarter_windows(self) -> None:
+        actual = month_windows(datetime(2021, 1, 1), datetime(2021, 6, 30), months=3)
+
+        expected = [
+            (datetime(2021, 1, 1), datetime(2021, 3, 31)),
+            (datetime(2021, 4, 1), datetime(2021, 6, 30)),
+        ]
+        self.assertEqual(expected, actual)
+
+    def test_fixed_windows(self) -> None:
+        actual = fixed_windows(
+            datetime(2021, 1, 1), datetime(2021, 1, 10), timedelta(days=4)
+        )
+
+        expected = [
+            (datetime(2021, 1, 1), datetime(2021, 1, 4)),
+            (datetime(2021, 1, 5), datetime(2021, 1, 8)),
+            (datetime(2021, 1, 9), datetime(2021, 1, 10)),
+        ]
+        self.assertEqual(expected, actual)
+
+
+class TestGetTransactionsWindowed(TestCase):
+    def _set_requests(self, traffic: typing.List[MockTraffic]) -> None:
+        traffic = [
+            get_login_request("user", "pass", "session_id"),
+            get_client_info_request("session_id", 0),
+            *traffic,
+            get_logout_request("session_id", 0),
+        ]
+        requests_service.overwrite(
+            new=lambda: UnorderedMockRequests(expected_traffic=traffic)
+        )
+
+    def _start_test(self) -> DeGiroWrapper:
+        factory = de_giro_factory_service.get()
+        return factory().create(user="user", password="pass")
+
+    def tearDown(self) -> None:
+        requests_service.reset()
+
+    @staticmethod
+    def _response(rows: typing.List[typing.Tuple[int, str]]) -> MockJsonResponse:
+        return MockJsonResponse(
+            status_code=200,
+            _json={
+                "data": [
+                    {"id": identifier, "productId": 1, "quantity": 1, "date": date}
+                    for identifier, date in rows
+                ]
+            },
+        )
+
+    def _set_two_month_traffic(self) -> None:
+        self._set_requests(
+            [
+                get_transactions_request(
+                    datetime(2021, 1, 1),
+                    datetime(2021, 1, 31),
+                    self._response(
+                        [
+                            (2, "2021-01-31T23:30:00+01:00"),
+                            (1, "2021-01-05T10:00:00+01:00"),
+                        ]
+                    ),
+                ),
+                get_transactions_request(
+                    datetime(2021, 2, 1),
+                    datetime(2021, 2, 10),
+                    self._response(
+                        [
+                            (2, "2021-01-31T23:30:00+01:00"),
+                            (3, "2021-02-02T10:00:00+01:00"),
+                        ]
+                    ),
+                ),
+            ]
+        )
+
+    def test_merged_in_datetime_order_without_duplicates(self) -> None:
+        self._set_two_month_traffic()
+
+        with self._start_test() as de_giro:
+            actual = de_giro.get_transactions_windowed(
+                start_date=datetime(2021, 1, 1), end_date=datetime(2021, 2, 10)
+            )
+
+        self.assertEqual([1, 2, 3], [transaction.id for transaction in actual])
+        self.assertEqual(
+            Transaction(1, 1, datetime(2021, 1, 31, 22, 30), id=2), actual[1]
+        )
+
+    def test_iter_yields_each_transaction_once(self) -> None:
+        self._set_two_month_traffic()
+
+        with self._start_test() as de_giro:
+            actual = list(
+                de_giro.iter_transactions_windowed(
+                    start_date=datetime(2021, 1, 1),
+                    end_date=datetime(2021, 2, 10),
+                    max_workers=2,
+                )
+            )
+
+        self.assertEqual([1, 2, 3], sorted(transaction.id for transaction in actual))
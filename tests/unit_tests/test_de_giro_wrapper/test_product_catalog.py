@@ -0,0 +1,149 @@
+from unittest import TestCase
+
+import numpy as np
+
+from stockplot import Currency, ProductInfo
+from stockplot.de_giro_wrapper import ProductCatalog, ProductInfoBatch
+
+__all__ = ("TestProductCatalog",)
+
+
+class TestProductCatalog(TestCase):
+    _products = [
+        ProductInfo(
+            id=331868,
+            isin="US0378331005",
+            name="Apple Inc",
+            symbol="AAPL",
+            currency=Currency.USD,
+        ),
+        ProductInfo(
+            id=331869,
+            isin="US0378331005",
+            name="Apple Inc",
+            symbol="APC",
+            currency=Currency.EUR,
+        ),
+        ProductInfo(
+            id=1153605,
+            isin="IE00B4L5Y983",
+            name="iShares Core MSCI World",
+            symbol="IWDA",
+            currency=Currency.EUR,
+        ),
+    ]
+
+    def test_lookup_by_id_returns_views_equal_to_product_info(self) -> None:
+        catalog = ProductCatalog(self._products)
+
+        self.assertEqual(3, len(catalog))
+        for product in self._products:
+            self.assertIn(product.id, catalog)
+            self.assertEqual(product, catalog[product.id])
+            self.assertEqual(product, catalog.get(product.id).to_product_info())
+        self.assertIsNone(catalog.get(1))
+        self.assertNotIn(1, catalog)
+        with self.assertRaises(KeyError):
+            catalog[1]
+
+    def test_lookup_by_isin_returns_every_listing(self) -> None:
+        catalog = ProductCatalog(self._products)
+
+        self.assertEqual(self._products[:2], catalog.by_isin("US0378331005"))
+        self.assertEqual([self._products[2]], catalog.by_symbol("IWDA"))
+        self.assertEqual([], catalog.by_isin("IWDA"))
+        self.assertEqual([], catalog.by_symbol("MSFT"))
+
+    def test_merge_updates_existing_products(self) -> None:
+        catalog = ProductCatalog({product.id: product for product in self._products})
+        renamed = ProductInfo(
+            id=331869,
+            isin="US0378331005",
+            name="Apple Inc (Xetra)",
+            symbol="APC",
+            currency=Currency.EUR,
+        )
+        added = ProductInfo(
+            id=332111,
+            isin="US5949181045",
+            name="Microsoft Corp",
+            symbol="MSFT",
+            currency=Currency.USD,
+        )
+
+        count = catalog.merge(
+            ProductInfoBatch(products={p.id: p for p in (renamed, added)})
+        )
+
+        self.assertEqual(1, count)
+        self.assertEqual(4, len(catalog))
+        self.assertEqual(renamed, catalog[331869])
+        self.assertEqual([added], catalog.by_symbol("MSFT"))
+        self.assertEqual([self._products[0], renamed], catalog.by_isin("US0378331005"))
+
+    def test_merge_moves_a_product_between_indexes(self) -> None:
+        catalog = ProductCatalog(self._products)
+        moved = ProductInfo(
+            id=331868,
+            isin="US0378331005",
+            name="Apple Inc",
+            symbol="AAPL.O",
+            currency=Currency.USD,
+        )
+
+        catalog.merge([moved])
+
+        self.assertEqual([], catalog.by_symbol("AAPL"))
+        self.assertEqual([moved], catalog.by_symbol("AAPL.O"))
+
+    def test_columns_widen_for_long_values(self) -> None:
+        catalog = ProductCatalog(self._products)
+        long = ProductInfo(
+            id=5,
+            isin="XS0000000000-OTC",
+            name="Bond",
+            symbol="BOND.2031.OTC",
+            currency=Currency.EUR,
+        )
+
+        catalog.merge([long])
+
+        self.assertEqual(long, catalog[5])
+        self.assertEqual([long], catalog.by_isin(long.isin))
+        self.assertEqual([long], catalog.by_symbol(long.symbol))
+        self.assertEqual(self._products[:2], catalog.by_isin("US0378331005"))
+        # Only a full match counts, not one cut to the column width.
+        self.assertEqual([], catalog.by_isin("US0378331005-OTC-EXTRA-LONG"))
+
+    def test_views_survive_later_merges(self) -> None:
+        catalog = ProductCatalog(self._products[2:])
+        view = catalog[1153605]
+
+        catalog.merge(self._products[:2])
+
+        self.assertEqual(self._products[2], view)
+        self.assertEqual(self._products[0], catalog[331868])
+
+    def test_many_products_survive_index_growth(self) -> None:
+        products = [
+            ProductInfo(
+                id=1_000_000 + 7 * index,
+                isin=f"NL{index:010d}",
+                name=f"Product {index}",
+                symbol=f"P{index % 500}",
+                currency=Currency.EUR if index % 2 else Currency.USD,
+            )
+            for index in range(5000)
+        ]
+        catalog = ProductCatalog()
+        for start in range(0, len(products), 700):
+            catalog.merge(products[start : start + 700])
+
+        self.assertEqual(len(products), len(catalog))
+        np.testing.assert_array_equal([p.id for p in products], catalog.ids)
+        self.assertEqual(products, list(catalog))
+        self.assertEqual(products[::500], catalog.by_symbol("P0"))
+        found = catalog.get_many([products[10].id, 5, products[4000].id])
+        self.assertEqual(
+            {products[10].id: products[10], products[4000].id: products[4000]}, found
+        )
@@ -0,0 +1,258 @@
+from datetime import datetime, timedelta
+from unittest import TestCase
+
+from stockplot import Transaction
+from stockplot.de_giro_wrapper import SessionExpiredError
+from stockplot.de_giro_wrapper.degiro_container import de_giro_factory_service
+from stockplot.de_giro_wrapper.session_pool import SessionPool
+from stockplot.requests_wrapper.requests_service import requests_service
+from .utils import (
+    get_login_request,
+    get_client_info_request,
+    get_logout_request,
+    get_transactions_request,
+)
+from ...mock_packages.mock_requests import (
+    MockJsonResponse,
+    MockRequests,
+    MockTraffic,
+    UnorderedMockRequests,
+)
+
+__all__ = ("TestSessionPool",)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSessionPool(TestCase):
+    _start_date = datetime(2021, 1, 1)
+    _end_date = datetime(2021, 1, 2)
+
+    def _set_requests(self, traffic) -> MockRequests:
+        requests = MockRequests(expected_traffic=traffic)
+        requests_service.overwrite(new=lambda: requests)
+        return requests
+
+    def _transactions(self, session_id: str, status_code: int = 200) -> MockTraffic:
+        response = MockJsonResponse(
+            status_code=status_code,
+            _json={
+                "data": [
+                    {
+                        "id": 1,
+                        "productId": 1,
+                        "quantity": 1,
+                        "date": "2021-01-01T10:00:00+00:00",
+                    }
+                ]
+            },
+        )
+        return get_transactions_request(
+            self._start_date, self._end_date, response, session_id=session_id
+        )
+
+    def tearDown(self) -> None:
+        requests_service.reset()
+
+    def test_session_is_shared_between_wrappers(self) -> None:
+        self._set_requests(
+            [
+                get_login_request("user", "pass", "s1"),
+                get_client_info_request("s1", 0),
+                self._transactions("s1"),
+                self._transactions("s1"),
+                get_logout_request("s1", 0),
+            ]
+        )
+
+        with SessionPool(factory=de_giro_factory_service.get()()) as pool:
+            for _ in range(2):
+                with pool.factory.create("user", "pass") as de_giro:
+                    actual = de_giro.get_transactions(self._start_date, self._end_date)
+                    self.assertEqual(
+                        [Transaction(1, 1, datetime(2021, 1, 1, 10))], actual
+                    )
+
+        self.assertEqual((1, 1), (pool.logins, pool.logouts))
+
+    def test_expired_session_relogs_in_transparently(self) -> None:
+        expired = self._transactions("s1", status_code=401)
+        self._set_requests(
+            [
+                get_login_request("user", "pass", "s1"),
+                get_client_info_request("s1", 0),
+                expired,
+                get_login_request("user", "pass", "s2"),
+                get_client_info_request("s2", 0),
+                self._transactions("s2"),
+                get_logout_request("s2", 0),
+            ]
+        )
+
+        with SessionPool(factory=de_giro_factory_service.get()()) as pool:
+            with pool.factory.create("user", "pass") as de_giro:
+                actual = de_giro.get_transactions(self._start_date, self._end_date)
+
+        self.assertEqual(1, len(actual))
+        self.assertEqual(2, pool.logins)
+        # The rejected response is closed before the retry.
+        self.assertTrue(expired.response.closed)
+
+    def test_idle_session_is_replaced(self) -> None:
+        clock = _Clock()
+        self._set_requests(
+            [
+                get_login_request("user", "pass", "s1"),
+                get_client_info_request("s1", 0),
+                get_logout_request("s1", 0),
+                get_login_request("user", "pass", "s2"),
+                get_client_info_request("s2", 0),
+                get_logout_request("s2", 0),
+            ]
+        )
+
+        pool = SessionPool(
+            factory=de_giro_factory_service.get()(),
+            max_idle=timedelta(minutes=1),
+            clock=clock,
+        )
+        with pool.factory.create("user", "pass"):
+            pass
+        clock.now += 120
+        with pool.factory.create("user", "pass") as de_giro:
+            self.assertEqual("s2", de_giro.session.session_id)
+        pool.close()
+
+    def test_least_recently_used_session_is_evicted(self) -> None:
+        self._set_requests(
+            [
+                get_login_request("a", "pass", "sa"),
+                get_client_info_request("sa", 1),
+                get_login_request("b", "pass", "sb"),
+                get_client_info_request("sb", 2),
+                get_logout_request("sa", 1),
+                get_logout_request("sb", 2),
+            ]
+        )
+
+        with SessionPool(
+            factory=de_giro_factory_service.get()(), max_sessions=1
+        ) as pool:
+            with pool.factory.create("a", "pass"):
+                pass
+            with pool.factory.create("b", "pass"):
+                pass
+
+        self.assertEqual(2, pool.logouts)
+
+    def test_password_change_logs_out_the_replaced_session(self) -> None:
+        self._set_requests(
+            [
+                get_login_request("user", "old", "s1"),
+                get_client_info_request("s1", 0),
+                get_logout_request("s1", 0),
+                get_login_request("user", "new", "s2"),
+                get_client_info_request("s2", 0),
+                get_logout_request("s2", 0),
+            ]
+        )
+
+        with SessionPool(factory=de_giro_factory_service.get()()) as pool:
+            with pool.factory.create("user", "old"):
+                pass
+            with pool.factory.create("user", "new") as de_giro:
+                self.assertEqual("s2", de_giro.session.session_id)
+
+        self.assertEqual((2, 2), (pool.logins, pool.logouts))
+
+    def test_leased_session_is_logged_out_on_its_last_release(self) -> None:
+        self._set_requests(
+            [
+                get_login_request("user", "old", "s1"),
+                get_client_info_request("s1", 0),
+                get_login_request("user", "new", "s2"),
+                get_client_info_request("s2", 0),
+                get_logout_request("s1", 0),
+                get_logout_request("s2", 0),
+            ]
+        )
+
+        with SessionPool(factory=de_giro_factory_service.get()()) as pool:
+            with pool.factory.create("user", "old"):
+                with pool.factory.create("user", "new"):
+                    pass
+                self.assertEqual(0, pool.logouts)
+            self.assertEqual(1, pool.logouts)
+
+        self.assertEqual(2, pool.logouts)
+
+    def test_close_logs_out_every_session_despite_a_failure(self) -> None:
+        # The logout of "sa" is not expected, so it fails.
+        requests = UnorderedMockRequests(
+            [
+                get_login_request("a", "pass", "sa"),
+                get_client_info_request("sa", 1),
+                get_login_request("b", "pass", "sb"),
+                get_client_info_request("sb", 2),
+                get_login_request("b", "new", "sc"),
+                get_client_info_request("sc", 3),
+                get_logout_request("sb", 2),
+                get_logout_request("sc", 3),
+            ]
+        )
+        requests_service.overwrite(new=lambda: requests)
+
+        pool = SessionPool(factory=de_giro_factory_service.get()())
+        pool.acquire("a", "pass")
+        old = pool.acquire("b", "pass")
+        pool.acquire("b", "new")
+
+        with self.assertRaisesRegex(Exception, "Unexpected request"):
+            pool.close()
+
+        # Both the current and the replaced session of "b" were logged out.
+        self.assertEqual(2, pool.logouts)
+        self.assertEqual("sb", old.session_id)
+
+    def test_renew_after_close_logs_in_again(self) -> None:
+        self._set_requests(
+            [
+                get_login_request("user", "pass", "s1"),
+                get_client_info_request("s1", 0),
+                get_logout_request("s1", 0),
+                self._transactions("s1", status_code=401),
+                get_login_request("user", "pass", "s2"),
+                get_client_info_request("s2", 0),
+                self._transactions("s2"),
+                get_logout_request("s2", 0),
+            ]
+        )
+
+        pool = SessionPool(factory=de_giro_factory_service.get()())
+        with pool.factory.create("user", "pass") as de_giro:
+            pool.close()
+            actual = de_giro.get_transactions(self._start_date, self._end_date)
+        pool.close()
+
+        self.assertEqual(1, len(actual))
+        self.assertEqual((2, 2), (pool.logins, pool.logouts))
+
+    def test_unpooled_wrapper_raises_on_expiry(self) -> None:
+        self._set_requests(
+            [
+                get_login_request("user", "pass", "s1"),
+                get_client_info_request("s1", 0),
+                self._transactions("s1", status_code=401),
+                get_logout_request("s1", 0),
+            ]
+        )
+
+        with self.assertRaises(SessionExpiredError):
+            with de_giro_factory_service.get()().create("user", "pass") as de_giro:
+                de_giro.get_transactions(self._start_date, self._end_date)
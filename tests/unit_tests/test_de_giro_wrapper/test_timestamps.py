@@ -0,0 +1,74 @@
+import datetime
+import random
+from unittest import TestCase
+
+import numpy as np
+import pytz
+
+from stockplot.de_giro_wrapper.timestamps import parse_timestamp, parse_timestamps
+
+__all__ = ("TestTimestamps",)
+
+
+def _strptime(value: str) -> datetime.datetime:
+    return (
+        datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+        .astimezone(pytz.utc)
+        .replace(tzinfo=None)
+    )
+
+
+class TestTimestamps(TestCase):
+    @staticmethod
+    def _sample(count: int) -> list:
+        generator = random.Random(42)
+        zones = [
+            pytz.timezone(name)
+            for name in ("Europe/Amsterdam", "America/New_York", "Asia/Kolkata")
+        ]
+        start = datetime.datetime(1970, 1, 1, tzinfo=pytz.utc)
+        values = []
+        for _ in range(count):
+            moment = start + datetime.timedelta(
+                seconds=generator.randrange(0, 60 * 365 * 24 * 3600)
+            )
+            values.append(moment.astimezone(generator.choice(zones)).isoformat())
+        return values
+
+    def test_matches_strptime(self) -> None:
+        values = self._sample(5000) + [
+            "2021-03-28T01:59:59+01:00",
+            "2021-03-28T03:00:00+02:00",
+            "2021-10-31T02:30:00+02:00",
+            "2021-10-31T02:30:00+01:00",
+            "2020-02-29T23:59:59-05:30",
+        ]
+
+        expected = [_strptime(value) for value in values]
+
+        self.assertEqual(expected, [parse_timestamp(value) for value in values])
+        np.testing.assert_array_equal(
+            np.array(expected, dtype="datetime64[ns]"), parse_timestamps(values)
+        )
+
+    def test_other_layouts_fall_back_to_strptime(self) -> None:
+        values = ["2021-3-28T03:30:00+02:00", "2021-03-28T03:30:00+0200"]
+
+        expected = [datetime.datetime(2021, 3, 28, 1, 30)] * 2
+
+        self.assertEqual(expected, [parse_timestamp(value) for value in values])
+        np.testing.assert_array_equal(
+            np.array(expected, dtype="datetime64[ns]"), parse_timestamps(values)
+        )
+
+    def test_invalid_dates_raise(self) -> None:
+        for value in (
+            "2021-02-29T00:00:00+01:00",
+            "2021-02-01T00:00:00+01:00Z",
+            "2021-02-01T00:00:00+25:75",
+            "2021-02-01T00:00:00+01:60",
+        ):
+            with self.assertRaises(ValueError):
+                parse_timestamp(value)
+            with self.assertRaises(ValueError):
+                parse_timestamps([value])
@@ -0,0 +1,108 @@
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+
+from stockplot import DeGiroWrapper, Transaction, TransactionFrame
+from stockplot.de_giro_wrapper.degiro_container import de_giro_factory_service
+from stockplot.requests_wrapper.requests_service import requests_service
+from .utils import (
+    get_login_request,
+    get_client_info_request,
+    get_logout_request,
+    get_transactions_request,
+)
+from ...mock_packages.mock_requests import MockJsonResponse, MockRequests
+
+__all__ = ("TestTransactionFrame",)
+
+
+class TestTransactionFrame(TestCase):
+    _rows = [
+        {"id": 7, "productId": 1, "quantity": 3, "date": "2021-03-28T03:30:00+02:00"},
+        {"id": 8, "productId": 2, "quantity": -1, "date": "1970-01-01T01:00:00+01:00"},
+    ]
+
+    def tearDown(self) -> None:
+        requests_service.reset()
+
+    def _start_test(self) -> DeGiroWrapper:
+        factory = de_giro_factory_service.get()
+        return factory().create(user="user", password="pass")
+
+    def test_columns_are_typed_arrays(self) -> None:
+        frame = TransactionFrame.from_payload(self._rows)
+
+        self.assertEqual(np.int64, frame.product_id.dtype)
+        self.assertEqual(np.int64, frame.quantity.dtype)
+        self.assertEqual(np.dtype("datetime64[ns]"), frame.transaction_time.dtype)
+        np.testing.assert_array_equal(
+            np.array(["2021-03-28T01:30", "1970-01-01T00:00"], dtype="datetime64[ns]"),
+            frame.transaction_time,
+        )
+
+    def test_fractional_quantities_become_float(self) -> None:
+        rows = [dict(self._rows[0], quantity=0.5), self._rows[1]]
+
+        frame = TransactionFrame.from_payload(rows)
+
+        self.assertEqual(np.float64, frame.quantity.dtype)
+        self.assertEqual(0.5, frame[0].quantity)
+
+    def test_row_view(self) -> None:
+        frame = TransactionFrame.from_payload(self._rows)
+
+        expected = [
+            Transaction(1, 3, datetime(2021, 3, 28, 1, 30), id=7),
+            Transaction(2, -1, datetime(1970, 1, 1), id=8),
+        ]
+        self.assertEqual(expected, list(frame))
+        self.assertEqual(8, frame[-1].id)
+        self.assertEqual(expected[1:], list(frame[1:]))
+        self.assertEqual(expected[::-1], list(frame.sorted_by_time()))
+
+    def test_round_trip_through_transactions(self) -> None:
+        frame = TransactionFrame.from_payload(self._rows)
+
+        actual = TransactionFrame.from_transactions(list(frame))
+
+        self.assertEqual(list(frame), list(actual))
+        np.testing.assert_array_equal(frame.id, actual.id)
+
+    def test_to_pandas_does_not_copy(self) -> None:
+        frame = TransactionFrame.from_payload(self._rows)
+
+        data_frame = frame.to_pandas()
+
+        self.assertTrue(
+            np.shares_memory(frame.product_id, data_frame["product_id"].to_numpy())
+        )
+        self.assertTrue(
+            np.shares_memory(
+                frame.transaction_time,
+                data_frame["transaction_datetime"].to_numpy(),
+            )
+        )
+
+    def test_get_transaction_frame(self) -> None:
+        start_date = datetime(1970, 1, 1)
+        end_date = datetime(2021, 4, 1)
+        traffic = [
+            get_login_request("user", "pass", "session_id"),
+            get_client_info_request("session_id", 0),
+            get_transactions_request(
+                start_date,
+                end_date,
+                MockJsonResponse(status_code=200, _json={"data": self._rows}),
+            ),
+            get_logout_request("session_id", 0),
+        ]
+        requests_service.overwrite(new=lambda: MockRequests(expected_traffic=traffic))
+
+        with self._start_test() as de_giro:
+            frame = de_giro.get_transaction_frame(
+                start_date=start_date, end_date=end_date
+            )
+
+        self.assertEqual(2, len(frame))
+        np.testing.assert_array_equal(np.array([1, 2]), frame.product_id)
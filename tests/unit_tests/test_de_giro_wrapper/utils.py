@@ -1,11 +1,22 @@
+import json
+import typing
+from datetime import datetime
+
 from ...mock_packages.mock_requests import (
     MockJsonResponse,
     MockTraffic,
     RequestMethod,
     MockResponseWithoutJson,
 )
+from stockplot.requests_wrapper.response_protocol import ResponseProtocol
 
-__all__ = ("get_login_request", "get_logout_request", "get_client_info_request")
+__all__ = (
+    "get_login_request",
+    "get_logout_request",
+    "get_client_info_request",
+    "get_transactions_request",
+    "get_product_info_request",
+)
 
 
 def get_login_request(
@@ -71,3 +82,48 @@ def get_logout_request(session_id: str, account_id: int) -> MockTraffic:
         },
         response=response,
     )
+
+
+def get_transactions_request(
+    start_date: datetime,
+    end_date: datetime,
+    response: ResponseProtocol,
+    session_id: str = "session_id",
+    account_id: int = 0,
+) -> MockTraffic:
+    return MockTraffic(
+        method=RequestMethod.GET,
+        args=tuple(),
+        kwargs={
+            "url": "https://trader.degiro.nl/reporting/secure/v4/transactions",
+            "params": {
+                "fromDate": start_date.strftime("%d/%m/%Y"),
+                "toDate": end_date.strftime("%d/%m/%Y"),
+                "group_transactions_by_order": False,
+                "intAccount": account_id,
+                "sessionId": session_id,
+            },
+            "stream": True,
+        },
+        response=response,
+    )
+
+
+def get_product_info_request(
+    ids: typing.Iterable[int],
+    response: ResponseProtocol,
+    session_id: str = "session_id",
+    account_id: int = 0,
+) -> MockTraffic:
+    return MockTraffic(
+        method=RequestMethod.POST,
+        args=tuple(),
+        kwargs={
+            "url": "https://trader.degiro.nl/product_search/secure/v5/products/info",
+            "headers": {"content-type": "application/json"},
+            "params": {"intAccount": account_id, "sessionId": session_id},
+            "data": json.dumps(list(ids)),
+            "stream": True,
+        },
+        response=response,
+    )
@@ -0,0 +1,114 @@
+import tempfile
+from datetime import date
+from unittest import TestCase
+
+import numpy as np
+
+from stockplot import Currency
+from stockplot.fx import FxRateTable
+from stockplot.prices import PriceCache, PriceSeries
+from ...mock_packages.mock_prices import StaticPriceProvider
+
+__all__ = ("TestFxRateTable",)
+
+
+class TestFxRateTable(TestCase):
+    _days = np.arange("2021-01-01", "2021-01-06", dtype="datetime64[D]")
+
+    def _table(self) -> FxRateTable:
+        table = FxRateTable(base=Currency.EUR)
+        # 2021-01-02 and 2021-01-03 are a weekend without quotes.
+        table.add_series(
+            Currency.USD,
+            np.array(["2021-01-01", "2021-01-04", "2021-01-05"], "datetime64[D]"),
+            np.array([0.8, 0.9, 1.0]),
+        )
+        return table
+
+    def test_rates_are_forward_filled(self) -> None:
+        actual = self._table().rates(Currency.USD, self._days)
+
+        np.testing.assert_array_equal([0.8, 0.8, 0.8, 0.9, 1.0], actual)
+
+    def test_days_before_first_quote_are_unknown(self) -> None:
+        actual = self._table().rates(
+            Currency.USD, np.array(["2020-12-31", "2021-01-01"], "datetime64[D]")
+        )
+
+        np.testing.assert_array_equal([np.nan, 0.8], actual)
+
+    def test_matrix_to_base(self) -> None:
+        values = np.array([[10.0] * 5, [1.0, 2.0, 3.0, 4.0, 5.0], [2.0] * 5])
+
+        actual = self._table().to_base(
+            values, [Currency.USD, Currency.EUR, Currency.USD], self._days
+        )
+
+        np.testing.assert_allclose(
+            np.array(
+                [
+                    [8.0, 8.0, 8.0, 9.0, 10.0],
+                    [1.0, 2.0, 3.0, 4.0, 5.0],
+                    [1.6, 1.6, 1.6, 1.8, 2.0],
+                ]
+            ),
+            actual,
+        )
+
+    def test_convert_between_quoted_currencies(self) -> None:
+        actual = self._table().convert(
+            np.full(5, 9.0), Currency.EUR, Currency.USD, self._days
+        )
+
+        np.testing.assert_allclose([11.25, 11.25, 11.25, 10.0, 9.0], actual)
+
+    def test_from_price_cache(self) -> None:
+        provider = StaticPriceProvider(
+            {
+                "USDEUR=X": PriceSeries(
+                    days=np.array(["2021-01-01", "2021-01-04"], "datetime64[D]"),
+                    close=np.array([0.8, 0.9]),
+                )
+            }
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PriceCache(directory, provider, today=lambda: date(2021, 2, 1))
+            table = FxRateTable.from_price_cache(
+                cache,
+                Currency.EUR,
+                [Currency.USD, Currency.EUR],
+                date(2021, 1, 1),
+                date(2021, 1, 5),
+            )
+
+        np.testing.assert_array_equal(
+            [0.8, 0.8, 0.8, 0.9, 0.9], table.rates(Currency.USD, self._days)
+        )
+
+    def test_pence_follow_the_pound(self) -> None:
+        provider = StaticPriceProvider(
+            {
+                "GBPEUR=X": PriceSeries(
+                    days=np.array(["2021-01-01", "2021-01-04"], "datetime64[D]"),
+                    close=np.array([1.1, 1.2]),
+                )
+            }
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            cache = PriceCache(directory, provider, today=lambda: date(2021, 2, 1))
+            table = FxRateTable.from_price_cache(
+                cache, Currency.EUR, [Currency.GBX], date(2021, 1, 1), date(2021, 1, 5)
+            )
+
+        # A London listing quoted at 2500p is worth 25 GBP.
+        actual = table.to_base(
+            np.full((2, 5), 2500.0), [Currency.GBX, Currency.EUR], self._days
+        )
+
+        np.testing.assert_allclose(
+            [[27.5, 27.5, 27.5, 30.0, 30.0], [2500.0] * 5], actual
+        )
+        pound = FxRateTable(base=Currency.GBP)
+        np.testing.assert_allclose(
+            np.full(5, 0.01), pound.rates(Currency.GBX, self._days)
+        )
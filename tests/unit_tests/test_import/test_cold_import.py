@@ -0,0 +1,55 @@
+import subprocess
+import sys
+from unittest import TestCase
+
+import stockplot
+import stockplot.de_giro_wrapper
+
+__all__ = ("TestColdImport",)
+
+# Cumulative microseconds for `import stockplot` as reported by -X importtime.
+_BUDGET_US = 50_000
+_HEAVY_MODULES = ("matplotlib", "numpy", "pandas", "pytz", "requests")
+
+
+def _run(code: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+
+class TestColdImport(TestCase):
+    def test_import_stays_within_budget(self) -> None:
+        result = _run("import stockplot")
+
+        cumulative = [
+            int(line.split("|")[1])
+            for line in result.stderr.splitlines()
+            if line.split("|")[-1].strip() == "stockplot"
+        ]
+        self.assertEqual(1, len(cumulative), result.stderr)
+        self.assertLess(cumulative[0], _BUDGET_US)
+
+    def test_heavy_dependencies_load_on_first_use(self) -> None:
+        result = _run(
+            "import sys, stockplot\n"
+            "from stockplot import Currency, Transaction\n"
+            f"print(','.join(m for m in {_HEAVY_MODULES!r} if m in sys.modules))\n"
+        )
+        self.assertEqual("", result.stdout.strip())
+
+    def test_public_names_resolve(self) -> None:
+        for package in (stockplot, stockplot.de_giro_wrapper):
+            for name in package.__all__:
+                self.assertIs(
+                    getattr(package, name),
+                    getattr(package, name),
+                    f"{package.__name__}.{name}",
+                )
+            self.assertLessEqual(set(package.__all__), set(dir(package)))
+
+        with self.assertRaises(AttributeError):
+            stockplot.Missing
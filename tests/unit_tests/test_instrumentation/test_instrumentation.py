@@ -0,0 +1,205 @@
+import json
+import os
+import tempfile
+from datetime import datetime
+from unittest import TestCase
+
+from stockplot.de_giro_wrapper.degiro_container import de_giro_factory_service
+from stockplot.instrumentation import (
+    JsonLinesSink,
+    MemorySink,
+    MetricsRecorder,
+    PrometheusTextSink,
+    recorder_service,
+    use_instrumentation,
+)
+from stockplot.requests_wrapper.requests_service import requests_service
+from stockplot.requests_wrapper.throttled_requests import RetryPolicy, ThrottledRequests
+from stockplot.storage import ProductInfoCache
+from ..test_de_giro_wrapper.utils import (
+    get_client_info_request,
+    get_login_request,
+    get_logout_request,
+    get_transactions_request,
+)
+from ...mock_packages.mock_requests import MockJsonResponse, MockRequests, MockTraffic
+
+__all__ = ("TestInstrumentation", "TestSinks")
+
+_TRANSACTIONS = "/reporting/secure/v4/transactions"
+
+
+class TestInstrumentation(TestCase):
+    def tearDown(self) -> None:
+        requests_service.reset()
+        recorder_service.reset()
+
+    def test_disabled_by_default(self) -> None:
+        self.assertFalse(recorder_service.get()().enabled)
+
+    def test_requests_are_measured_per_endpoint(self) -> None:
+        start, end = datetime(2021, 1, 1), datetime(2021, 2, 1)
+        response = MockJsonResponse(
+            status_code=200,
+            _json={
+                "data": [
+                    {"productId": 1, "quantity": 2, "date": "2021-01-04T10:00:00+01:00"}
+                ]
+            },
+        )
+        traffic = [
+            get_login_request("user", "pass", "session_id"),
+            get_client_info_request("session_id", 0),
+            get_transactions_request(start, end, response),
+            get_logout_request("session_id", 0),
+        ]
+        requests_service.overwrite(new=lambda: MockRequests(expected_traffic=traffic))
+        recorder = use_instrumentation()
+
+        with de_giro_factory_service.get()().create("user", "pass") as de_giro:
+            de_giro.get_transactions(start, end)
+
+        transactions = {"method": "GET", "endpoint": _TRANSACTIONS}
+        self.assertEqual(
+            1, recorder.counter("http_responses_total", status="200", **transactions)
+        )
+        self.assertEqual(
+            len(json.dumps(response.json())),
+            recorder.counter("http_response_bytes_total", **transactions),
+        )
+        self.assertEqual(
+            1,
+            recorder.counter(
+                "http_responses_total",
+                status="200",
+                method="GET",
+                endpoint="/trading/secure/logout",
+            ),
+        )
+
+        histograms = {
+            (sample.name, dict(sample.labels)["endpoint"]): sample
+            for sample in recorder.snapshot().histograms
+        }
+        for name in ("http_request_seconds", "http_read_seconds", "http_parse_seconds"):
+            self.assertEqual(1, histograms[(name, _TRANSACTIONS)].count)
+        self.assertEqual(
+            1, histograms[("http_request_seconds", "/login/secure/login")].count
+        )
+
+    def test_repeated_calls_instrument_once(self) -> None:
+        login = get_login_request("user", "pass", "session_id")
+        base = MockRequests([login, login])
+        requests_service.overwrite(new=lambda: base)
+
+        recorder = use_instrumentation()
+        use_instrumentation(recorder)
+        requests_service.get()().post(**login.kwargs)
+
+        self.assertEqual(
+            1,
+            recorder.counter(
+                "http_responses_total",
+                status="200",
+                method="POST",
+                endpoint="/login/secure/login",
+            ),
+        )
+
+    def test_scoped_override_is_not_captured(self) -> None:
+        login = get_login_request("user", "pass", "session_id")
+        base = MockRequests([login])
+        requests_service.overwrite(new=lambda: base)
+        scoped = MockRequests([])
+
+        with requests_service.override(lambda: scoped):
+            use_instrumentation()
+            self.assertIs(scoped, requests_service.get()())
+
+        requests_service.get()().post(**login.kwargs)
+
+    def test_retries_and_cache_hits_are_counted(self) -> None:
+        recorder = MetricsRecorder()
+        recorder_service.overwrite(new=lambda: recorder)
+
+        login = get_login_request("user", "pass", "session_id")
+        unavailable = MockTraffic(
+            method=login.method,
+            args=(),
+            kwargs=login.kwargs,
+            response=MockJsonResponse(status_code=503, _json={}),
+        )
+        requests = ThrottledRequests(
+            MockRequests([unavailable, login]),
+            retry=RetryPolicy(attempts=2),
+            sleep=lambda delay: None,
+        )
+        requests.post(**login.kwargs)
+        self.assertEqual(
+            1, recorder.counter("http_retries_total", endpoint="/login/secure/login")
+        )
+
+        with ProductInfoCache() as cache:
+            cache.get({1, 2}, lambda ids: {})
+            cache.get({1}, lambda ids: {})
+        self.assertEqual(
+            3, recorder.counter("cache_misses_total", cache="product_info")
+        )
+
+
+class TestSinks(TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self._recorder = MetricsRecorder(buckets=(0.1, 1.0), clock=lambda: 10.0)
+        self._recorder.increment("http_responses_total", status="200", endpoint="/a")
+        self._recorder.observe("http_request_seconds", 0.05, endpoint="/a")
+        self._recorder.observe("http_request_seconds", 0.5, endpoint="/a")
+        self._recorder.observe("http_request_seconds", 5.0, endpoint="/a")
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def test_memory_sink(self) -> None:
+        sink = MemorySink()
+        self._recorder.export(sink)
+        self.assertEqual((1, 1, 1), sink.snapshots[0].histograms[0].counts)
+
+    def test_json_lines_sink(self) -> None:
+        path = os.path.join(self._directory.name, "metrics.jsonl")
+        self._recorder.export(JsonLinesSink(path))
+        self._recorder.export(JsonLinesSink(path))
+
+        with open(path) as file:
+            lines = [json.loads(line) for line in file]
+        self.assertEqual(4, len(lines))
+        self.assertEqual(
+            {
+                "time": 10.0,
+                "type": "counter",
+                "name": "http_responses_total",
+                "labels": {"endpoint": "/a", "status": "200"},
+                "value": 1.0,
+            },
+            lines[0],
+        )
+        self.assertEqual(3, lines[1]["count"])
+
+    def test_prometheus_text_sink(self) -> None:
+        path = os.path.join(self._directory.name, "stockplot.prom")
+        self._recorder.export(PrometheusTextSink(path))
+
+        with open(path) as file:
+            text = file.read().splitlines()
+        self.assertEqual(
+            [
+                "# TYPE stockplot_http_responses_total counter",
+                'stockplot_http_responses_total{endpoint="/a",status="200"} 1.0',
+                "# TYPE stockplot_http_request_seconds histogram",
+                'stockplot_http_request_seconds_bucket{endpoint="/a",le="0.1"} 1',
+                'stockplot_http_request_seconds_bucket{endpoint="/a",le="1.0"} 2',
+                'stockplot_http_request_seconds_bucket{endpoint="/a",le="+Inf"} 3',
+                'stockplot_http_request_seconds_sum{endpoint="/a"} 5.55',
+                'stockplot_http_request_seconds_count{endpoint="/a"} 3',
+            ],
+            text,
+        )
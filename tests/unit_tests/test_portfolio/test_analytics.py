@@ -0,0 +1,146 @@
+from datetime import date, datetime
+from unittest import TestCase
+
+import numpy as np
+
+from stockplot import Currency, Transaction
+from stockplot.fx import FxRateTable
+from stockplot.portfolio import PortfolioAnalytics, PortfolioEngine
+from stockplot.prices import PriceMatrix
+
+__all__ = ("TestPortfolioAnalytics",)
+
+
+class TestPortfolioAnalytics(TestCase):
+    _transactions = [
+        Transaction(10, 10, datetime(2021, 1, 1, 9), id=1),
+        Transaction(10, 10, datetime(2021, 1, 2, 9), id=2),
+        Transaction(20, 5, datetime(2021, 1, 2, 9), id=3),
+        Transaction(10, -15, datetime(2021, 1, 4, 9), id=4),
+    ]
+    # Rows follow engine.product_ids ([10, 20]), columns 2021-01-01..04.
+    _prices = np.array(
+        [
+            [10.0, 12.0, 11.0, 15.0],
+            [np.nan, 20.0, 22.0, 21.0],
+        ]
+    )
+
+    def _analytics(self) -> PortfolioAnalytics:
+        return PortfolioAnalytics(PortfolioEngine(self._transactions))
+
+    def test_market_value_and_flows(self) -> None:
+        series = self._analytics().series(self._prices, prices_version=1)
+
+        np.testing.assert_allclose([100, 340, 330, 180], series.value)
+        np.testing.assert_allclose([100, 220, 0, -225], series.flows)
+        np.testing.assert_allclose(
+            [[100, 240, 220, 75], [0, 100, 110, 105]], series.market_value
+        )
+
+    def test_time_weighted_return_and_contribution(self) -> None:
+        series = self._analytics().series(self._prices, prices_version=1)
+        expected = np.array([0.0, 0.2, -10 / 340, 75 / 330])
+
+        np.testing.assert_allclose(expected, series.daily_returns)
+        np.testing.assert_allclose(expected, series.daily_contribution.sum(axis=0))
+
+        window = series.window()
+        np.testing.assert_allclose(
+            np.cumprod(1 + expected) - 1, window.time_weighted_return
+        )
+        self.assertAlmostEqual(-10 / 340, window.max_drawdown)
+        np.testing.assert_allclose(
+            series.daily_contribution[:, 1:].sum(axis=1), window.contribution
+        )
+
+    def test_fifo_profit_and_loss(self) -> None:
+        window = self._analytics().window(self._prices, prices_version=1)
+
+        # 15 sold at 15: the first lot of 10 cost 10, five of the second cost 12.
+        np.testing.assert_allclose([225 - 100 - 60, 0], window.realized_pnl)
+        np.testing.assert_allclose([75 - 60, 105 - 100], window.unrealized_pnl)
+
+        earlier = self._analytics().window(
+            self._prices, 1, start=date(2021, 1, 1), end=date(2021, 1, 3)
+        )
+        np.testing.assert_allclose([0, 0], earlier.realized_pnl)
+        np.testing.assert_allclose([220 - 220, 110 - 100], earlier.unrealized_pnl)
+
+    def test_money_weighted_return(self) -> None:
+        engine = PortfolioEngine([Transaction(10, 1, datetime(2021, 1, 1), id=1)])
+        engine.extend_to(date(2022, 1, 1))
+        prices = np.linspace(100.0, 110.0, len(engine.days))[np.newaxis, :]
+
+        window = PortfolioAnalytics(engine).window(prices, prices_version="a")
+
+        self.assertAlmostEqual(0.1, window.money_weighted_return, places=6)
+        self.assertAlmostEqual(0.1, window.time_weighted_return[-1], places=9)
+
+    def test_windows_reuse_cached_series(self) -> None:
+        analytics = self._analytics()
+        series = analytics.series(self._prices, prices_version=1)
+
+        self.assertIs(series, analytics.series(self._prices, prices_version=1))
+        self.assertIsNot(series, analytics.series(self._prices, prices_version=2))
+
+        analytics.engine.add([Transaction(20, 1, datetime(2021, 1, 4), id=5)])
+        self.assertIsNot(series, analytics.series(self._prices, prices_version=1))
+
+    def test_extending_days_invalidates_cached_series(self) -> None:
+        engine = PortfolioEngine([Transaction(10, 1, datetime(2021, 1, 1), id=1)])
+        analytics = PortfolioAnalytics(engine)
+        series = analytics.series(np.ones((1, 1)), prices_version=1)
+
+        engine.extend_to(date(2021, 1, 10))
+        extended = analytics.series(np.ones((1, 10)), prices_version=1)
+
+        self.assertIsNot(series, extended)
+        self.assertEqual((10,), extended.value.shape)
+        # Extending to a day already covered changes nothing.
+        engine.extend_to(date(2021, 1, 5))
+        self.assertIs(extended, analytics.series(np.ones((1, 10)), prices_version=1))
+
+    def test_align_prices_fills_forward_and_converts(self) -> None:
+        analytics = self._analytics()
+        matrix = PriceMatrix(
+            symbols=["AAA", "BBB"],
+            days=np.arange("2020-12-31", "2021-01-04", dtype="datetime64[D]"),
+            values=np.array([[9.0, 10.0, np.nan, 11.0], [1.0, 2.0, 3.0, 4.0]]),
+        )
+        fx = FxRateTable(base=Currency.EUR)
+        fx.add_series(
+            Currency.USD, np.array(["2021-01-01"], dtype="datetime64[D]"), [0.5]
+        )
+
+        prices = analytics.align_prices(
+            matrix,
+            {10: "AAA", 20: "BBB"},
+            fx=fx,
+            currencies={10: Currency.EUR, 20: Currency.USD},
+        )
+
+        np.testing.assert_allclose(
+            [[10.0, 10.0, 11.0, 11.0], [1.0, 1.5, 2.0, 2.0]], prices
+        )
+
+    def test_align_prices_converts_london_listings_from_pence(self) -> None:
+        analytics = self._analytics()
+        matrix = PriceMatrix(
+            symbols=["AAA", "VOD.L"],
+            days=np.arange("2021-01-01", "2021-01-05", dtype="datetime64[D]"),
+            values=np.array([[10.0] * 4, [7000.0, 7100.0, 7200.0, 7300.0]]),
+        )
+        fx = FxRateTable(base=Currency.EUR)
+        fx.add_series(
+            Currency.GBP, np.array(["2021-01-01"], dtype="datetime64[D]"), [1.1]
+        )
+
+        prices = analytics.align_prices(
+            matrix,
+            {10: "AAA", 20: "VOD.L"},
+            fx=fx,
+            currencies={10: Currency.EUR, 20: Currency.GBX},
+        )
+
+        np.testing.assert_allclose([77.0, 78.1, 79.2, 80.3], prices[1])
@@ -0,0 +1,89 @@
+from datetime import date, datetime
+from unittest import TestCase
+
+import numpy as np
+
+from stockplot import Transaction
+from stockplot.portfolio import PortfolioEngine
+
+__all__ = ("TestPortfolioEngine",)
+
+
+class TestPortfolioEngine(TestCase):
+    _transactions = [
+        Transaction(10, 5, datetime(2021, 1, 1, 9), id=1),
+        Transaction(20, 2, datetime(2021, 1, 2, 9), id=2),
+        Transaction(10, -3, datetime(2021, 1, 4, 12), id=3),
+    ]
+
+    def test_dense_holdings_matrix(self) -> None:
+        engine = PortfolioEngine(self._transactions)
+
+        np.testing.assert_array_equal(np.array([10, 20]), engine.product_ids)
+        np.testing.assert_array_equal(
+            np.arange("2021-01-01", "2021-01-05", dtype="datetime64[D]"), engine.days
+        )
+        np.testing.assert_array_equal(
+            np.array([[5, 5, 5, 2], [0, 2, 2, 2]]), engine.holdings
+        )
+
+    def test_point_in_time_lookups(self) -> None:
+        engine = PortfolioEngine(self._transactions)
+
+        np.testing.assert_array_equal(
+            [5, 2], engine.holdings_at(datetime(2021, 1, 4, 11))
+        )
+        np.testing.assert_array_equal(
+            [2, 2], engine.holdings_at(datetime(2021, 1, 4, 12))
+        )
+        np.testing.assert_array_equal([0, 0], engine.holdings_on(date(2020, 12, 31)))
+        np.testing.assert_array_equal([2, 2], engine.holdings_on(date(2022, 1, 1)))
+        self.assertEqual(5.0, engine.position(10, datetime(2021, 1, 4)))
+        self.assertEqual(0.0, engine.position(99, datetime(2021, 1, 4)))
+
+    def test_incremental_updates_match_full_build(self) -> None:
+        late = [
+            Transaction(30, 1, datetime(2021, 1, 6), id=4),
+            Transaction(20, -2, datetime(2021, 1, 3), id=5),
+            Transaction(10, 1, datetime(2020, 12, 30), id=6),
+        ]
+
+        engine = PortfolioEngine(self._transactions)
+        version = engine.version
+        engine.add(late)
+        engine.add(self._transactions[:1])
+
+        full = PortfolioEngine(self._transactions + late)
+        self.assertEqual(version + 1, engine.version)
+        np.testing.assert_array_equal(full.days, engine.days)
+        for product_id in (10, 20, 30):
+            np.testing.assert_array_equal(
+                full.holdings[full.row(product_id)],
+                engine.holdings[engine.row(product_id)],
+            )
+
+    def test_extend_to_carries_last_position(self) -> None:
+        engine = PortfolioEngine(self._transactions)
+
+        engine.extend_to(date(2021, 1, 6))
+
+        np.testing.assert_array_equal([2, 2], engine.holdings[:, -1])
+        self.assertEqual(6, len(engine.days))
+
+    def test_copy_is_independent(self) -> None:
+        engine = PortfolioEngine(self._transactions)
+        copy = engine.copy()
+
+        copy.add([Transaction(10, 1, datetime(2021, 1, 3, 9), id=4)])
+        copy.add([Transaction(30, 1, datetime(2021, 1, 3, 9), id=5)])
+
+        np.testing.assert_array_equal(
+            np.array([[5, 5, 5, 2], [0, 2, 2, 2]]), engine.holdings
+        )
+        np.testing.assert_array_equal(np.array([10, 20]), engine.product_ids)
+        np.testing.assert_array_equal(np.array([10, 20, 30]), copy.product_ids)
+        self.assertEqual(6.0, copy.holdings_on(date(2021, 1, 3))[0])
+        # A transaction seen only by the copy is still new to the original.
+        self.assertEqual(
+            1, engine.add([Transaction(10, 1, datetime(2021, 1, 3), id=4)])
+        )
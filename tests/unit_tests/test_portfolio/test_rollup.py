@@ -0,0 +1,134 @@
+from datetime import date, datetime
+from unittest import TestCase
+
+import numpy as np
+
+from stockplot import Transaction
+from stockplot.portfolio import PortfolioAnalytics, PortfolioEngine, RollupIndex
+
+__all__ = ("TestRollupIndex",)
+
+
+class TestRollupIndex(TestCase):
+    # Weekdays from Monday 2020-12-28 to Friday 2022-01-07, with a gap.
+    _days = np.array(
+        [
+            day
+            for day in np.arange(
+                np.datetime64("2020-12-28"), np.datetime64("2022-01-08")
+            )
+            if (day.astype(np.int64) + 3) % 7 < 5
+            and not np.datetime64("2021-03-01") <= day <= np.datetime64("2021-03-05")
+        ]
+    )
+
+    def _values(self) -> np.ndarray:
+        values = np.vstack(
+            [
+                np.arange(len(self._days), dtype=np.float64),
+                np.sin(np.arange(len(self._days))),
+            ]
+        )
+        values[1, 3] = np.nan
+        return values
+
+    def _expected(self, days: np.ndarray, values: np.ndarray, starts: np.ndarray):
+        bounds = np.append(starts, days[-1] + 1)
+        for column in range(len(starts)):
+            inside = (days >= bounds[column]) & (days < bounds[column + 1])
+            yield column, values[:, inside]
+
+    def test_levels_follow_calendar_buckets(self) -> None:
+        index = RollupIndex(self._days, self._values())
+
+        weeks = index.level("week")
+        self.assertEqual(np.datetime64("2020-12-28"), weeks.starts[0])
+        self.assertEqual(0.0, weeks.first[0, 0])
+        self.assertEqual(4.0, weeks.last[0, 0])
+        self.assertEqual(2.0, weeks.mean[0, 0])
+        # The missing value is skipped rather than poisoning the week.
+        self.assertAlmostEqual(
+            np.nanmean(self._values()[1, :5]), float(weeks.mean[1, 0])
+        )
+
+        years = index.level("year")
+        np.testing.assert_array_equal(
+            np.array(["2020-01-01", "2021-01-01", "2022-01-01"], "datetime64[D]"),
+            years.starts,
+        )
+        np.testing.assert_array_equal([0.0, 4.0, 260.0], years.min[0])
+        np.testing.assert_array_equal([3.0, 259.0, 264.0], years.max[0])
+
+    def test_appending_days_matches_a_full_build(self) -> None:
+        values = self._values()
+        built = RollupIndex(self._days, values)
+        grown = RollupIndex(series=2)
+        for start in range(0, len(self._days), 17):
+            grown.append(self._days[start : start + 17], values[:, start : start + 17])
+
+        for level in ("day", "week", "month", "year"):
+            expected, actual = built.level(level), grown.level(level)
+            np.testing.assert_array_equal(expected.starts, actual.starts)
+            for stat in ("first", "last", "min", "max"):
+                np.testing.assert_array_equal(
+                    getattr(expected, stat), getattr(actual, stat)
+                )
+            # Sums are accumulated in a different order.
+            np.testing.assert_allclose(expected.mean, actual.mean)
+
+        with self.assertRaises(ValueError):
+            grown.append(self._days[-1:], values[:, -1:])
+
+    def test_window_uses_the_coarsest_detailed_level(self) -> None:
+        index = RollupIndex(self._days, self._values())
+
+        self.assertEqual("month", index.window(width=12).level)
+        self.assertEqual("week", index.window(width=40).level)
+        self.assertEqual("day", index.window(width=1000).level)
+        self.assertEqual("year", index.window(width=2).level)
+
+    def test_window_edges_only_cover_days_inside_it(self) -> None:
+        index = RollupIndex(self._days, self._values())
+        start, end = date(2021, 2, 17), date(2021, 9, 8)
+
+        window = index.window(start, end, width=6)
+
+        self.assertEqual("month", window.level)
+        self.assertEqual(np.datetime64("2021-02-17"), window.starts[0])
+        inside = (self._days >= np.datetime64(start)) & (
+            self._days <= np.datetime64(end)
+        )
+        days, values = self._days[inside], self._values()[:, inside]
+        for column, expected in self._expected(days, values, window.starts):
+            np.testing.assert_array_equal(expected[:, 0], window.first[:, column])
+            np.testing.assert_array_equal(expected[:, -1], window.last[:, column])
+            np.testing.assert_array_equal(expected.min(axis=1), window.min[:, column])
+            np.testing.assert_array_equal(expected.max(axis=1), window.max[:, column])
+            np.testing.assert_allclose(expected.mean(axis=1), window.mean[:, column])
+
+    def test_window_inside_a_gap_is_empty(self) -> None:
+        index = RollupIndex(self._days, self._values())
+
+        window = index.window(date(2021, 3, 1), date(2021, 3, 5), width=10)
+
+        self.assertEqual(0, len(window.starts))
+        self.assertEqual((2, 0), window.mean.shape)
+
+    def test_from_analytics_stacks_total_and_products(self) -> None:
+        engine = PortfolioEngine(
+            [
+                Transaction(10, 2, datetime(2021, 1, 1, 9), id=1),
+                Transaction(20, 1, datetime(2021, 1, 3, 9), id=2),
+            ]
+        )
+        series = PortfolioAnalytics(engine).series(
+            np.array([[1.0, 2.0, 3.0], [5.0, 5.0, 5.0]]), prices_version=1
+        )
+
+        index = RollupIndex.from_analytics(series)
+
+        self.assertEqual(3, index.series)
+        # All three days fall in the week of Monday 2020-12-28.
+        window = index.level("week")
+        np.testing.assert_array_equal([2.0, 2.0, 0.0], window.first[:, 0])
+        np.testing.assert_array_equal([11.0, 6.0, 5.0], window.last[:, 0])
@@ -0,0 +1,93 @@
+import tempfile
+from datetime import date
+from unittest import TestCase
+
+import numpy as np
+
+from stockplot.prices import PriceCache, PriceSeries
+from ...mock_packages.mock_prices import StaticPriceProvider
+
+__all__ = ("TestPriceCache",)
+
+
+def _weekday_series(start: str, end: str, offset: float) -> PriceSeries:
+    days = np.arange(start, end, dtype="datetime64[D]")
+    days = days[np.is_busday(days)]
+    return PriceSeries(days=days, close=np.arange(len(days)) + offset)
+
+
+class TestPriceCache(TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self._provider = StaticPriceProvider(
+            {
+                "AAA": _weekday_series("2020-01-01", "2021-01-01", 100.0),
+                "BBB": _weekday_series("2020-01-01", "2021-01-01", 10.0),
+            }
+        )
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _cache(self) -> PriceCache:
+        return PriceCache(
+            directory=self._directory.name,
+            provider=self._provider,
+            today=lambda: date(2021, 6, 1),
+        )
+
+    def test_only_missing_ranges_are_fetched(self) -> None:
+        self._cache().get_many(["AAA", "BBB"], date(2020, 3, 1), date(2020, 3, 31))
+        self._cache().get_many(["AAA", "BBB"], date(2020, 2, 1), date(2020, 4, 30))
+        self._cache().get_many(["AAA", "BBB"], date(2020, 3, 2), date(2020, 4, 1))
+
+        self.assertEqual(
+            [
+                {
+                    "AAA": (date(2020, 3, 1), date(2020, 3, 31)),
+                    "BBB": (date(2020, 3, 1), date(2020, 3, 31)),
+                },
+                {
+                    "AAA": (date(2020, 2, 1), date(2020, 2, 29)),
+                    "BBB": (date(2020, 2, 1), date(2020, 2, 29)),
+                },
+                {
+                    "AAA": (date(2020, 4, 1), date(2020, 4, 30)),
+                    "BBB": (date(2020, 4, 1), date(2020, 4, 30)),
+                },
+            ],
+            self._provider.calls,
+        )
+
+    def test_cached_series_matches_source(self) -> None:
+        expected = _weekday_series("2020-01-01", "2021-01-01", 100.0).between(
+            np.datetime64("2020-02-01"), np.datetime64("2020-04-30")
+        )
+
+        self._cache().get("AAA", date(2020, 3, 1), date(2020, 3, 31))
+        actual = self._cache().get("AAA", date(2020, 2, 1), date(2020, 4, 30))
+
+        np.testing.assert_array_equal(expected.days, actual.days)
+        np.testing.assert_array_equal(expected.close, actual.close)
+
+    def test_unsettled_days_are_refetched(self) -> None:
+        self._cache().get("AAA", date(2021, 5, 1), date(2021, 6, 1))
+        self._cache().get("AAA", date(2021, 5, 1), date(2021, 6, 1))
+
+        self.assertEqual(
+            (date(2021, 6, 1), date(2021, 6, 1)), self._provider.calls[1]["AAA"]
+        )
+
+    def test_matrix_is_aligned_and_forward_filled(self) -> None:
+        prices = self._cache().get_many(
+            ["AAA", "BBB"], date(2020, 1, 3), date(2020, 1, 6)
+        )
+
+        matrix = prices.matrix()
+        filled = matrix.forward_filled()
+
+        np.testing.assert_array_equal(
+            np.arange("2020-01-03", "2020-01-07", dtype="datetime64[D]"), matrix.days
+        )
+        np.testing.assert_array_equal([102, np.nan, np.nan, 103], matrix.row("AAA"))
+        np.testing.assert_array_equal([12, 12, 12, 13], filled.row("BBB"))
@@ -0,0 +1,122 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from stockplot.rendering import (
+    AllocationChart,
+    ChartRenderer,
+    RenderJob,
+    ReturnsChart,
+    ValueChart,
+    downsample,
+)
+
+__all__ = ("TestChartRenderer", "TestDownsample")
+
+_DAYS = np.arange("2020-01-01", "2021-01-01", dtype="datetime64[D]")
+
+
+class TestDownsample(TestCase):
+    def test_keeps_extremes_of_each_pixel(self) -> None:
+        x = np.arange(10_000)
+        y = np.sin(x / 50.0)
+        y[5_000] = 3.0
+        y[7_000] = np.nan
+
+        small_x, small_y = downsample(x, y, width=100)
+
+        self.assertLessEqual(len(small_x), 400)
+        self.assertEqual(3.0, np.nanmax(small_y))
+        self.assertEqual(np.nanmin(y), np.nanmin(small_y))
+        self.assertEqual((0, 9_999), (small_x[0], small_x[-1]))
+        self.assertTrue((np.diff(small_x) > 0).all())
+
+    def test_short_series_are_untouched(self) -> None:
+        x, y = downsample(np.arange(10), np.arange(10.0), width=100)
+        np.testing.assert_array_equal(np.arange(10), x)
+
+
+class TestChartRenderer(TestCase):
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._directory.name, name)
+
+    def test_skips_figures_with_unchanged_inputs(self) -> None:
+        renderer = ChartRenderer(max_workers=1)
+        job = RenderJob(
+            ValueChart(_DAYS, np.arange(len(_DAYS), dtype=float)),
+            self._path("value.png"),
+            width=300,
+            height=200,
+        )
+
+        self.assertTrue(renderer.render(job).rendered)
+        with open(job.path, "rb") as file:
+            self.assertEqual(b"\x89PNG", file.read(4))
+        self.assertFalse(renderer.render(job).rendered)
+
+        changed = RenderJob(
+            ValueChart(_DAYS, np.ones(len(_DAYS))), job.path, width=300, height=200
+        )
+        self.assertTrue(renderer.render(changed).rendered)
+
+    def test_renders_many_on_a_process_pool(self) -> None:
+        value = np.cumsum(np.ones((2, len(_DAYS))), axis=1)
+        jobs = [
+            RenderJob(
+                ValueChart(_DAYS, value.sum(axis=0)),
+                self._path("a/value.png"),
+                300,
+                200,
+            ),
+            RenderJob(
+                AllocationChart(_DAYS, ("AAA", "BBB"), value),
+                self._path("a/allocation.svg"),
+                300,
+                200,
+            ),
+            RenderJob(
+                ReturnsChart(_DAYS, np.zeros(len(_DAYS)), np.zeros(len(_DAYS))),
+                self._path("a/returns.png"),
+                300,
+                200,
+            ),
+        ]
+        renderer = ChartRenderer(max_workers=2)
+
+        results = renderer.render_many(jobs)
+        self.assertEqual(
+            [job.path for job in jobs], [result.path for result in results]
+        )
+        self.assertTrue(all(result.rendered for result in results))
+        with open(jobs[1].path) as file:
+            self.assertIn("<svg", file.read())
+
+        self.assertFalse(any(result.rendered for result in renderer.render_many(jobs)))
+
+    def test_rejects_unknown_formats(self) -> None:
+        job = RenderJob(ValueChart(_DAYS, np.ones(len(_DAYS))), self._path("value.gif"))
+        with self.assertRaises(ValueError):
+            ChartRenderer().render(job)
+
+    def test_rendering_does_not_load_gui_toolkits(self) -> None:
+        script = (
+            "import sys, numpy as np\n"
+            "from stockplot.rendering import ChartRenderer, RenderJob, ValueChart\n"
+            "days = np.arange('2020-01-01', '2020-02-01', dtype='datetime64[D]')\n"
+            f"job = RenderJob(ValueChart(days, np.ones(len(days))), {self._path('x.png')!r})\n"
+            "ChartRenderer().render(job)\n"
+            "loaded = [name for name in sys.modules if name.split('.')[0] in "
+            "('PyQt5', 'PySide2', 'tkinter') or name == 'matplotlib.pyplot']\n"
+            "assert not loaded, loaded\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
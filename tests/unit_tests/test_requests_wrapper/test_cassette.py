@@ -0,0 +1,117 @@
+import os
+import tempfile
+import zlib
+from datetime import datetime
+from unittest import TestCase
+
+from stockplot import Transaction
+from stockplot.de_giro_wrapper.degiro_container import de_giro_factory_service
+from stockplot.requests_wrapper.cassette import (
+    CassetteMiss,
+    CassettePlayer,
+    record_cassette,
+    replay_cassette,
+)
+from stockplot.requests_wrapper.requests_service import requests_service
+from ..test_de_giro_wrapper.utils import (
+    get_client_info_request,
+    get_login_request,
+    get_logout_request,
+    get_transactions_request,
+)
+from ...mock_packages.mock_requests import MockJsonResponse, MockRequests
+
+__all__ = ("TestCassette",)
+
+
+class TestCassette(TestCase):
+    _windows = [
+        (datetime(2021, 1, 1), datetime(2021, 2, 1)),
+        (datetime(2021, 2, 1), datetime(2021, 3, 1)),
+    ]
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, "session.cassette")
+
+    def tearDown(self) -> None:
+        requests_service.reset()
+        self._directory.cleanup()
+
+    @staticmethod
+    def _response(product_id: int) -> MockJsonResponse:
+        return MockJsonResponse(
+            status_code=200,
+            _json={
+                "data": [
+                    {
+                        "id": product_id,
+                        "productId": product_id,
+                        "quantity": 1,
+                        "date": "2021-01-04T10:00:00+01:00",
+                    }
+                ]
+            },
+        )
+
+    def _session(self):
+        with de_giro_factory_service.get()().create(
+            "secret-user", "hunter2"
+        ) as de_giro:
+            return [
+                de_giro.get_transactions(start, end) for start, end in self._windows
+            ]
+
+    def _record(self):
+        traffic = [
+            get_login_request("secret-user", "hunter2", "live-session"),
+            get_client_info_request("live-session", 7),
+            *(
+                get_transactions_request(
+                    start, end, self._response(index), "live-session", 7
+                )
+                for index, (start, end) in enumerate(self._windows)
+            ),
+            get_logout_request("live-session", 7),
+        ]
+        requests_service.overwrite(new=lambda: MockRequests(expected_traffic=traffic))
+        with record_cassette(self._path):
+            recorded = self._session()
+        requests_service.reset()
+        return recorded
+
+    def test_replays_a_recorded_session(self) -> None:
+        recorded = self._record()
+
+        with replay_cassette(self._path) as player:
+            replayed = self._session()
+            self.assertEqual(5, len(player))
+
+        self.assertEqual(recorded, replayed)
+        self.assertEqual(
+            [Transaction(0, 1, datetime(2021, 1, 4, 9, 0))],
+            replayed[0],
+        )
+
+    def test_credentials_are_redacted(self) -> None:
+        self._record()
+
+        with open(self._path, "rb") as file:
+            raw = file.read()
+        with CassettePlayer(self._path) as player:
+            bodies = b"".join(
+                zlib.decompress(raw[int(entry["offset"]) :][: int(entry["length"])])
+                for entry in player._index
+            )
+
+        for secret in (b"hunter2", b"secret-user", b"live-session"):
+            self.assertNotIn(secret, raw)
+            self.assertNotIn(secret, bodies)
+
+    def test_unrecorded_requests_miss(self) -> None:
+        self._record()
+
+        with replay_cassette(self._path):
+            with self.assertRaises(CassetteMiss):
+                with de_giro_factory_service.get()().create("user", "pass") as de_giro:
+                    de_giro.get_transactions(datetime(2020, 1, 1), datetime(2020, 2, 1))
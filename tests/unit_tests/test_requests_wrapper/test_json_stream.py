@@ -0,0 +1,113 @@
+import json
+import tracemalloc
+import typing
+from unittest import TestCase, mock
+
+from stockplot.requests_wrapper import json_stream
+from stockplot.requests_wrapper.json_stream import JsonMemberStream
+from ..test_de_giro_wrapper import test_get_product_info_by_id
+from ..test_de_giro_wrapper.utils import get_client_info_request, get_login_request
+from ...mock_packages.mock_requests import MockJsonResponse
+
+__all__ = ("TestJsonMemberStream",)
+
+
+def _chunks(body: bytes, size: int) -> typing.List[bytes]:
+    return [body[start : start + size] for start in range(0, len(body), size)]
+
+
+class TestJsonMemberStream(TestCase):
+    _document = {
+        "before": {"nested": [1, 2, {"data": "not this one"}]},
+        "data": [
+            {"id": index, "quantity": 12345.5, "name": "é"} for index in range(50)
+        ],
+        "after": 1,
+    }
+
+    def test_items_survive_any_chunk_boundary(self) -> None:
+        body = json.dumps(self._document).encode()
+        for size in (1, 2, 7, 64, len(body)):
+            stream = JsonMemberStream(_chunks(body, size), "data")
+            self.assertEqual(self._document["data"], list(stream))
+            self.assertTrue(stream.found)
+
+    def test_numbers_survive_any_chunk_boundary(self) -> None:
+        body = (
+            b'{\n "x": 556.8885654499802,\n "y": [-0.5e-3, 1E+10, 12.25],'
+            b' "data": [556.8885654499802, -12, 3.5E-7, 10e2, 0, -0.0],'
+            b' "z": 7}'
+        )
+        expected = json.loads(body)["data"]
+        for size in range(1, 17):
+            with self.subTest(size=size):
+                stream = JsonMemberStream(_chunks(body, size), "data")
+                self.assertEqual(expected, list(stream))
+
+    def test_fixture_bodies_replay_one_byte_at_a_time(self) -> None:
+        fixtures = (
+            get_login_request("user", "pass", "session_id").response.json(),
+            get_client_info_request("session_id", 1).response.json(),
+            test_get_product_info_by_id.TestGetTransactions._dict_padding,
+            self._document,
+        )
+        for fixture in fixtures:
+            # Each fixture is both skipped and decoded, the two paths a
+            # truncated number used to break.
+            response = MockJsonResponse(
+                status_code=200, _json={"skipped": fixture, "data": [fixture]}
+            )
+            stream = JsonMemberStream(response.iter_content(chunk_size=1), "data")
+            self.assertEqual([fixture], list(stream))
+
+    def test_object_members_yield_pairs(self) -> None:
+        body = b'{"data": {"1": {"id": "1"}, "2": 30}}'
+        self.assertEqual(
+            [("1", {"id": "1"}), ("2", 30)],
+            list(JsonMemberStream(_chunks(body, 3), "data")),
+        )
+
+    def test_missing_and_null_members(self) -> None:
+        missing = JsonMemberStream([b'{"other": [1]}'], "data")
+        self.assertEqual([], list(missing))
+        self.assertFalse(missing.found)
+
+        null = JsonMemberStream([b'{"data": null}'], "data")
+        self.assertEqual([], list(null))
+        self.assertTrue(null.found)
+
+    def test_malformed_bodies_raise(self) -> None:
+        for body in (b"", b"[1, 2]", b'{"data": [1, 2'):
+            with self.assertRaises(json.JSONDecodeError):
+                list(JsonMemberStream([body], "data"))
+
+    def test_values_spanning_many_chunks_are_decoded_a_few_times(self) -> None:
+        value = {"name": "x" * 100_000}
+        body = json.dumps({"data": [value]}).encode()
+        decoder = mock.Mock(wraps=json.JSONDecoder())
+
+        with mock.patch.object(json_stream, "_DECODER", decoder):
+            self.assertEqual([value], list(JsonMemberStream(_chunks(body, 64), "data")))
+
+        # Retrying after every chunk would take ~1600 attempts.
+        self.assertLess(decoder.raw_decode.call_count, 30)
+
+    def test_memory_stays_flat_for_long_arrays(self) -> None:
+        row = json.dumps({"productId": 1, "quantity": 1, "date": "x" * 100})
+
+        def body(rows: int) -> typing.Iterator[bytes]:
+            yield b'{"data": ['
+            for index in range(rows):
+                yield (row if index == 0 else "," + row).encode()
+            yield b"]}"
+
+        def peak(rows: int) -> int:
+            tracemalloc.start()
+            try:
+                for _ in JsonMemberStream(body(rows), "data"):
+                    pass
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        self.assertLess(peak(20_000), 2 * peak(1_000) + 64 * 1024)
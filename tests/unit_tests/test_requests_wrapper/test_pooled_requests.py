@@ -0,0 +1,65 @@
+from unittest import TestCase
+
+from stockplot.requests_wrapper.pooled_requests import PooledRequests
+from stockplot.requests_wrapper.requests_service import (
+    requests_service,
+    use_pooled_requests,
+)
+from ...mock_packages.local_server import LocalJsonServer
+
+__all__ = ("TestPooledRequests",)
+
+
+class TestPooledRequests(TestCase):
+    def tearDown(self) -> None:
+        requests_service.reset()
+
+    def test_connection_is_reused(self) -> None:
+        with LocalJsonServer(routes={"/data": {"data": [1, 2]}}) as server:
+            with PooledRequests(timeout=5) as requests:
+                for _ in range(5):
+                    response = requests.get(url=f"{server.url}/data")
+                    self.assertEqual({"data": [1, 2]}, response.json())
+                requests.post(url=f"{server.url}/data", data="[]")
+
+                stats = requests.stats()
+
+        self.assertEqual(6, stats.requests)
+        self.assertEqual(1, stats.connections_opened)
+        self.assertEqual(5, stats.connections_reused)
+
+    def test_stats_survive_close(self) -> None:
+        with LocalJsonServer(routes={"/data": {}}) as server:
+            requests = PooledRequests(timeout=5)
+            requests.get(url=f"{server.url}/data")
+            requests.get(url=f"{server.url}/data")
+            requests.close()
+
+        self.assertEqual(2, requests.stats().requests)
+        self.assertEqual(1, requests.stats().connections_opened)
+
+    def test_stats_survive_pool_eviction(self) -> None:
+        with LocalJsonServer(routes={"/data": {}}) as server:
+            other = server.url.replace("127.0.0.1", "localhost")
+            with PooledRequests(pool_connections=1, timeout=5) as requests:
+                # One host pool is kept, so every switch evicts the other.
+                for url in (server.url, other, server.url, other):
+                    requests.get(url=f"{url}/data")
+
+                stats = requests.stats()
+
+        self.assertEqual(4, stats.requests)
+        self.assertEqual(4, stats.connections_opened)
+
+    def test_use_pooled_requests_overwrites_service(self) -> None:
+        pooled = use_pooled_requests(pool_maxsize=2, timeout=1)
+
+        self.assertIs(pooled, requests_service.get()())
+        self.assertIs(pooled, requests_service.get()())
+
+    def test_default_service_is_shared(self) -> None:
+        first = requests_service.get()()
+        second = requests_service.get()()
+
+        self.assertIsInstance(first, PooledRequests)
+        self.assertIs(first, second)
@@ -0,0 +1,194 @@
+import gzip
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime
+from unittest import TestCase
+
+import numpy as np
+
+from stockplot import Currency, ProductInfo, Transaction
+from stockplot.server import PortfolioServer, PortfolioState
+from tests.mock_packages.mock_wrapper import StaticDeGiroWrapper
+
+__all__ = ("TestPortfolioServer",)
+
+
+class TestPortfolioServer(TestCase):
+    _products = {
+        10: ProductInfo(10, "US0378331005", "Apple Inc", "AAPL", Currency.USD),
+        20: ProductInfo(
+            20, "IE00B4L5Y983", "iShares Core MSCI World", "IWDA", Currency.EUR
+        ),
+    }
+
+    def setUp(self) -> None:
+        self.now = datetime(2021, 1, 10, 12)
+        self.wrapper = StaticDeGiroWrapper(
+            [
+                Transaction(10, 2, datetime(2021, 1, 4, 9), id=1),
+                Transaction(20, 5, datetime(2021, 1, 5, 9), id=2),
+                Transaction(10, -1, datetime(2021, 1, 7, 9), id=3),
+            ],
+            dict(self._products),
+        )
+        self.pricing = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        self.state = PortfolioState(
+            self.wrapper,
+            start_date=datetime(2021, 1, 1),
+            prices=self._prices,
+            clock=lambda: self.now,
+        )
+        self.state.refresh()
+        self.server = PortfolioServer(self.state, port=0, gzip_min_bytes=64)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+    def _prices(self, engine, products) -> np.ndarray:
+        self.pricing.set()
+        self.release.wait(timeout=10)
+        # Every product is worth its id, on every day.
+        return np.repeat(
+            engine.product_ids[:, np.newaxis].astype(np.float64),
+            len(engine.days),
+            axis=1,
+        )
+
+    def _get(self, path: str, **headers: str):
+        request = urllib.request.Request(self.server.url + path, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as error:
+            return error.code, dict(error.headers), error.read()
+
+    def _post(self, path: str):
+        request = urllib.request.Request(self.server.url + path, method="POST")
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.loads(response.read())
+
+    def test_routes_answer_json(self) -> None:
+        status, headers, body = self._get("/transactions?product=10")
+        self.assertEqual(200, status)
+        self.assertEqual("application/json", headers["Content-Type"])
+        payload = json.loads(body)
+        self.assertEqual([1, 3], payload["id"])
+        self.assertEqual(
+            ["2021-01-04T09:00:00", "2021-01-07T09:00:00"], payload["date"]
+        )
+
+        payload = json.loads(self._get("/products")[2])
+        self.assertEqual(["AAPL", "IWDA"], sorted(payload["symbol"]))
+
+        payload = json.loads(self._get("/holdings?day=2021-01-05")[2])
+        self.assertEqual(
+            {10: 2.0, 20: 5.0}, dict(zip(payload["productId"], payload["quantity"]))
+        )
+
+        payload = json.loads(self._get("/valuation?width=1000")[2])
+        self.assertEqual("day", payload["level"])
+        self.assertEqual("2021-01-04", payload["day"][0])
+        # Two shares at 10, then one at 10 and five at 20.
+        self.assertEqual(20.0, payload["first"][0])
+        self.assertEqual(110.0, payload["last"][-1])
+
+        payload = json.loads(self._get("/valuation?width=1&product=20")[2])
+        self.assertEqual("year", payload["level"])
+        self.assertEqual([100.0], payload["max"])
+
+    def test_npy_format_is_a_structured_array(self) -> None:
+        status, headers, body = self._get("/valuation?width=1&format=npy")
+
+        self.assertEqual(200, status)
+        self.assertEqual("application/x-npy", headers["Content-Type"])
+        self.assertEqual("year", headers["X-Stockplot-level"])
+        array = np.load(io.BytesIO(body), allow_pickle=False)
+        self.assertEqual(
+            ("day", "first", "last", "min", "max", "mean"), array.dtype.names
+        )
+        self.assertEqual(1, len(array))
+
+    def test_bad_requests_are_rejected(self) -> None:
+        self.assertEqual(400, self._get("/holdings?day=yesterday")[0])
+        self.assertEqual(400, self._get("/valuation?width=0")[0])
+        self.assertEqual(404, self._get("/valuation?product=99")[0])
+        self.assertEqual(404, self._get("/missing")[0])
+
+    def test_etag_revalidation_and_refresh(self) -> None:
+        status, headers, first = self._get("/transactions")
+        etag = headers["ETag"]
+        self.assertTrue(etag.startswith('W/"1-'))
+
+        status, headers, body = self._get("/transactions", **{"If-None-Match": etag})
+        self.assertEqual(304, status)
+        self.assertEqual(b"", body)
+        # Each query is its own representation.
+        self.assertNotEqual(etag, self._get("/transactions?product=10")[1]["ETag"])
+
+        self.wrapper.transactions.append(
+            Transaction(20, 1, datetime(2021, 1, 11, 9), id=4)
+        )
+        self.now = datetime(2021, 1, 12, 12)
+        self.assertEqual({"added": 1, "version": 2}, self._post("/refresh"))
+        # Nothing new: the version stays, and the overlap is not counted twice.
+        self.assertEqual({"added": 0, "version": 2}, self._post("/refresh"))
+
+        status, headers, body = self._get("/transactions", **{"If-None-Match": etag})
+        self.assertEqual(200, status)
+        self.assertEqual([1, 2, 3, 4], json.loads(body)["id"])
+        # Products already known are not fetched again.
+        self.assertEqual([{10, 20}], self.wrapper.product_calls)
+
+    def test_gzip_only_when_accepted(self) -> None:
+        status, headers, plain = self._get("/valuation")
+        self.assertNotIn("Content-Encoding", headers)
+
+        status, headers, body = self._get("/valuation", **{"Accept-Encoding": "gzip"})
+        self.assertEqual("gzip", headers["Content-Encoding"])
+        self.assertEqual("Accept-Encoding", headers["Vary"])
+        self.assertEqual(plain, gzip.decompress(body))
+
+    def test_identical_requests_are_computed_once(self) -> None:
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self._get("/valuation")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(8, len(results))
+        self.assertEqual(1, len({body for _, _, body in results}))
+        self.assertEqual(1, self.server.computed)
+
+    def test_slow_prices_do_not_block_other_requests(self) -> None:
+        self.release.clear()
+        results = []
+        valuation = threading.Thread(
+            target=lambda: results.append(self._get("/valuation"))
+        )
+        valuation.start()
+        self.addCleanup(valuation.join)
+        self.addCleanup(self.release.set)
+        self.assertTrue(self.pricing.wait(timeout=10))
+
+        # Prices are still being fetched for version 1.
+        self.assertEqual(200, self._get("/holdings")[0])
+        self.wrapper.transactions.append(
+            Transaction(20, 1, datetime(2021, 1, 11, 9), id=4)
+        )
+        self.now = datetime(2021, 1, 12, 12)
+        self.assertEqual({"added": 1, "version": 2}, self._post("/refresh"))
+
+        self.release.set()
+        valuation.join()
+        status, headers, _ = results[0]
+        self.assertEqual(200, status)
+        # The body and its ETag come from the snapshot the request started on.
+        self.assertTrue(headers["ETag"].startswith('W/"1-'))
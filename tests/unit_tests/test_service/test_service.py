@@ -0,0 +1,90 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from stockplot.de_giro_wrapper.degiro_container import de_giro_factory_service
+from stockplot.requests_wrapper.requests_service import requests_service
+from stockplot.service import Lifetime, Service, bind_context
+
+__all__ = ("TestService",)
+
+
+class TestService(TestCase):
+    def tearDown(self) -> None:
+        requests_service.reset()
+
+    def test_transient_builds_on_every_call(self) -> None:
+        service = Service(value=object)
+
+        self.assertIsNot(service.get()(), service.get()())
+
+    def test_singleton_is_built_once_across_threads(self) -> None:
+        built = []
+        barrier = threading.Barrier(8)
+
+        def build() -> object:
+            built.append(object())
+            return built[-1]
+
+        service = Service(value=build, lifetime=Lifetime.SINGLETON)
+
+        def resolve(_: int) -> object:
+            barrier.wait()
+            return service.get()()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            instances = set(map(id, executor.map(resolve, range(8))))
+
+        self.assertEqual(1, len(built))
+        self.assertEqual({id(built[0])}, instances)
+
+    def test_thread_lifetime_builds_once_per_thread(self) -> None:
+        service = Service(value=object, lifetime=Lifetime.THREAD)
+        here = service.get()()
+        there = []
+
+        thread = threading.Thread(target=lambda: there.append(service.get()()))
+        thread.start()
+        thread.join()
+
+        self.assertIs(here, service.get()())
+        self.assertIsNot(here, there[0])
+
+    def test_scoped_override_wins_and_is_restored(self) -> None:
+        service = Service(value=lambda: "default", lifetime=Lifetime.SINGLETON)
+        service.overwrite(new=lambda: "global")
+
+        with service.override(lambda: "scoped"):
+            self.assertEqual("scoped", service.get()())
+            with service.override(lambda: "inner"):
+                self.assertEqual("inner", service.get()())
+            self.assertEqual("scoped", service.get()())
+            self.assertEqual("global", service.registered()())
+        self.assertEqual("global", service.get()())
+
+        service.reset()
+        self.assertEqual("default", service.get()())
+
+    def test_scoped_override_does_not_leak_to_other_threads(self) -> None:
+        service = Service(value=lambda: "default")
+        seen = {}
+
+        with service.override(lambda: "scoped"):
+            thread = threading.Thread(target=lambda: seen.update(plain=service.get()()))
+            thread.start()
+            thread.join()
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                seen["bound"] = executor.submit(bind_context(service.get)).result()()
+
+        self.assertEqual("default", seen["plain"])
+        self.assertEqual("scoped", seen["bound"])
+
+    def test_shared_factory_follows_request_overrides(self) -> None:
+        factory = de_giro_factory_service.get()()
+        self.assertIs(factory, de_giro_factory_service.get()())
+
+        requests = object()
+        with requests_service.override(lambda: requests):
+            wrapper = factory.create(user="user", password="pass")
+
+        self.assertIs(requests, wrapper._requests)
@@ -0,0 +1,208 @@
+import os
+import tempfile
+import typing
+from datetime import datetime
+from unittest import TestCase
+
+from stockplot import Currency, ProductInfo, Transaction
+from stockplot.de_giro_wrapper import ProductCatalog
+from stockplot.storage import DeGiroCsvImporter, TransactionStore
+from ...mock_packages.mock_wrapper import StaticDeGiroWrapper
+
+__all__ = ("TestDeGiroCsvImport",)
+
+_TRANSACTIONS_HEADER = (
+    "Date,Time,Product,ISIN,Reference exchange,Venue,Quantity,Price,,"
+    "Local value,,Value,,Exchange rate,Transaction and/or third,,Total,,Order ID\n"
+)
+_ACCOUNT_HEADER = (
+    "Date,Time,Value date,Product,ISIN,Description,FX,Change,,Balance,,Order Id\n"
+)
+
+
+def _transaction(date: str, time: str, product: str, isin: str, quantity: str) -> str:
+    return (
+        f'{date},{time},"{product}",{isin},NSY,XNYS,{quantity},"130,50",USD,'
+        f'"-1305,00",USD,"-1077,45",EUR,"1,2110",-0.50,EUR,"-1077,95",EUR,'
+        "5c7b1c1e-1111-4a5b-9b1c-000000000000\n"
+    )
+
+
+class TestDeGiroCsvImport(TestCase):
+    _apple = ProductInfo(
+        id=331868,
+        isin="US0378331005",
+        name="Apple Inc",
+        symbol="AAPL",
+        currency=Currency.USD,
+    )
+    # The fills of _transactions() as the API reports them, with seconds.
+    _synced = [
+        Transaction(331868, -4, datetime(2021, 1, 15, 14, 45, 12), id=900),
+        Transaction(331868, 10, datetime(2021, 3, 28, 1, 30, 5), id=901),
+        Transaction(59491, 3, datetime(2021, 7, 2, 7, 0, 1), id=902),
+        Transaction(59491, 3, datetime(2021, 7, 2, 7, 0, 1), id=903),
+    ]
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def _write(self, name: str, content: str) -> str:
+        path = os.path.join(self._directory.name, name)
+        with open(path, "w", encoding="utf-8-sig") as file:
+            file.write(content)
+        return path
+
+    def _transactions(self) -> str:
+        return self._write(
+            "Transactions.csv",
+            _TRANSACTIONS_HEADER
+            + _transaction("28-03-2021", "03:30", "APPLE INC", "US0378331005", "10")
+            + _transaction("15-01-2021", "15:45", "APPLE INC", "US0378331005", "-4")
+            + _transaction("02-07-2021", "09:00", "MICROSOFT", "US5949181045", "3")
+            + _transaction("02-07-2021", "09:00", "MICROSOFT", "US5949181045", "3"),
+        )
+
+    def test_rows_are_converted_to_utc_transactions(self) -> None:
+        result = DeGiroCsvImporter(max_workers=1).read_transactions(
+            self._transactions()
+        )
+
+        # Without a catalog nothing resolves, and nothing is priced blindly.
+        self.assertEqual({}, result.products)
+        self.assertEqual(
+            {"US0378331005", "US5949181045"}, set(result.unresolved.keys())
+        )
+        apple_id = result.unresolved["US0378331005"]
+        self.assertLess(apple_id, 0)
+
+        frame = result.transactions
+        self.assertEqual(4, len(frame))
+        # Amsterdam is UTC+1 in winter and UTC+2 in summer.
+        self.assertEqual(datetime(2021, 1, 15, 14, 45), frame[0].transaction_datetime)
+        self.assertEqual(datetime(2021, 3, 28, 1, 30), frame[1].transaction_datetime)
+        self.assertEqual(datetime(2021, 7, 2, 7, 0), frame[2].transaction_datetime)
+        self.assertEqual([-4, 10, 3, 3], [t.quantity for t in frame])
+        self.assertEqual(apple_id, frame[0].product_id)
+        self.assertEqual(4, len({t.id for t in frame}))
+
+    def test_ids_are_stable_across_chunking_and_workers(self) -> None:
+        path = self._transactions()
+
+        serial = DeGiroCsvImporter(max_workers=1).read_transactions(path)
+        pooled = DeGiroCsvImporter(max_workers=2, chunk_bytes=64).read_transactions(
+            path
+        )
+
+        self.assertEqual(list(serial.transactions), list(pooled.transactions))
+        self.assertEqual(
+            [t.id for t in serial.transactions], [t.id for t in pooled.transactions]
+        )
+        self.assertEqual(serial.unresolved, pooled.unresolved)
+
+    def test_known_isins_resolve_through_the_catalog(self) -> None:
+        apple = self._apple
+        catalog = ProductCatalog([apple])
+
+        with TransactionStore(path=":memory:") as store:
+            result = DeGiroCsvImporter(catalog=catalog, max_workers=1).load(
+                self._transactions(), store, account_id=1
+            )
+            stored = store.transactions(account_id=1, product_id=331868)
+
+        self.assertEqual(apple, result.products[331868])
+        self.assertEqual([-4, 10], [t.quantity for t in stored])
+        # Unknown listings are reported rather than stored without a symbol.
+        self.assertEqual(["US5949181045"], list(result.unresolved))
+        self.assertEqual(1, len(catalog))
+
+    def _quantities(self, store: TransactionStore) -> typing.Dict[str, float]:
+        totals: typing.Dict[str, float] = {}
+        for transaction in store.transactions(account_id=1):
+            key = "apple" if transaction.product_id == 331868 else "other"
+            totals[key] = totals.get(key, 0) + transaction.quantity
+        return totals
+
+    def test_api_sync_replaces_imported_rows(self) -> None:
+        importer = DeGiroCsvImporter(
+            catalog=ProductCatalog([self._apple]), max_workers=1
+        )
+        wrapper = StaticDeGiroWrapper(self._synced, {}, account_id=1)
+
+        with TransactionStore(
+            path=":memory:", initial_start_date=datetime(2021, 1, 1)
+        ) as store:
+            importer.load(self._transactions(), store, account_id=1)
+            self.assertEqual({"apple": 6, "other": 6}, self._quantities(store))
+
+            store.sync(wrapper, end_date=datetime(2021, 8, 1))
+
+            self.assertEqual({"apple": 6, "other": 6}, self._quantities(store))
+            self.assertEqual(
+                [900, 901, 902, 903], [t.id for t in store.transactions(account_id=1)]
+            )
+
+    def test_import_after_sync_adds_nothing(self) -> None:
+        importer = DeGiroCsvImporter(
+            catalog=ProductCatalog([self._apple]), max_workers=1
+        )
+        wrapper = StaticDeGiroWrapper(self._synced, {}, account_id=1)
+
+        with TransactionStore(
+            path=":memory:", initial_start_date=datetime(2021, 1, 1)
+        ) as store:
+            store.sync(wrapper, end_date=datetime(2021, 8, 1))
+            importer.load(self._transactions(), store, account_id=1)
+
+            self.assertEqual({"apple": 6, "other": 6}, self._quantities(store))
+            self.assertEqual(4, len(store.transactions(account_id=1)))
+
+    def test_unresolved_rows_matching_two_products_are_kept(self) -> None:
+        path = self._write(
+            "Transactions.csv",
+            _TRANSACTIONS_HEADER
+            + _transaction("02-07-2021", "09:00", "UNKNOWN", "US0000000001", "5"),
+        )
+        # Two different products filled at the same size within the minute.
+        synced = [
+            Transaction(111, 5, datetime(2021, 7, 2, 7, 0, 10), id=910),
+            Transaction(222, 5, datetime(2021, 7, 2, 7, 0, 40), id=911),
+        ]
+        wrapper = StaticDeGiroWrapper(synced, {}, account_id=1)
+
+        for import_first in (True, False):
+            with TransactionStore(
+                path=":memory:", initial_start_date=datetime(2021, 1, 1)
+            ) as store:
+                if import_first:
+                    DeGiroCsvImporter(max_workers=1).load(path, store, account_id=1)
+                store.sync(wrapper, end_date=datetime(2021, 8, 1))
+                if not import_first:
+                    DeGiroCsvImporter(max_workers=1).load(path, store, account_id=1)
+
+                stored = store.transactions(account_id=1)
+                flagged = store.ambiguous(account_id=1)
+
+            # Neither fill is dropped, and the imported row is flagged.
+            self.assertEqual([5, 5, 5], [t.quantity for t in stored])
+            self.assertEqual([910, 911], sorted(t.id for t in stored if t.id > 0))
+            self.assertEqual(1, len(flagged))
+            self.assertLess(flagged[0].product_id, 0)
+            self.assertIn(flagged[0], stored)
+
+    def test_account_statement_contributes_products(self) -> None:
+        path = self._write(
+            "Account.csv",
+            _ACCOUNT_HEADER
+            + '02-07-2021,09:00,02-07-2021,MICROSOFT,US5949181045,"Buy 3 @ 270",'
+            + ',USD,"-810,00",USD,"190,00",\n'
+            + "01-07-2021,10:00,01-07-2021,,,Deposit,,EUR,1000,EUR,1000,\n",
+        )
+
+        result = DeGiroCsvImporter(max_workers=1).read_account(path)
+
+        self.assertEqual(0, len(result.transactions))
+        self.assertEqual(["US5949181045"], list(result.unresolved))
@@ -0,0 +1,122 @@
+import os
+import tempfile
+import threading
+import time
+import typing
+from datetime import timedelta
+from unittest import TestCase
+
+from stockplot import Currency, ProductInfo
+from stockplot.storage import ProductInfoCache
+
+__all__ = ("TestProductInfoCache",)
+
+
+def _product(identifier: int) -> ProductInfo:
+    return ProductInfo(
+        id=identifier,
+        isin=f"isin{identifier}",
+        name=f"name{identifier}",
+        symbol=f"S{identifier}",
+        currency=Currency.EUR,
+    )
+
+
+class _RecordingFetcher:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.calls: typing.List[typing.Set[int]] = []
+        self._delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, ids: typing.Set[int]) -> typing.Dict[int, ProductInfo]:
+        with self._lock:
+            self.calls.append(set(ids))
+        time.sleep(self._delay)
+        return {
+            identifier: _product(identifier) for identifier in ids if identifier > 0
+        }
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestProductInfoCache(TestCase):
+    def test_only_misses_are_fetched(self) -> None:
+        fetch = _RecordingFetcher()
+        cache = ProductInfoCache()
+
+        cache.get({1, 2}, fetch)
+        actual = cache.get({1, 2, 3, 4}, fetch)
+
+        self.assertEqual([{1, 2}, {3, 4}], fetch.calls)
+        self.assertEqual({i: _product(i) for i in (1, 2, 3, 4)}, actual)
+        stats = cache.stats()
+        self.assertEqual((2, 4), (stats.hits, stats.misses))
+
+    def test_ttl_expiry(self) -> None:
+        clock = _Clock()
+        fetch = _RecordingFetcher()
+        cache = ProductInfoCache(ttl=timedelta(seconds=10), clock=clock)
+
+        cache.get({1}, fetch)
+        clock.now += 5
+        cache.get({1}, fetch)
+        clock.now += 10
+        cache.get({1}, fetch)
+
+        self.assertEqual([{1}, {1}], fetch.calls)
+
+    def test_lru_eviction(self) -> None:
+        fetch = _RecordingFetcher()
+        cache = ProductInfoCache(max_size=2)
+
+        cache.get({1}, fetch)
+        cache.get({2}, fetch)
+        cache.get({1}, fetch)
+        cache.get({3}, fetch)
+        cache.get({1, 2}, fetch)
+
+        self.assertEqual([{1}, {2}, {3}, {2}], fetch.calls)
+        self.assertEqual(2, cache.stats().evictions)
+
+    def test_persisted_between_instances(self) -> None:
+        fetch = _RecordingFetcher()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "products.sqlite")
+            with ProductInfoCache(path=path) as cache:
+                cache.get({1, 2}, fetch)
+
+            with ProductInfoCache(path=path) as cache:
+                actual = cache.get({1, 2}, fetch)
+
+        self.assertEqual([{1, 2}], fetch.calls)
+        self.assertEqual({1: _product(1), 2: _product(2)}, actual)
+
+    def test_concurrent_requests_share_one_fetch(self) -> None:
+        fetch = _RecordingFetcher(delay=0.2)
+        cache = ProductInfoCache()
+        results = []
+
+        def _worker() -> None:
+            results.append(cache.get({1, 2}, fetch))
+
+        threads = [threading.Thread(target=_worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([{1, 2}], fetch.calls)
+        self.assertEqual([{1: _product(1), 2: _product(2)}] * 4, results)
+        self.assertEqual(6, cache.stats().coalesced)
+
+    def test_unresolved_ids_are_omitted(self) -> None:
+        fetch = _RecordingFetcher()
+        cache = ProductInfoCache()
+
+        self.assertEqual({1: _product(1)}, cache.get({1, -1}, fetch))
@@ -0,0 +1,142 @@
+import typing
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+
+from stockplot import Transaction
+from stockplot.de_giro_wrapper.degiro_container import de_giro_factory_service
+from stockplot.requests_wrapper.requests_service import requests_service
+from stockplot.storage import TransactionStore
+from ..test_de_giro_wrapper.utils import (
+    get_login_request,
+    get_client_info_request,
+    get_logout_request,
+    get_transactions_request,
+)
+from ...mock_packages.mock_requests import (
+    MockJsonResponse,
+    MockTraffic,
+    UnorderedMockRequests,
+)
+
+__all__ = ("TestTransactionStore",)
+
+
+class TestTransactionStore(TestCase):
+    def setUp(self) -> None:
+        self._store = TransactionStore(
+            path=":memory:",
+            initial_start_date=datetime(2021, 1, 1),
+            overlap=timedelta(days=2),
+        )
+
+    def tearDown(self) -> None:
+        self._store.close()
+        requests_service.reset()
+
+    @staticmethod
+    def _response(rows: typing.List[typing.Tuple[int, int, str]]) -> MockJsonResponse:
+        return MockJsonResponse(
+            status_code=200,
+            _json={
+                "data": [
+                    {
+                        "id": identifier,
+                        "productId": product,
+                        "quantity": 1,
+                        "date": date,
+                    }
+                    for identifier, product, date in rows
+                ]
+            },
+        )
+
+    def _sync(self, traffic: MockTraffic, end_date: datetime) -> int:
+        requests = UnorderedMockRequests(
+            expected_traffic=[
+                get_login_request("user", "pass", "session_id"),
+                get_client_info_request("session_id", 7),
+                traffic,
+                get_logout_request("session_id", 7),
+            ]
+        )
+        requests_service.overwrite(new=lambda: requests)
+
+        with de_giro_factory_service.get()().create("user", "pass") as de_giro:
+            return self._store.sync(de_giro, end_date=end_date)
+
+    def test_incremental_sync_with_overlap(self) -> None:
+        first = get_transactions_request(
+            datetime(2021, 1, 1),
+            datetime(2021, 1, 10),
+            self._response(
+                [
+                    (1, 10, "2021-01-02T10:00:00+01:00"),
+                    (2, 20, "2021-01-09T10:00:00+01:00"),
+                ]
+            ),
+            account_id=7,
+        )
+        self.assertEqual(2, self._sync(first, end_date=datetime(2021, 1, 10)))
+        self.assertEqual(datetime(2021, 1, 10), self._store.last_synced(7))
+
+        # The second sync starts two days before the last one ended and sees
+        # transaction 2 again, plus a late booking (3) inside the overlap.
+        second = get_transactions_request(
+            datetime(2021, 1, 8),
+            datetime(2021, 1, 20),
+            self._response(
+                [
+                    (2, 20, "2021-01-09T10:00:00+01:00"),
+                    (3, 10, "2021-01-09T12:00:00+01:00"),
+                    (4, 10, "2021-01-15T10:00:00+01:00"),
+                ]
+            ),
+            account_id=7,
+        )
+        self.assertEqual(3, self._sync(second, end_date=datetime(2021, 1, 20)))
+
+        self.assertEqual(
+            [1, 2, 3, 4],
+            [transaction.id for transaction in self._store.transactions(account_id=7)],
+        )
+
+    def test_aware_end_date_is_stored_as_utc(self) -> None:
+        traffic = get_transactions_request(
+            datetime(2021, 1, 1),
+            datetime(2021, 1, 9, 23),
+            self._response([(1, 10, "2021-01-02T10:00:00+01:00")]),
+            account_id=7,
+        )
+        end_date = datetime(2021, 1, 10, tzinfo=timezone(timedelta(hours=1)))
+
+        self.assertEqual(1, self._sync(traffic, end_date=end_date))
+        self.assertEqual(datetime(2021, 1, 9, 23), self._store.last_synced(7))
+
+    def test_queries_by_product_and_date(self) -> None:
+        self._store.save(
+            account_id=1,
+            transactions=[
+                Transaction(10, 1, datetime(2021, 1, 1), id=1),
+                Transaction(20, 2, datetime(2021, 1, 2), id=2),
+                Transaction(10, -1, datetime(2021, 1, 3), id=3),
+                Transaction(10, 5, datetime(2021, 1, 4), id=4),
+            ],
+        )
+        self._store.save(
+            account_id=2, transactions=[Transaction(10, 1, datetime(2021, 1, 2), id=1)]
+        )
+
+        actual = self._store.transactions(
+            account_id=1,
+            product_id=10,
+            start_date=datetime(2021, 1, 2),
+            end_date=datetime(2021, 1, 4),
+        )
+
+        expected = [
+            Transaction(10, -1, datetime(2021, 1, 3), id=3),
+            Transaction(10, 5, datetime(2021, 1, 4), id=4),
+        ]
+        self.assertEqual(expected, actual)
+        self.assertEqual([3, 4], [transaction.id for transaction in actual])
+        self.assertIsInstance(actual[0].quantity, int)